@@ -0,0 +1,40 @@
+"""Benchmark the import time of ``oommfc``.
+
+Measures the time ``import oommfc`` takes in a new interpreter, and the time of the
+first access to a driver, which imports the simulation modules and their
+dependencies (e.g. ``discretisedfield``). The minimum of several runs is reported.
+
+Run with::
+
+    python benchmarks/import_time.py
+
+"""
+
+import subprocess
+import sys
+
+statements = {
+    "import oommfc": "import oommfc",
+    "oommfc.MinDriver": "import oommfc; oommfc.MinDriver",
+}
+
+
+def benchmark(statement, repeat=5):
+    code = (
+        "import time; start = time.perf_counter();"
+        f" {statement}; print(time.perf_counter() - start)"
+    )
+    return min(
+        float(subprocess.check_output([sys.executable, "-c", code], text=True))
+        for _ in range(repeat)
+    )
+
+
+def main():
+    print(f"{'statement':>20} {'time [ms]':>10}")
+    for name, statement in statements.items():
+        print(f"{name:>20} {1e3 * benchmark(statement):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark MIF generation.
+
+Measures the time ``Driver.write_mif`` needs to generate and write the MIF file as
+a function of the number of subregions in the mesh and of the length of the
+time-dependent field profile (``tlist``) of a ``Zeeman`` term. Field files
+(``m0.omf``) are written as well but are small because the mesh has few cells.
+
+Run with::
+
+    python benchmarks/mif_generation.py
+
+"""
+
+import pathlib
+import tempfile
+import timeit
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+
+import oommfc as oc
+
+
+def system(n_subregions, profile_length):
+    subregions = {
+        f"r{i}": df.Region(p1=(i, 0, 0), p2=(i + 1, 1, 1)) for i in range(n_subregions)
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0),
+        p2=(n_subregions, 1, 1),
+        n=(n_subregions, 1, 1),
+        subregions=subregions,
+    )
+    system = mm.System(name="benchmark")
+    region_values = {name: 1e-11 for name in subregions}
+    system.energy = mm.Exchange(A=region_values) + mm.Zeeman(
+        H={name: (0, 0, 1e5) for name in subregions},
+        func=np.sin,
+        dt=1e-13,
+    )
+    system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(
+        alpha={name: 0.1 for name in subregions}
+    )
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    return system, profile_length * 1e-13
+
+
+def benchmark(n_subregions, profile_length, dirname, repeat=5):
+    s, t = system(n_subregions, profile_length)
+    td = oc.TimeDriver()
+    return min(
+        timeit.repeat(
+            lambda: td.write_mif(s, dirname=dirname, t=t, n=1), number=1, repeat=repeat
+        )
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as dirname:
+        dirname = pathlib.Path(dirname)
+        print(f"{'subregions':>12} {'profile':>10} {'time [ms]':>10} {'size [kB]':>10}")
+        for n_subregions in [10, 100, 1000]:
+            for profile_length in [100, 10_000, 100_000]:
+                time = benchmark(n_subregions, profile_length, dirname)
+                size = (dirname / "benchmark.mif").stat().st_size / 1024
+                print(
+                    f"{n_subregions:>12} {profile_length:>10}"
+                    f" {1e3 * time:>10.1f} {size:>10.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
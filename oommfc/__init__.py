@@ -1,50 +1,80 @@
 """OOMMF calculator."""
 
+import importlib
 import importlib.metadata
+import threading
 
-import pytest
-
-import oommfc.oommf
-import oommfc.scripts
+# Functions with the same name as their module are imported eagerly, so that a
+# later import of the submodule does not shadow them. These modules only import
+# their heavy dependencies when the functions are called.
 from .compute import compute as compute
+from .compute import compute_async as compute_async
+from .compute import compute_batch as compute_batch
+from .compute import compute_many as compute_many
 from .delete import delete as delete
-from .drivers import Driver as Driver
-from .drivers import HysteresisDriver as HysteresisDriver
-from .drivers import MinDriver as MinDriver
-from .drivers import TimeDriver as TimeDriver
-from .evolvers import CGEvolver as CGEvolver
-from .evolvers import EulerEvolver as EulerEvolver
-from .evolvers import RungeKuttaEvolver as RungeKuttaEvolver
-from .evolvers import SpinTEvolver as SpinTEvolver
-from .evolvers import SpinXferEvolver as SpinXferEvolver
-from .evolvers import UHH_ThetaEvolver as UHH_ThetaEvolver
-from .evolvers import Xf_ThermHeunEvolver as Xf_ThermHeunEvolver
-from .evolvers import Xf_ThermSpinXferEvolver as Xf_ThermSpinXferEvolver
+from .sweep import sweep as sweep
 
 __version__ = importlib.metadata.version(__package__)
 
-runner = oommfc.oommf.oommf.Runner()
-"""Controls the default runner.
-
-``runner`` gives access to the default runner OOMMF used by ``oommfc``. For
-details refer to ``oommfc.runner.Runner``.
-
-Examples
---------
-``runner.runner``
-    Returns the default runner; selects the best available runner if unset. A
-    different ``OOMMFRunner`` can be passed to be used instead. The new runner
-    is tested first.
-
-``runner.autoselect_runner()``
-    Lets ``oommfc`` select the best runner. Can be used to reset the runner
-    after overwriting it manually.
-
-See Also
---------
-:py:class:`~oommfc.oommf.Runner`
-
-"""
+# Other submodules and public objects are imported on first access (PEP 562) so
+# that ``import oommfc`` does not import heavy dependencies (e.g. discretisedfield).
+_submodules = [
+    "autotune",
+    "cache",
+    "numpy_backend",
+    "oommf",
+    "readers",
+    "runstats",
+    "scripts",
+]
+_objects = {
+    "Driver": "drivers",
+    "HysteresisDriver": "drivers",
+    "MinDriver": "drivers",
+    "TimeDriver": "drivers",
+    "CGEvolver": "evolvers",
+    "EulerEvolver": "evolvers",
+    "RungeKuttaEvolver": "evolvers",
+    "SpinTEvolver": "evolvers",
+    "SpinXferEvolver": "evolvers",
+    "UHH_ThetaEvolver": "evolvers",
+    "Xf_ThermHeunEvolver": "evolvers",
+    "Xf_ThermSpinXferEvolver": "evolvers",
+    "OOMMFStallError": "oommf",
+    "OOMMFTimeoutError": "oommf",
+    "ResultCache": "cache",
+}
+_lock = threading.RLock()
+
+
+def __getattr__(name):
+    with _lock:
+        if name in globals():  # imported by another thread
+            return globals()[name]
+        elif name == "runner":
+            # Controls the default runner.
+            #
+            # ``runner`` gives access to the default runner OOMMF used by
+            # ``oommfc``. ``runner.runner`` returns the default runner and selects
+            # the best available runner if unset. A different ``OOMMFRunner`` can
+            # be passed to be used instead. ``runner.autoselect_runner()`` lets
+            # ``oommfc`` select the best runner. For details refer to
+            # ``oommfc.oommf.Runner``.
+            value = importlib.import_module(".oommf", __name__).Runner()
+        elif name in _submodules:
+            value = importlib.import_module(f".{name}", __name__)
+        elif name in _objects:
+            value = getattr(
+                importlib.import_module(f".{_objects[name]}", __name__), name
+            )
+        else:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        globals()[name] = value
+        return value
+
+
+def __dir__():
+    return sorted([*globals(), "runner", *_submodules, *_objects])
 
 
 def test():
@@ -59,6 +89,8 @@ def test():
     >>> # md.test()
 
     """
+    import pytest
+
     return pytest.main(
         ["-m", "not travis and not docker", "-v", "--pyargs", "oommfc", "-l"]
     )  # pragma: no cover
@@ -76,6 +108,8 @@ def test_docker():
     >>> # md.test_docker()
 
     """
+    import pytest
+
     return pytest.main(
         ["-m", "docker", "-v", "--pyargs", "oommfc", "-l"]
     )  # pragma: no cover
@@ -0,0 +1,290 @@
+"""Automatic choice of the number of OOMMF threads.
+
+The scaling of OOMMF with the number of threads depends on the mesh size, the
+energy terms, and the machine. Small meshes often run fastest with a single
+thread. ``optimal_n_threads`` measures the run time of short trial simulations with
+different numbers of threads and caches the measured scaling curve, so that
+``n_threads="auto"`` in ``Driver.drive`` and ``oommfc.compute`` only runs the
+trials once per mesh size, set of energy terms, runner, and number of CPUs.
+
+"""
+
+import json
+import logging
+import math
+import os
+import pathlib
+import tempfile
+import time
+
+import micromagneticmodel as mm
+
+import oommfc as oc
+
+log = logging.getLogger("oommfc")
+
+# Bounds for the number of iterations of a trial simulation.
+_min_iterations = 10
+_max_iterations = 10_000
+
+
+def available_cpus():
+    """Return the number of CPUs available to this process.
+
+    The number of CPUs is limited by the CPU affinity of the process and by the
+    CPU quota of its cgroup (e.g. ``docker run --cpus``), if there is one.
+
+    Returns
+    -------
+    int
+
+        Number of available CPUs.
+
+    Examples
+    --------
+    1. Getting the number of available CPUs.
+
+    >>> import oommfc as oc
+    ...
+    >>> oc.autotune.available_cpus() >= 1
+    True
+
+    """
+    try:
+        n_cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS and Windows
+        n_cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        n_cpus = min(n_cpus, max(1, math.ceil(quota)))
+    return n_cpus
+
+
+def _cgroup_cpu_quota(root="/sys/fs/cgroup"):
+    """Return the CPU quota of the cgroup in CPUs or ``None`` if unlimited."""
+    root = pathlib.Path(root)
+    try:  # cgroup v2
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+    except (OSError, ValueError):
+        try:  # cgroup v1
+            quota = (root / "cpu" / "cpu.cfs_quota_us").read_text().strip()
+            period = (root / "cpu" / "cpu.cfs_period_us").read_text().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    try:
+        return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def optimal_n_threads(
+    system, /, runner=None, candidates=None, trial_time=1.0, tolerance=0.05
+):
+    """Return the number of threads for which OOMMF runs ``system`` fastest.
+
+    The scaling curve is measured with ``scaling``. The smallest number of
+    threads whose run time is within ``tolerance`` of the fastest run is
+    returned, because fewer threads per run leave more CPUs for running other
+    simulations in parallel.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        System to be simulated.
+
+    runner : oommfc.oommf.OOMMFRunner, optional
+
+        OOMMF runner. If ``None``, the default runner is used. Defaults to
+        ``None``.
+
+    candidates : list, optional
+
+        Numbers of threads to try. Defaults to ``1, 2, 4, ...`` and the number of
+        available CPUs.
+
+    trial_time : float, optional
+
+        Approximate duration of a trial simulation with one thread in seconds.
+        Defaults to ``1``.
+
+    tolerance : float, optional
+
+        Relative tolerance within which run times are considered equal. Defaults
+        to ``0.05``.
+
+    Returns
+    -------
+    int
+
+        Number of threads.
+
+    Examples
+    --------
+    1. Choosing the number of threads for a system.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> n = oc.autotune.optimal_n_threads(system)  # doctest: +SKIP
+    >>> oc.TimeDriver().drive(system, t=1e-9, n=10, n_threads=n)  # doctest: +SKIP
+    Running OOMMF...
+
+    """
+    times = scaling(system, runner=runner, candidates=candidates, trial_time=trial_time)
+    fastest = min(times.values())
+    n = min(n for n, t in times.items() if t <= (1 + tolerance) * fastest)
+    log.debug(
+        "Using %(n)s OOMMF threads, scaling: %(times)s.", {"n": n, "times": times}
+    )
+    return n
+
+
+def scaling(system, /, runner=None, candidates=None, trial_time=1.0, refresh=False):
+    """Measure the run time of OOMMF for different numbers of threads.
+
+    A system with the energy and magnetisation of ``system`` is driven with
+    ``oommfc.TimeDriver`` for a fixed number of iterations, which is calibrated
+    so that the simulation with one thread takes about ``trial_time`` seconds.
+    Trials are run for every number of threads in ``candidates``. OOMMF is run
+    directly, without ``oommfc.runner.cache``, and ``system`` is not changed.
+
+    The measured times are stored in ``threads.json`` in
+    ``oommfc.cache.cache_dir()`` and reused for systems with a similar number of
+    cells (within a factor of ``sqrt(2)``) and the same energy terms, run with
+    the same type of runner on the same number of available CPUs.
+
+    Parameters
+    ----------
+    system : micromagneticmodel.System
+
+        System to be simulated.
+
+    runner : oommfc.oommf.OOMMFRunner, optional
+
+        OOMMF runner. If ``None``, the default runner is used. Defaults to
+        ``None``.
+
+    candidates : list, optional
+
+        Numbers of threads to try. Defaults to ``1, 2, 4, ...`` and the number of
+        available CPUs.
+
+    trial_time : float, optional
+
+        Approximate duration of a trial simulation with one thread in seconds.
+        Defaults to ``1``.
+
+    refresh : bool, optional
+
+        If ``True``, the trials are run even if the times are cached. Defaults to
+        ``False``.
+
+    Returns
+    -------
+    dict
+
+        Run time of the trial simulation in seconds for each number of threads.
+
+    """
+    if runner is None:
+        runner = oc.runner.runner
+    n_cpus = available_cpus()
+    if candidates is None:
+        candidates = {2**i for i in range(n_cpus.bit_length()) if 2**i <= n_cpus}
+        candidates.add(n_cpus)
+    candidates = sorted(set(candidates))
+    if not candidates or any(not isinstance(n, int) or n < 1 for n in candidates):
+        raise ValueError(f"Cannot use {candidates=}.")
+
+    key = _key(system, runner, n_cpus)
+    entry = _load().get(key, {})
+    times = {int(n): t for n, t in entry.get("times", {}).items()}
+    if not refresh and all(n in times for n in candidates):
+        return {n: times[n] for n in candidates}
+
+    times = {}  # times measured with a different number of iterations are discarded
+    trial = mm.System(name="autotune")
+    trial.energy = system.energy
+    trial.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(alpha=0.5)
+    trial.m = system.m  # only the input files are written, m is not changed
+    with tempfile.TemporaryDirectory() as dirname:
+        iterations = _calibrate(trial, dirname, runner, trial_time)
+        for n in candidates:
+            times[n] = _trial(trial, dirname, runner, n, iterations)
+
+    entries = _load()  # other processes may have added entries in the meantime
+    entries[key] = {"iterations": iterations, "times": times}
+    _store(entries)
+    return {n: times[n] for n in candidates}
+
+
+def _key(system, runner, n_cpus):
+    n_cells = math.prod(system.m.mesh.n)
+    cells = round(math.log2(n_cells)) if n_cells else 0
+    terms = ",".join(sorted(type(term).__name__ for term in system.energy))
+    return f"{type(runner).__name__}:cells=2**{cells}:terms={terms}:cpus={n_cpus}"
+
+
+def _calibrate(system, dirname, runner, trial_time):
+    """Number of iterations for which a single-threaded run takes ``trial_time``."""
+    overhead = _trial(system, dirname, runner, 1, 1)
+    elapsed = _trial(system, dirname, runner, 1, _min_iterations)
+    per_iteration = max(elapsed - overhead, 1e-9) / (_min_iterations - 1)
+    iterations = round(trial_time / per_iteration)
+    return min(max(iterations, _min_iterations), _max_iterations)
+
+
+def _trial(system, dirname, runner, n_threads, iterations):
+    # OOMMF is called directly so that results are not loaded from
+    # ``oommfc.runner.cache``. The simulation time is long enough for the
+    # iteration limit to be reached.
+    workingdir = pathlib.Path(dirname, f"threads-{n_threads}-iterations-{iterations}")
+    workingdir.mkdir(exist_ok=True)
+    td = oc.TimeDriver(total_iteration_limit=iterations)
+    td.write_mif(system, dirname=workingdir, t=1e-6, n=1)
+    start = time.perf_counter()
+    runner.call(
+        argstr=td._miffilename(system),
+        n_threads=n_threads,
+        verbose=0,
+        workingdir=workingdir,
+    )
+    return time.perf_counter() - start
+
+
+def _resolve(n_threads, system, runner):
+    """Replace ``n_threads="auto"`` with the result of ``optimal_n_threads``."""
+    if n_threads == "auto":
+        return optimal_n_threads(system, runner=runner)
+    return n_threads
+
+
+def _cache_file():
+    return oc.cache.cache_dir() / "threads.json"
+
+
+def _load():
+    try:
+        with open(_cache_file(), encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _store(entries):
+    filename = _cache_file()
+    try:
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        tmp = filename.with_name(f"{filename.name}.{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, filename)
+    except OSError:
+        log.warning(
+            "Cannot write the thread scaling cache %(file)s.", {"file": filename}
+        )
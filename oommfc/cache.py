@@ -0,0 +1,298 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import re
+import shutil
+import threading
+import time
+
+log = logging.getLogger("oommfc")
+
+
+def cache_dir():
+    """Return the base directory for files cached by ``oommfc``.
+
+    The directory is ``$XDG_CACHE_HOME/oommfc`` if ``XDG_CACHE_HOME`` is set and
+    ``~/.cache/oommfc`` otherwise.
+
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(base, "oommfc")
+
+
+def input_hash(miffilename, workingdir=".", parameters=None):
+    """Return the hash of a MIF file, all input files referenced in it, and
+    parameters.
+
+    Parameters
+    ----------
+    miffilename : str
+
+        Name of the MIF file, relative to ``workingdir``.
+
+    workingdir : str, pathlib.Path, optional
+
+        Directory containing the MIF file. Defaults to the current working
+        directory.
+
+    parameters : str, optional
+
+        Values of MIF parameters passed to OOMMF. Defaults to ``None``.
+
+    Returns
+    -------
+    str
+
+        Hexadecimal SHA-256 hash.
+
+    """
+    workingdir = pathlib.Path(workingdir)
+    mif = (workingdir / miffilename).read_bytes()
+    digest = hashlib.sha256(mif)
+    # Input files can be MIF parameters, e.g. ``file $m0file``.
+    values = dict(re.findall(rb"^Parameter\s+(\w+)\s+(\S+)\s*$", mif, re.M))
+    if parameters is not None:
+        words = parameters.encode().split()
+        values.update(zip(words[::2], words[1::2]))
+    filenames = {
+        re.sub(rb"\$(\w+)", lambda match: values.get(match[1], match[0]), filename)
+        for filename in re.findall(rb"^\s*file\s+(\S+)\s*$", mif, re.M)
+    }
+    for filename in sorted(filenames):
+        digest.update(filename)
+        path = workingdir / filename.decode()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    if parameters is not None:
+        digest.update(b"-parameters " + parameters.encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of OOMMF results.
+
+    Results are stored under a key which is the hash of the MIF file, of all input
+    files it references (e.g. ``m0.omf`` and ``.ovf`` files of spatially varying
+    parameters), and of the type and OOMMF version of the runner. If a drive or
+    ``oommfc.compute`` generates the same input files again, OOMMF is not run and
+    the output files are copied from the cache instead.
+
+    The cache is opt-in and enabled by assigning it to ``oommfc.runner.cache``. The
+    least recently used entries are removed once the cache exceeds ``max_size`` or
+    ``max_entries``.
+
+    Parameters
+    ----------
+    dirname : str, pathlib.Path, optional
+
+        Directory in which cached results are stored. Defaults to
+        ``~/.cache/oommfc/results``.
+
+    max_size : int, optional
+
+        Maximum total size of all cached files in bytes. Defaults to 1 GB.
+
+    max_entries : int, optional
+
+        Maximum number of cached results. If ``None``, the number of entries is not
+        limited. Defaults to ``None``.
+
+    Examples
+    --------
+    1. Enabling the cache.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> oc.runner.cache = oc.ResultCache(max_size=100 * 1024**2)  # doctest: +SKIP
+    >>> system = mm.examples.macrospin()  # doctest: +SKIP
+    >>> oc.compute(system.energy.energy, system)  # doctest: +SKIP
+    Running OOMMF...
+    -8.8...e-22
+    >>> oc.compute(system.energy.energy, system)  # doctest: +SKIP
+    Loaded OOMMF result from cache.
+    -8.8...e-22
+    >>> oc.runner.cache.stats  # doctest: +SKIP
+    {'hits': 1, 'misses': 1, 'entries': 1, 'size': ...}
+
+    """
+
+    _meta = "entry.json"
+
+    def __init__(self, dirname=None, max_size=1024**3, max_entries=None):
+        self.dirname = pathlib.Path(dirname or cache_dir() / "results")
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def key(self, miffilename, workingdir=".", parameters=None, runner=None):
+        """Hash of a MIF file, all input files referenced in it, parameters, and
+        the runner.
+
+        Parameters
+        ----------
+        miffilename : str
+
+            Name of the MIF file, relative to ``workingdir``.
+
+        workingdir : str, pathlib.Path, optional
+
+            Directory containing the MIF file. Defaults to the current working
+            directory.
+
+        parameters : str, optional
+
+            Values of MIF parameters passed to OOMMF. Defaults to ``None``.
+
+        runner : oommfc.oommf.OOMMFRunner, optional
+
+            Runner used to run OOMMF. Its type and OOMMF version are part of the
+            key, so that results of a different OOMMF version are not reused. The
+            version is queried once per runner. Defaults to ``None``.
+
+        Returns
+        -------
+        str
+
+            Hexadecimal key.
+
+        """
+        digest = input_hash(miffilename, workingdir, parameters)
+        if runner is None:
+            return digest
+        with self._lock:
+            version = self._versions.get(repr(runner))
+        if version is None:
+            version = runner.version
+            with self._lock:
+                self._versions[repr(runner)] = version
+        runner_id = f"{type(runner).__name__} {version}"
+        return hashlib.sha256(f"{digest} {runner_id}".encode()).hexdigest()
+
+    def load(self, key, workingdir="."):
+        """Copy cached output files to ``workingdir``.
+
+        Returns
+        -------
+        bool
+
+            ``True`` if the result was found in the cache.
+
+        """
+        entry = self.dirname / key
+        try:
+            with open(entry / self._meta, encoding="utf-8") as f:
+                meta = json.load(f)
+            for filename in meta["files"]:
+                shutil.copy2(entry / filename, pathlib.Path(workingdir, filename))
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return False
+        # Update the access time used for the least-recently-used eviction.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry / self._meta)
+        with self._lock:
+            self.hits += 1
+        log.debug("Loaded cached OOMMF result %(key)s.", {"key": key})
+        return True
+
+    def store(self, key, workingdir, filenames):
+        """Store output files of a run under ``key``.
+
+        Parameters
+        ----------
+        key : str
+
+            Key computed with ``key``.
+
+        workingdir : str, pathlib.Path
+
+            Directory containing the output files.
+
+        filenames : iterable
+
+            Names of the output files, relative to ``workingdir``.
+
+        """
+        entry = self.dirname / key
+        if entry.exists():
+            return
+        # Write to a temporary directory first so that concurrent readers never see
+        # incomplete entries.
+        tmp = self.dirname / f".{key}-{os.getpid()}-{threading.get_ident()}"
+        tmp.mkdir(parents=True)
+        files = sorted(filenames)
+        size = 0
+        for filename in files:
+            shutil.copy2(pathlib.Path(workingdir, filename), tmp / filename)
+            size += (tmp / filename).stat().st_size
+        with open(tmp / self._meta, "w", encoding="utf-8") as f:
+            json.dump({"files": files, "size": size, "created": time.time()}, f)
+        try:
+            tmp.rename(entry)
+        except OSError:  # stored concurrently by another process
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in self.dirname.glob("[!.]*"):
+            try:
+                with open(entry / self._meta, encoding="utf-8") as f:
+                    size = json.load(f)["size"]
+                last_used = (entry / self._meta).stat().st_mtime
+            except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+                continue
+            entries.append((last_used, size, entry))
+        return sorted(entries)
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            while entries and (
+                (self.max_size is not None and total > self.max_size)
+                or (self.max_entries is not None and len(entries) > self.max_entries)
+            ):
+                _, size, entry = entries.pop(0)
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                log.debug("Evicted cached OOMMF result %(entry)s.", {"entry": entry})
+
+    @property
+    def stats(self):
+        """Cache statistics.
+
+        Returns
+        -------
+        dict
+
+            Number of hits and misses in this Python session, number of stored
+            entries, and their total size in bytes.
+
+        """
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+        }
+
+    def clear(self):
+        """Remove all cached results."""
+        shutil.rmtree(self.dirname, ignore_errors=True)
+
+    def __repr__(self):
+        return (
+            f"ResultCache(dirname={str(self.dirname)!r}, max_size={self.max_size},"
+            f" max_entries={self.max_entries})"
+        )
@@ -1,46 +1,59 @@
+import collections.abc
 import contextlib
 import os
 import re
-
-import discretisedfield as df
-import micromagneticmodel as mm
-import ubermagtable as ut
-import ubermagutil as uu
+import warnings
 
 import oommfc as oc
 
-
-def oxs_class(term, system):
-    """Extract the OOMMF ``Oxs_`` class name of an individual term."""
-    mif = getattr(oc.scripts.energy, f"{term.name}_script")(term, system)
-    return re.search(r"Oxs_([\w_]+)", mif).group(1)
+# ``import oommfc`` imports this module, so that ``oommfc.compute`` is the function.
+# Heavy dependencies are therefore only imported in the functions using them.
 
 
 def schedule_script(func, system):
     """Generate OOMMF ``Schedule...`` line for saving an individual value."""
-    if func.__name__ == "energy":
+    output = _output_name(func)
+    if output is None:
         return ""  # Datatable with energies is saved by default.
+    return f'Schedule "{output}" archive Step 1\n'
+
+
+def oxs_class(term, system):
+    """Extract the OOMMF ``Oxs_`` class name of an individual term.
+
+    .. deprecated::
+        Use ``oommfc.scripts.oxs_class`` instead, which returns the full class
+        name and does not need ``system``.
+
+    """
+    msg = (
+        "`oommfc.compute.oxs_class` is deprecated; "
+        "use `oommfc.scripts.oxs_class` instead."
+    )
+    warnings.warn(msg, FutureWarning, stacklevel=2)
+    return oc.scripts.oxs_class(term).removeprefix("Oxs_")
+
+
+def _output_name(func):
+    """Name of the OOMMF output that has to be scheduled for ``func``."""
+    import micromagneticmodel as mm
+
+    if func.__name__ == "energy":
+        return None
     elif func.__name__ == "effective_field":
         if isinstance(func.__self__, mm.Energy):
-            output = "Oxs_RungeKuttaEvolve:evolver:Total field"
+            return "Oxs_RungeKuttaEvolve:evolver:Total field"
         else:
-            output = (
-                f"Oxs_{oxs_class(func.__self__, system)}:{func.__self__.name}:Field"
-            )
+            return oc.scripts.oxs_output(func.__self__, "Field")
     elif func.__name__ == "density":
         if isinstance(func.__self__, mm.Energy):
-            output = "Oxs_RungeKuttaEvolve:evolver:Total energy density"
+            return "Oxs_RungeKuttaEvolve:evolver:Total energy density"
         else:
-            output = (
-                f"Oxs_{oxs_class(func.__self__, system)}:"
-                f"{func.__self__.name}:Energy density"
-            )
+            return oc.scripts.oxs_output(func.__self__, "Energy density")
     else:
         msg = f"Computing the value of {func} is not supported."
         raise ValueError(msg)
 
-    return f'Schedule "{output}" archive Step 1\n'
-
 
 def compute(
     func,
@@ -52,6 +65,7 @@ def compute(
     runner=None,
     ovf_format="bin8",
     verbose=1,
+    backend="oommf",
 ):
     """Computes a particular value of an energy term or energy container
     (``energy``, ``density``, or ``effective_field``).
@@ -78,12 +92,13 @@ def compute(
         If ``True`` and the system directory already exists, drive or
         compute directories will be appended. Defaults to ``True``.
 
-    n_threads : int, optional
+    n_threads : int, str, optional
 
         Controls the number of threads that OOMMF uses. The number can alternatively
         also be controlled via the environment variable ``OOMMF_THREADS``. If not
         specified a default value that depends on the OOMMF installation (typically
-        4) is used.
+        4) is used. With ``n_threads='auto'`` the number of threads is chosen with
+        ``oommfc.autotune.optimal_n_threads``.
 
     ovf_format : str
 
@@ -98,12 +113,28 @@ def compute(
         information about the OOMMF runner and the runtime is printed to
         stdout. Defaults is ``verbose=1``.
 
+    backend : str, optional
+
+        If ``backend='numpy'``, the value is computed directly from
+        ``system.m.array`` without running OOMMF, using the same discretisation
+        and conventions as the Oxs classes. This is supported for Zeeman (without
+        time dependence), uniaxial and cubic anisotropy, exchange and DMI with
+        spatially constant ``A`` and ``D``, and energy containers with only such
+        terms. With ``backend='auto'``, NumPy is used if it supports the value and
+        OOMMF otherwise. Defaults to ``'oommf'``.
+
     Returns
     -------
     numbers.Real, discretisedfield.Field
 
         Resulting value.
 
+    Raises
+    ------
+    ValueError
+
+        If the value cannot be computed with the selected backend.
+
     Examples
     --------
     1. Computing values of energy terms.
@@ -122,52 +153,453 @@ def compute(
     Running OOMMF...
     Field(...)
 
+    2. Computing a value without running OOMMF.
+
+    >>> oc.compute(system.energy.zeeman.energy, system, backend="numpy")
+    -8.8...e-22
+
+    """
+    import ubermagutil as uu
+
+    if _numpy_backend([func], backend):
+        _check_temperature(system)
+        return oc.numpy_backend.compute(func, system)
+
+    n_threads = oc.autotune._resolve(n_threads, system, runner)
+    stats = oc.runstats.RunStats()
+    with stats.activate():
+        with stats.phase("write_mif"):
+            td, workingdir = _setup_compute([func], system, dirname, append, ovf_format)
+        with uu.changedir(workingdir), stats.oommf():
+            td._call(system=system, runner=runner, n_threads=n_threads, verbose=verbose)
+
+        system.compute_number += 1
+
+        with stats.phase("read_data"):
+            value = _read_outputs([func], system, workingdir)[0]
+    stats.record(system, "Compute")
+    return value
+
+
+def compute_many(
+    funcs,
+    system,
+    /,
+    dirname=".",
+    append=True,
+    n_threads=None,
+    runner=None,
+    ovf_format="bin8",
+    verbose=1,
+    backend="oommf",
+):
+    """Compute multiple values of energy terms or energy containers in a single
+    OOMMF run.
+
+    All required outputs are scheduled in one MIF file so that OOMMF is only run
+    once, instead of once per value as with repeated calls to ``oommfc.compute``.
+    The datatable is read only once. The function accepts the same arguments as
+    ``oommfc.compute`` except that ``funcs`` is a sequence of properties.
+
+    Parameters
+    ----------
+    funcs : Iterable[callable]
+
+        Properties of energy terms or energy containers (``energy``,
+        ``density``, or ``effective_field``).
+
+    system : micromagneticmodel.System
+
+        Micromagnetic system for which the properties are calculated.
+
+    Returns
+    -------
+    dict
+
+        Resulting values (``numbers.Real`` or ``discretisedfield.Field``) with
+        the elements of ``funcs`` as keys.
+
+    Raises
+    ------
+    ValueError
+
+        If computing any of the values is not supported.
+
+    Examples
+    --------
+    1. Computing multiple values of energy terms.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> funcs = [
+    ...     system.energy.zeeman.energy,
+    ...     system.energy.zeeman.effective_field,
+    ...     system.energy.density,
+    ... ]
+    >>> values = oc.compute_many(funcs, system)
+    Running OOMMF...
+    >>> values[system.energy.zeeman.energy]
+    -8.8...e-22
+
+    .. seealso:: :py:func:`~oommfc.compute`
+
     """
+    import ubermagutil as uu
+
+    funcs = list(dict.fromkeys(funcs))  # remove duplicates
+    if not funcs:
+        return {}
+    if _numpy_backend(funcs, backend):
+        _check_temperature(system)
+        return {func: oc.numpy_backend.compute(func, system) for func in funcs}
+    n_threads = oc.autotune._resolve(n_threads, system, runner)
+    stats = oc.runstats.RunStats()
+    with stats.activate():
+        with stats.phase("write_mif"):
+            td, workingdir = _setup_compute(funcs, system, dirname, append, ovf_format)
+        with uu.changedir(workingdir), stats.oommf():
+            td._call(system=system, runner=runner, n_threads=n_threads, verbose=verbose)
+
+        system.compute_number += 1
+
+        with stats.phase("read_data"):
+            values = dict(zip(funcs, _read_outputs(funcs, system, workingdir)))
+    stats.record(system, "Compute")
+    return values
+
+
+def compute_batch(
+    func,
+    system,
+    states,
+    /,
+    dirname=".",
+    append=True,
+    n_threads=None,
+    runner=None,
+    ovf_format="bin8",
+    verbose=1,
+):
+    """Compute a value of an energy term or energy container for many
+    magnetisation states.
+
+    The MIF file and all input files are written only once, to a single compute
+    directory. In the MIF file the initial magnetisation file and the base name of
+    the output files are MIF parameters. Every state is written to
+    ``state-<index>.omf`` and evaluated by running the same MIF file with
+    ``boxsi -parameters``. OOMMF reads the initial magnetisation only when a
+    problem is loaded, so ``boxsi`` is still started once per state.
+
+    Parameters
+    ----------
+    func : callable
+
+        A property of an energy term or an energy container (``energy``,
+        ``density``, or ``effective_field``).
+
+    system : micromagneticmodel.System
+
+        Micromagnetic system for which the property is calculated. Its
+        magnetisation is not changed.
+
+    states : Iterable[discretisedfield.Field, array_like]
+
+        Magnetisation states, e.g. the frames of a trajectory. Fields must be
+        defined on the mesh of ``system.m``; other values are converted with
+        ``discretisedfield.Field(system.m.mesh, nvdim=3, value=state)``.
+
+    Other parameters are the same as for ``oommfc.compute``.
+
+    Returns
+    -------
+    numpy.ndarray, collections.abc.Sequence
+
+        Energies of all states as an array of shape ``(len(states),)`` or a
+        sequence of ``discretisedfield.Field`` objects, which are read from disk
+        when accessed.
+
+    Raises
+    ------
+    ValueError
+
+        If a state is not defined on the mesh of ``system.m``.
+
+    Examples
+    --------
+    1. Computing the energy of multiple states.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> states = [(0, 0, 8e5), (0, 8e5, 0), (0, 0, -8e5)]
+    >>> energies = oc.compute_batch(system.energy.energy, system, states)
+    Running OOMMF...
+    >>> energies.shape
+    (3,)
+
+    .. seealso:: :py:func:`~oommfc.compute`
+
+    """
+    import discretisedfield as df
+    import numpy as np
+    import ubermagutil as uu
+
+    states = [
+        state
+        if isinstance(state, df.Field)
+        else df.Field(system.m.mesh, nvdim=3, value=state)
+        for state in states
+    ]
+    if any(state.mesh != system.m.mesh or state.nvdim != 3 for state in states):
+        raise ValueError("All states must be vector fields on the mesh of system.m.")
+
+    if runner is None:
+        runner = oc.runner.runner
+    n_threads = oc.autotune._resolve(n_threads, system, runner)
+    if verbose >= 1:
+        context = uu.progress.summary(
+            package_name=runner.package_name, runner_name=runner.__class__.__name__
+        )
+    else:
+        context = uu.progress.quiet()
+
+    basenames = [f"{system.name}-state{index}" for index in range(len(states))]
+    stats = oc.runstats.RunStats()
+    with stats.activate():
+        with stats.phase("write_mif"):
+            td, workingdir = _setup_compute([func], system, dirname, append, ovf_format)
+            _parametrise_m0(workingdir / td._miffilename(system), system)
+        with stats.phase("write_fields"):
+            for index, state in enumerate(states):
+                state.to_file(workingdir / f"state-{index}.omf")
+        with context, stats.oommf():
+            for index, basename in enumerate(basenames):
+                td._call(
+                    system=system,
+                    runner=runner,
+                    n_threads=n_threads,
+                    verbose=0,
+                    workingdir=workingdir,
+                    parameters=f"basename {basename} m0file state-{index}.omf",
+                )
+
+        system.compute_number += 1
+
+        if func.__name__ == "energy":
+            with stats.phase("read_data"):
+                values = np.array(
+                    [
+                        _read_outputs([func], system, workingdir, basename)[0]
+                        for basename in basenames
+                    ]
+                )
+        else:
+            values = _LazyOutputs(func, system, workingdir, basenames)
+    stats.record(system, "Compute")
+    return values
+
+
+class _LazyOutputs(collections.abc.Sequence):
+    """Sequence of fields computed by ``compute_batch`` read when accessed."""
+
+    def __init__(self, func, system, workingdir, basenames):
+        self._func = func
+        self._system = system
+        self._workingdir = workingdir
+        self._basenames = basenames
+
+    def __len__(self):
+        return len(self._basenames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        return _read_outputs(
+            [self._func], self._system, self._workingdir, self._basenames[index]
+        )[0]
+
+    def __repr__(self):
+        return f"<{len(self)} computed {self._func.__name__} fields>"
+
+
+async def compute_async(
+    func,
+    system,
+    /,
+    dirname=".",
+    append=True,
+    n_threads=None,
+    runner=None,
+    ovf_format="bin8",
+    verbose=1,
+):
+    """Asynchronously compute a particular value of an energy term or energy
+    container (``energy``, ``density``, or ``effective_field``).
+
+    This is the awaitable counterpart of ``oommfc.compute`` and accepts the same
+    arguments. OOMMF runs in a subprocess without blocking the event loop. The
+    total number of threads used by concurrent runs is limited by
+    ``oommfc.runner.max_threads``.
+
+    Returns
+    -------
+    numbers.Real, discretisedfield.Field
+
+        Resulting value.
+
+    Examples
+    --------
+    1. Computing multiple values concurrently.
+
+    >>> import asyncio
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> async def main():
+    ...     return await asyncio.gather(
+    ...         oc.compute_async(system.energy.energy, system),
+    ...         oc.compute_async(system.energy.effective_field, system),
+    ...     )
+    >>> energy, field = asyncio.run(main())
+    Running OOMMF...
+    Running OOMMF...
+
+    .. seealso:: :py:func:`~oommfc.compute`
+
+    """
+    import asyncio
+
+    # The trial simulations for n_threads="auto" must not block the event loop.
+    n_threads = await asyncio.to_thread(oc.autotune._resolve, n_threads, system, runner)
+    stats = oc.runstats.RunStats()
+    with stats.activate():
+        with stats.phase("write_mif"):
+            td, workingdir = _setup_compute([func], system, dirname, append, ovf_format)
+        with stats.oommf():
+            await td._call_async(
+                system=system,
+                runner=runner,
+                n_threads=n_threads,
+                verbose=verbose,
+                workingdir=workingdir,
+            )
+
+        # Concurrent computations of the same system may finish in any order.
+        number = int(workingdir.name.split("-")[1])
+        system.compute_number = max(system.compute_number, number + 1)
+
+        with stats.phase("read_data"):
+            value = _read_outputs([func], system, workingdir)[0]
+    stats.record(system, "Compute")
+    return value
+
+
+def _numpy_backend(funcs, backend):
+    """Check if ``funcs`` are computed with ``oommfc.numpy_backend``."""
+    if backend == "oommf":
+        return False
+    elif backend == "numpy":
+        for func in funcs:
+            if not oc.numpy_backend.supports(func):
+                msg = f"Computing {func} is not supported by the NumPy backend."
+                raise ValueError(msg)
+        return True
+    elif backend == "auto":
+        return all(oc.numpy_backend.supports(func) for func in funcs)
+    else:
+        raise ValueError(f"Invalid {backend=}.")
+
+
+def _check_temperature(system):
     if system.T > 0:
         raise RuntimeError(
             "`oc.compute` does not support finite temperature."
             f" (Temperature is specified as {system.T=})"
         )
 
+
+def _setup_compute(funcs, system, dirname, append, ovf_format):
+    import ubermagutil as uu
+
+    _check_temperature(system)
+
     td = oc.TimeDriver(total_iteration_limit=1)
     workingdir = td._setup_working_directory(
         system=system, dirname=dirname, mode="compute", append=append
-    )
+    ).absolute()
     with uu.changedir(workingdir):
         td.write_mif(
             system=system,
             t=1e-25,
             n=1,
             ovf_format=ovf_format,
-            compute=schedule_script(func, system),
+            compute="".join(schedule_script(func, system) for func in funcs),
         )
-        td._call(system=system, runner=runner, n_threads=n_threads, verbose=verbose)
 
-    system.compute_number += 1
-
-    if func.__name__ == "energy":
-        extension = "odt"
-    elif func.__name__ == "effective_field":
-        extension = "ohf"
-    elif func.__name__ == "density":
-        extension = "oef"
+    return td, workingdir
+
+
+def _parametrise_m0(miffile, system):
+    """Make the magnetisation file and output base name MIF parameters."""
+    mif = miffile.read_text(encoding="utf-8")
+    header, rest = mif.split("\n", 1)
+    declarations = f"Parameter basename {system.name}\nParameter m0file m0.omf\n"
+    head, rest = rest.split("SetOptions {\n", 1)
+    options, rest = rest.split("\n}\n", 1)
+    options = options.replace(f"basename {system.name}", "basename $basename")
+    m0 = oc.scripts.util.file_vector_field("m0.omf", "m0", "main_atlas")
+    m0_parameter = m0.replace(" {\n", " [subst {\n").replace("m0.omf", "$m0file")
+    rest = rest.replace(m0, m0_parameter.replace("}\n\n", "}]\n\n"))
+    miffile.write_text(
+        f"{header}\n\n{declarations}{head}SetOptions [subst {{\n{options}\n}}]\n{rest}",
+        encoding="utf-8",
+    )
 
-    output_file = max(workingdir.glob(f"*.{extension}"), key=os.path.getctime)
 
-    if func.__name__ == "energy":
-        table = ut.Table.fromfile(output_file, rename=False)
-        if isinstance(func.__self__, mm.Energy):
-            col = [
-                c for c in table.data.columns if c.endswith(":evolver:Total energy")
-            ][0]
-            output = table.data[col][0].item()
+def _read_outputs(funcs, system, workingdir, basename="*"):
+    import discretisedfield as df
+    import micromagneticmodel as mm
+    import ubermagtable as ut
+
+    table = None
+    outputs = []
+    for func in funcs:
+        if func.__name__ == "energy":
+            if table is None:  # all energies are in the same datatable
+                table = ut.Table.fromfile(
+                    _output_file(func, workingdir, "odt", basename), rename=False
+                )
+            if isinstance(func.__self__, mm.Energy):
+                col = [
+                    c for c in table.data.columns if c.endswith(":evolver:Total energy")
+                ][0]
+            else:
+                col = oc.scripts.oxs_output(func.__self__, "Energy", prefix=False)
+            outputs.append(table.data[col][0].item())
         else:
-            output = table.data[
-                f"{oxs_class(func.__self__, system)}:{func.__self__.name}:Energy"
-            ][0].item()
-    else:
-        output = df.Field.from_file(output_file)
-        with contextlib.suppress(FileNotFoundError):
-            output.mesh.load_subregions(workingdir / "m0.omf")
+            extension = "ohf" if func.__name__ == "effective_field" else "oef"
+            output = df.Field.from_file(
+                _output_file(func, workingdir, extension, basename)
+            )
+            with contextlib.suppress(FileNotFoundError):
+                output.mesh.load_subregions(workingdir / "m0.omf")
+            outputs.append(output)
+
+    return outputs
 
-    return output
+
+def _output_file(func, workingdir, extension, basename="*"):
+    if extension == "odt":
+        files = list(workingdir.glob(f"{basename}.odt"))
+    else:
+        files = list(workingdir.glob(f"{basename}-*.{extension}"))
+    if (name := _output_name(func)) is not None:
+        # OOMMF includes the output name in the file name, with separators
+        # replaced, e.g. ``<basename>-Oxs_Demag-demag-Field-00-0000001.ohf``.
+        name = re.sub(r"[\W_]", "", name)
+        files = [f for f in files if name in re.sub(r"[\W_]", "", f.name)] or files
+    return max(files, key=os.path.getctime)
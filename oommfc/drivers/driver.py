@@ -1,10 +1,19 @@
 import abc
+import asyncio
+import contextlib
+import datetime
+import hashlib
+import itertools
+import json
+import os
 import pathlib
+import re
+import time
+import weakref
 
 import discretisedfield as df
 import micromagneticmodel as mm
 import numpy as np
-import ubermagtable as ut
 import ubermagutil as uu
 
 import oommfc as oc
@@ -13,6 +22,9 @@ import oommfc as oc
 class Driver(mm.ExternalDriver):
     """Driver base class."""
 
+    # Interval in seconds in which the output of streamed drives is checked.
+    _poll_interval = 0.1
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if hasattr(self, "evolver"):
@@ -47,24 +59,105 @@ class Driver(mm.ExternalDriver):
 
             If ``True``, output is saved at each step. Default to ``False``.
 
-        n_threads : int, optional
+        n_threads : int, str, optional
 
             Controls the number of threads that OOMMF uses. The number can alternatively
             also be controlled via the environment variable ``OOMMF_THREADS``. If not
             specified a default value that depends on the OOMMF installation (typically
-            4) is used.
+            4) is used. With ``n_threads='auto'`` the number of threads for which
+            OOMMF runs the system fastest is determined with short trial simulations
+            (see ``oommfc.autotune.optimal_n_threads``).
 
         compute : str, optional
 
             ``Schedule...`` MIF line which can be added to the OOMMF file to
             save additional data. Defaults to ``None``.
 
+        read_mode : str, optional
+
+            How the final magnetisation is read from the OOMMF output. With
+            ``'copy'`` the output file is read with ``discretisedfield.Field`` and
+            its array is assigned to ``system.m``. With ``'mmap'`` the binary output
+            file is memory-mapped and the data is copied directly into the existing
+            array of ``system.m``, which avoids intermediate copies for large meshes.
+            Text output (``ovf_format='txt'``) is always read with
+            ``discretisedfield.Field``. Defaults to ``'copy'``.
+
+        stream : bool, optional
+
+            If ``True``, ``drive`` does not wait for OOMMF to finish but returns a
+            generator. OOMMF is started when the generator is first advanced, and
+            for every magnetisation file completed by OOMMF it yields a tuple
+            ``(stage, time, m, row)``, where ``m`` is the magnetisation array and
+            ``row`` the matching table row as ``dict`` (``time`` is ``None`` for
+            drivers without simulation time). Closing the generator early with
+            its ``close`` method stops OOMMF. When the generator is
+            exhausted or closed, ``system`` is updated with the last completed
+            magnetisation and the table read so far. Results are not loaded from or
+            stored in ``oommfc.runner.cache``. Defaults to ``False``.
+
+        callback : callable, optional
+
+            Function called as ``callback(stage, time, m, row)`` for every
+            magnetisation file completed by OOMMF (with the same arguments as
+            yielded for ``stream=True``). If it returns ``True``, OOMMF is stopped,
+            the output written so far is kept, ``system.m`` is updated from the
+            last completed stage, and the drive finishes successfully. Stages are
+            saved for every stage of time drives and, with ``output_step=True``,
+            for every step of minimisation drives. Results are not loaded from or
+            stored in ``oommfc.runner.cache``. Defaults to ``None``.
+
+        checkpoint : bool, float, optional
+
+            If ``True``, OOMMF writes checkpoints of the running simulation to
+            ``<system.name>.restart`` in the drive directory, so that an
+            interrupted drive can be continued with ``resume``. A number sets the
+            checkpoint interval in minutes (OOMMF's default is 15 minutes).
+            Checkpoints are removed by OOMMF once the drive finishes successfully.
+            Defaults to ``False``.
+
+        timeout : float, optional
+
+            Wall-clock time limit of the OOMMF run in seconds. If it is exceeded,
+            OOMMF (with all processes it started) is stopped, the reason is stored
+            in ``info.json`` in the drive directory under ``'watchdog'``, and
+            ``oommfc.OOMMFTimeoutError`` is raised. Defaults to ``None`` (no
+            limit).
+
+        stall_timeout : float, optional
+
+            If OOMMF does not create or change any file in the drive directory
+            for ``stall_timeout`` seconds, it is stopped as for ``timeout`` and
+            ``oommfc.OOMMFStallError`` is raised. It must be longer than the
+            time between two outputs; minimisation drives only write output at
+            the end unless ``output_step=True``. Defaults to ``None`` (no
+            limit).
+
         """
         self._checkargs(drive_kwargs)
         drive_kwargs.setdefault("fixed_subregions", None)
         drive_kwargs.setdefault("output_step", False)
         drive_kwargs.setdefault("n_threads", None)
         drive_kwargs.setdefault("compute", None)
+        drive_kwargs.setdefault("read_mode", "copy")
+        drive_kwargs.setdefault("stream", False)
+        drive_kwargs.setdefault("callback", None)
+        drive_kwargs.setdefault("checkpoint", False)
+        drive_kwargs.setdefault("timeout", None)
+        drive_kwargs.setdefault("stall_timeout", None)
+        if (read_mode := drive_kwargs["read_mode"]) not in ("copy", "mmap"):
+            raise ValueError(f"Invalid {read_mode=}.")
+        checkpoint = drive_kwargs["checkpoint"]
+        if not isinstance(checkpoint, (bool, int, float)) or checkpoint < 0:
+            raise ValueError(f"Invalid {checkpoint=}.")
+        for name in ["timeout", "stall_timeout"]:
+            value = drive_kwargs[name]
+            if value is not None and (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+                or value <= 0
+            ):
+                raise ValueError(f"Invalid {name}={value!r}.")
 
     def schedule_kwargs_setup(self, schedule_kwargs):
         """Additional keyword arguments allowed for schedule.
@@ -183,32 +276,590 @@ class Driver(mm.ExternalDriver):
                 self._time_dependence(term=term, **kwargs)
 
         with uu.changedir(dirname):
-            mif = oc.scripts.system_script(system, ovf_format=ovf_format)
-            mif += oc.scripts.driver_script(
-                self,
-                system,
-                fixed_subregions=fixed_subregions,
-                output_step=output_step,
-                compute=compute,
-                **kwargs,
+            # The MIF script is streamed into the file chunk by chunk.
+            mif = itertools.chain(
+                oc.scripts.system_script.iter(
+                    system, ovf_format=ovf_format, m0_source=self._m0_source(system)
+                ),
+                oc.scripts.driver_script.iter(
+                    self,
+                    system,
+                    fixed_subregions=fixed_subregions,
+                    output_step=output_step,
+                    compute=compute,
+                    **kwargs,
+                ),
             )
-            with open(self._miffilename(system), "w", encoding="utf-8") as miffile:
-                miffile.write(mif)
+            miffilename = self._miffilename(system)
+            try:
+                with open(miffilename, "w", encoding="utf-8") as miffile:
+                    miffile.writelines(mif)
+            except Exception:
+                # Do not leave an incomplete MIF file behind.
+                pathlib.Path(miffilename).unlink(missing_ok=True)
+                raise
 
         # remove information about fixed cells for subsequent runs
         if hasattr(self.evolver, "fixed_spins"):
             del self.evolver.fixed_spins
 
-    def _call(self, system, runner, n_threads=None, verbose=1, **kwargs):
+    def _call(
+        self,
+        system,
+        runner,
+        n_threads=None,
+        verbose=1,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        **kwargs,
+    ):
+        if runner is None:
+            runner = oc.runner.runner
+        with self._cached(system, runner, workingdir, verbose, parameters) as cached:
+            if cached:
+                return
+            runner.call(
+                argstr=self._miffilename(system),
+                n_threads=n_threads,
+                verbose=verbose,
+                total=kwargs.get("n"),
+                glob_name=f"{system.name}*.omf",
+                workingdir=workingdir,
+                restart=restart,
+                parameters=parameters,
+                **self._limits(kwargs),
+            )
+
+    async def _call_async(
+        self,
+        system,
+        runner,
+        n_threads=None,
+        verbose=1,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        **kwargs,
+    ):
+        if runner is None:
+            runner = oc.runner.runner
+        with self._cached(system, runner, workingdir, verbose, parameters) as cached:
+            if cached:
+                return
+            async with oc.runner._thread_limiter.reserve(n_threads):
+                await runner.call_async(
+                    argstr=self._miffilename(system),
+                    n_threads=n_threads,
+                    verbose=verbose,
+                    workingdir=workingdir,
+                    restart=restart,
+                    parameters=parameters,
+                    **self._limits(kwargs),
+                )
+
+    @staticmethod
+    def _limits(kwargs):
+        """Watchdog limits of a drive passed to the runner if they are set."""
+        return {
+            name: kwargs[name]
+            for name in ["timeout", "stall_timeout"]
+            if kwargs.get(name) is not None
+        }
+
+    @classmethod
+    def _record_watchdog(cls, error, filename="info.json"):
+        """Store why the watchdog stopped OOMMF in ``info.json``."""
+        if isinstance(error, oc.oommf.OOMMFTimeoutError):
+            cls._extend_info_json(
+                filename, watchdog={"reason": error.reason, "message": str(error)}
+            )
+
+    @staticmethod
+    def _extend_info_json(filename="info.json", **items):
+        with open(filename, encoding="utf-8") as f:
+            info = json.load(f)
+        info.update(items)
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+
+    @staticmethod
+    def _resolve_n_threads(system, runner, kwargs):
+        """Replace ``n_threads='auto'`` with the optimal number of threads."""
+        if kwargs.get("n_threads") == "auto":
+            n_threads = oc.autotune.optimal_n_threads(system, runner=runner)
+            kwargs = {**kwargs, "n_threads": n_threads}
+        return kwargs
+
+    @contextlib.contextmanager
+    def _cached(self, system, runner, workingdir, verbose, parameters=None):
+        """Load results from ``oommfc.runner.cache`` or store them after the run.
+
+        Yields ``True`` if the output files have been restored from the cache and
+        OOMMF must not be run.
+
+        """
+        cache = oc.runner.cache
+        if cache is None:
+            yield False
+            return
+
+        workingdir = pathlib.Path(workingdir or ".")
+        key = cache.key(self._miffilename(system), workingdir, parameters, runner)
+        if cache.load(key, workingdir):
+            if verbose >= 1:
+                print("Loaded OOMMF result from cache.")
+            yield True
+            return
+
+        inputs = set(os.listdir(workingdir))
+        yield False
+        outputs = set(os.listdir(workingdir)) - inputs - {"info.json"}
+        cache.store(key, workingdir, outputs)
+
+    def drive(
+        self,
+        system,
+        /,
+        dirname=".",
+        append=True,
+        runner=None,
+        ovf_format="bin8",
+        verbose=1,
+        **kwargs,
+    ):
+        self._check_system(system)
+        drive_kwargs = kwargs.copy()
+        drive_kwargs.pop("callback", None)  # not JSON serialisable for info.json
+        self.drive_kwargs_setup(kwargs)
+        # Arguments are checked before the trial simulations for n_threads="auto".
+        kwargs = self._resolve_n_threads(system, runner, kwargs)
+        if "n_threads" in drive_kwargs:
+            drive_kwargs["n_threads"] = kwargs["n_threads"]
+        workingdir = self._setup_working_directory(
+            system=system, dirname=dirname, mode="drive", append=append
+        )
+        start_time = datetime.datetime.now()
+
+        if kwargs["stream"] or kwargs["callback"] is not None:
+            workingdir = workingdir.absolute()
+            stats = oc.runstats.RunStats()
+            with uu.changedir(workingdir), stats.activate():
+                with stats.phase("write_mif"):
+                    self._write_input_files(
+                        system=system, ovf_format=ovf_format, **kwargs
+                    )
+                self._write_info_json(system, start_time, **drive_kwargs)
+            stream = self._drive_stream(
+                system,
+                workingdir,
+                start_time,
+                stats,
+                runner=runner,
+                verbose=verbose,
+                **kwargs,
+            )
+            if kwargs["stream"]:
+                return stream
+            for _ in stream:
+                pass
+            return
+
+        stats = oc.runstats.RunStats()
+        with uu.changedir(workingdir), stats.activate():
+            with stats.phase("write_mif"):
+                self._write_input_files(system=system, ovf_format=ovf_format, **kwargs)
+            self._write_info_json(system, start_time, **drive_kwargs)
+            try:
+                with stats.oommf():
+                    self._call(system=system, runner=runner, verbose=verbose, **kwargs)
+            except Exception as error:
+                success = False
+                self._record_watchdog(error)
+                raise
+            else:
+                success = True
+            finally:
+                end_time = datetime.datetime.now()
+                self._update_info_json(start_time, end_time, success)
+            with stats.phase("read_data"):
+                self._read_data(system, read_mode=kwargs["read_mode"])
+            self._extend_info_json(run_stats=stats.record(system, "Drive"))
+        system.drive_number += 1
+
+    drive.__doc__ = mm.ExternalDriver.drive.__doc__
+
+    def resume(self, system, /, dirname=".", runner=None, verbose=1):
+        """Resume the last, interrupted drive of the system from its checkpoint.
+
+        The last drive directory of ``system`` in ``dirname`` must contain a drive
+        of this driver type that was run with ``checkpoint=True`` and did not
+        finish successfully (e.g. because the job was preempted). OOMMF is run
+        again with the existing MIF file and continues from the latest checkpoint
+        (or starts from the beginning if no checkpoint has been written yet),
+        with the same number of threads, ``timeout``, and ``stall_timeout`` as the
+        interrupted drive. Afterwards ``system`` is updated and the statistics of
+        the resumed run are recorded as after ``drive``.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object whose drive is resumed.
+
+        dirname : str, optional
+
+            Name of the base directory passed to the interrupted ``drive``.
+            Defaults to the current working directory.
+
+        runner : oommfc.oommf.OOMMFRunner, optional
+
+            OOMMF Runner which is going to be used for running the calculation. If
+            ``None``, the default runner is used. Defaults to ``None``.
+
+        verbose : int, optional
+
+            If ``verbose=0``, no output is printed. For ``verbose>=1``
+            information about the runner and the runtime is printed to stdout.
+            Defaults to ``1``.
+
+        Raises
+        ------
+        ValueError
+
+            If there is no drive that can be resumed.
+
+        oommfc.OOMMFTimeoutError
+
+            If the watchdog of the drive stopped OOMMF.
+
+        Examples
+        --------
+        1. Resuming a drive ``td.drive(system, t=1e-9, n=100, checkpoint=5)`` that
+        was interrupted (e.g. in a new Python session).
+
+        >>> import micromagneticmodel as mm
+        >>> import oommfc as oc
+        ...
+        >>> system = mm.examples.macrospin()
+        >>> td = oc.TimeDriver()
+        >>> td.resume(system)  # doctest: +SKIP
+        Running OOMMF...
+
+        """
+        drives = pathlib.Path(dirname, system.name).glob("drive-*")
+        try:
+            workingdir = max(drives, key=lambda p: int(p.name.split("-")[1]))
+        except ValueError:
+            raise ValueError(
+                f"There is no drive of {system.name=} to resume."
+            ) from None
+        with open(workingdir / "info.json", encoding="utf-8") as f:
+            info = json.load(f)
+        if info["driver"] != self.__class__.__name__:
+            msg = f"Cannot resume drive with {info['driver']=} using {self!r}."
+            raise ValueError(msg)
+        if info.get("success"):
+            raise ValueError(f"Drive in {workingdir} finished successfully.")
+        if not info.get("checkpoint"):
+            raise ValueError(f"Drive in {workingdir} was run without checkpoints.")
+
+        # Arguments of the interrupted drive that affect how OOMMF is run.
+        kwargs = {
+            name: info[name]
+            for name in ["n_threads", "n", "timeout", "stall_timeout"]
+            if info.get(name) is not None
+        }
+        start_time = datetime.datetime.fromisoformat(info["start_time"])
+        stats = oc.runstats.RunStats()
+        with uu.changedir(workingdir), stats.activate():
+            try:
+                with stats.oommf():
+                    self._call(
+                        system=system,
+                        runner=runner,
+                        verbose=verbose,
+                        restart=True,
+                        **kwargs,
+                    )
+            except Exception as error:
+                success = False
+                self._record_watchdog(error)
+                raise
+            else:
+                success = True
+            finally:
+                end_time = datetime.datetime.now()
+                self._update_info_json(start_time, end_time, success)
+            with stats.phase("read_data"):
+                self._read_data(system, read_mode=info.get("read_mode", "copy"))
+            self._extend_info_json(run_stats=stats.record(system, "Resume"))
+        system.drive_number = info["drive_number"] + 1
+
+    def _drive_stream(
+        self,
+        system,
+        workingdir,
+        start_time,
+        stats,
+        runner=None,
+        n_threads=None,
+        verbose=1,
+        read_mode="copy",
+        callback=None,
+        **kwargs,
+    ):
+        """Run OOMMF and yield every magnetisation file as soon as it is complete.
+
+        If ``callback`` returns ``True`` for a yielded stage, OOMMF is stopped and
+        the generator is exhausted. The time until OOMMF is stopped, including the
+        time spent by the consumer of the generator, is recorded in ``stats`` as
+        the phase ``'oommf'``.
+
+        """
         if runner is None:
             runner = oc.runner.runner
-        runner.call(
-            argstr=self._miffilename(system),
-            n_threads=n_threads,
-            verbose=verbose,
-            total=kwargs.get("n"),
-            glob_name=f"{system.name}*.omf",
+        if verbose >= 1:
+            context = uu.progress.summary(
+                package_name=runner.package_name, runner_name=runner.__class__.__name__
+            )
+        else:
+            context = uu.progress.quiet()
+
+        reader = oc.readers.OdtReader(workingdir / f"{system.name}.odt", x=self._x)
+        last = None  # last yielded stage
+        stopped = success = False
+        with context:
+            try:
+                with stats.oommf():
+                    process = runner._start(
+                        self._miffilename(system),
+                        n_threads=n_threads,
+                        workingdir=workingdir,
+                        **self._limits(kwargs),
+                    )
+                    try:
+                        for last in self._watch(system, workingdir, process, reader):
+                            yield last
+                            if callback is not None and callback(*last):
+                                stopped = True
+                                break
+                        if not stopped:
+                            runner._check_returncode(process.result())
+                    finally:
+                        process.stop()
+                success = True
+            except Exception as error:
+                self._record_watchdog(error, workingdir / "info.json")
+                raise
+            finally:
+                end_time = datetime.datetime.now()
+                with uu.changedir(workingdir):
+                    self._update_info_json(start_time, end_time, success)
+                    with stats.phase("read_data"):
+                        if success and not stopped:
+                            self._read_data(system, read_mode=read_mode)
+                        elif last is not None:
+                            # keep everything OOMMF has written to the table so far
+                            if reader.filename.exists():
+                                reader.read()
+                            system.m.array = last[2]
+                            system.table = reader.table
+                    if success or last is not None:
+                        self._extend_info_json(run_stats=stats.record(system, "Drive"))
+                if success or last is not None:
+                    system.drive_number += 1
+
+    def _watch(self, system, workingdir, process, reader):
+        """Poll ``workingdir`` and yield stages of completed magnetisation files."""
+        done = set()
+        while True:
+            process.check()
+            # Poll the process first so that no output written before it finished
+            # can be missed.
+            finished = process.poll() is not None
+            for omffile, stage, iteration in self._completed_stages(
+                system, workingdir, done, finished
+            ):
+                if reader.filename.exists():
+                    reader.read()
+                row = self._table_row(reader, iteration)
+                if row is None and not finished:
+                    break  # the table row has not been written yet
+                row = row or {}
+                done.add(omffile.name)
+                if self._is_binary(omffile):
+                    array = np.array(oc.readers.read_ovf(omffile))
+                else:
+                    array = df.Field.from_file(str(omffile)).array
+                yield stage, row.get("t"), array, row
+            else:
+                if finished:
+                    return
+            time.sleep(self._poll_interval)
+
+    def _completed_stages(self, system, workingdir, done, finished):
+        """Completed, not yet processed magnetisation files in the order of writing.
+
+        While OOMMF is running, a file is complete once its last segment has been
+        written.
+
+        """
+        stages = []
+        for omffile in workingdir.glob(f"{system.name}-*.omf"):
+            if omffile.name in done:
+                continue
+            match = re.search(r"-(\d+)-(\d+)\.omf$", omffile.name)
+            if match is None:
+                continue
+            if not finished:
+                with open(omffile, "rb") as f:
+                    f.seek(max(0, omffile.stat().st_size - 64))
+                    if b"# end: segment" not in f.read().lower():
+                        continue
+            stages.append((int(match[2]), int(match[1]), omffile))
+        for iteration, stage, omffile in sorted(stages):
+            yield omffile, stage, iteration
+
+    @staticmethod
+    def _table_row(reader, iteration):
+        """Table row written at ``iteration`` as ``dict`` or ``None``."""
+        data = reader.data
+        if "iteration" in data.columns:
+            data = data[data["iteration"] == iteration]
+        if data.empty:
+            return None
+        return data.iloc[-1].to_dict()
+
+    async def drive_async(
+        self,
+        system,
+        /,
+        dirname=".",
+        append=True,
+        runner=None,
+        ovf_format="bin8",
+        verbose=1,
+        **kwargs,
+    ):
+        """Asynchronously drive the system in phase space.
+
+        This is the awaitable counterpart of ``drive`` and accepts the same
+        arguments. Input files are written and results are read in the event loop,
+        whereas OOMMF runs in a subprocess, so that many systems can be driven
+        concurrently from one event loop, e.g. using ``asyncio.gather``.
+
+        The total number of OOMMF threads used by concurrent runs is limited by
+        ``oommfc.runner.max_threads``. Each run counts with its ``n_threads``
+        (or the OOMMF default if not specified) and waits until enough threads are
+        free.
+
+        Concurrent drives must be used with different system objects. Systems with
+        the same name are stored in separate drive directories.
+
+        Parameters
+        ----------
+        system : micromagneticmodel.System
+
+            System object to be driven.
+
+        dirname : str, optional
+
+            Name of a base directory in which the simulation results are stored.
+            If not specified the current working directory is used.
+
+        append : bool, optional
+
+            If ``True`` and the system directory already exists, drive or compute
+            directories will be appended. Defaults to ``True``.
+
+        runner : oommfc.oommf.OOMMFRunner, optional
+
+            OOMMF Runner which is going to be used for running the calculation. If
+            ``None``, the default runner is used. Defaults to ``None``.
+
+        ovf_format : str
+
+            Format of the magnetisation output files written by OOMMF. Can be
+            one of ``'bin8'`` (binary, double precision), ``'bin4'`` (binary,
+            single precision) or ``'txt'`` (text-based, double precision).
+            Defaults to ``'bin8'``.
+
+        verbose : int, optional
+
+            If ``verbose=0``, no output is printed. For ``verbose>=1``
+            information about the runner and the runtime is printed to stdout.
+            Defaults to ``1``.
+
+        kwargs
+
+            Additional keyword arguments documented in ``drive_kwargs_setup``.
+
+        Examples
+        --------
+        1. Driving two systems concurrently.
+
+        >>> import asyncio
+        >>> import micromagneticmodel as mm
+        >>> import oommfc as oc
+        ...
+        >>> systems = [mm.examples.macrospin(), mm.examples.macrospin()]
+        >>> md = oc.MinDriver()
+        >>> async def main():
+        ...     await asyncio.gather(*(md.drive_async(s) for s in systems))
+        >>> asyncio.run(main())
+        Running OOMMF...
+        Running OOMMF...
+
+        """
+        self._check_system(system)
+        drive_kwargs = kwargs.copy()
+        self.drive_kwargs_setup(kwargs)
+        if kwargs["stream"] or kwargs["callback"] is not None:
+            raise ValueError("drive_async does not support stream and callback.")
+        # The trial simulations for n_threads="auto" must not block the event loop.
+        kwargs = await asyncio.to_thread(
+            self._resolve_n_threads, system, runner, kwargs
         )
+        if "n_threads" in drive_kwargs:
+            drive_kwargs["n_threads"] = kwargs["n_threads"]
+        workingdir = self._setup_working_directory(
+            system=system, dirname=dirname, mode="drive", append=append
+        ).absolute()
+        start_time = datetime.datetime.now()
+
+        stats = oc.runstats.RunStats()
+        # Changing the directory is safe as long as there is no await inside
+        # the context manager.
+        with uu.changedir(workingdir), stats.activate(), stats.phase("write_mif"):
+            self._write_input_files(system=system, ovf_format=ovf_format, **kwargs)
+            self._write_info_json(system, start_time, **drive_kwargs)
+
+        try:
+            with stats.oommf():
+                await self._call_async(
+                    system=system,
+                    runner=runner,
+                    verbose=verbose,
+                    workingdir=workingdir,
+                    **kwargs,
+                )
+        except Exception as error:
+            success = False
+            self._record_watchdog(error, workingdir / "info.json")
+            raise
+        else:
+            success = True
+        finally:
+            end_time = datetime.datetime.now()
+            with uu.changedir(workingdir):
+                self._update_info_json(start_time, end_time, success)
+
+        with uu.changedir(workingdir):
+            with stats.phase("read_data"):
+                self._read_data(system, read_mode=kwargs["read_mode"])
+            self._extend_info_json(run_stats=stats.record(system, "Drive"))
+        system.drive_number += 1
 
     def _schedule_commands(self, system, runner):
         if runner is None:
@@ -219,18 +870,61 @@ class Driver(mm.ExternalDriver):
             runner._kill(dry_run=True),
         ]
 
-    def _read_data(self, system):
+    def _read_data(self, system, read_mode="copy"):
         # Update system's magnetisation. An example .omf filename:
         # test_sample-Oxs_TimeDriver-Magnetization-01-0000008.omf
         omffiles = pathlib.Path(".").glob(f"{system.name}-*.omf")
         lastomffile = sorted(omffiles)[-1]
-        # pass Field.array instead of Field to system.m.value
-        # - to avoid overriding component labels
-        # - to avoid overriding subregions
-        # - for better performance
-        system.m.array = df.Field.from_file(str(lastomffile)).array
+        if read_mode == "mmap" and self._is_binary(lastomffile):
+            # copy the memory-mapped data directly into the existing array
+            oc.readers.read_ovf(lastomffile, out=system.m.array)
+        else:
+            # pass Field.array instead of Field to system.m.value
+            # - to avoid overriding component labels
+            # - to avoid overriding subregions
+            # - for better performance
+            system.m.array = df.Field.from_file(str(lastomffile)).array
+
+        # Remember the file system.m has been read from, so that the next drive
+        # can use it as m0 if system.m is not changed in the meantime.
+        system._m_source = (
+            weakref.ref(system.m.array),
+            self._digest(system.m.array),
+            lastomffile.absolute(),
+            lastomffile.stat().st_mtime_ns,
+        )
+
+        reader = oc.readers.OdtReader(f"{system.name}.odt", x=self._x)
+        reader.read()
+        system.table = reader.table
 
-        system.table = ut.Table.fromfile(f"{system.name}.odt", x=self._x)
+    @classmethod
+    def _m0_source(cls, system):
+        """Output file of the previous drive if ``system.m`` still has its values.
+
+        ``system.m`` is unchanged if it has the same array as after the previous
+        drive and the digest of the array recorded by ``_read_data`` still matches,
+        which also detects changes of the array in place without reading the file.
+
+        """
+        try:
+            array_ref, digest, filename, mtime = system._m_source
+        except AttributeError:
+            return None
+        # A new array is created whenever a value is assigned to system.m.
+        array = system.m.array
+        try:
+            if array is not array_ref() or filename.stat().st_mtime_ns != mtime:
+                return None
+        except FileNotFoundError:
+            return None
+        if not cls._is_binary(filename) or cls._digest(array) != digest:
+            return None
+        return filename
+
+    @staticmethod
+    def _digest(array):
+        return hashlib.blake2b(np.ascontiguousarray(array), digest_size=16).digest()
 
     @staticmethod
     def _time_dependence(term, **kwargs):
@@ -251,6 +945,14 @@ class Driver(mm.ExternalDriver):
         term.tlist = tlist
         term.dtlist = dtlist
 
+    @staticmethod
+    def _is_binary(filename):
+        with open(filename, "rb") as f:
+            for line in f:
+                if line.lower().startswith(b"# begin: data"):
+                    return b"binary" in line.lower()
+        return False
+
     @staticmethod
     def _miffilename(system):
         return f"{system.name}.mif"
@@ -0,0 +1,260 @@
+"""Evaluation of local and nearest-neighbour energy terms with NumPy.
+
+The energy density and the effective field of the supported energy terms are
+computed directly from ``system.m.array`` with the same discretisation, signs,
+and units as the Oxs classes generated for OOMMF:
+
+- ``Oxs_FixedZeeman``,
+- ``Oxs_UniaxialAnisotropy`` and ``Oxs_CubicAnisotropy``,
+- ``Oxs_UniformExchange`` (six-neighbour kernel),
+- ``Oxs_DMI_*`` with spatially constant ``D``.
+
+As in OOMMF, the saturation magnetisation is the norm of ``system.m``. Cells
+with zero saturation magnetisation, and neighbours outside the mesh (unless the
+boundary conditions are periodic), do not contribute.
+
+"""
+
+import numbers
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+
+import oommfc as oc
+
+mu0 = 4e-7 * np.pi  # the same value as MU0 in OOMMF
+
+# DMI vectors of crystal classes for the three spatial directions: the energy
+# density is the sum of D m . (v_i x dm/dx_i) over all directions i.
+_ex, _ey, _ez = np.eye(3)
+_zero = np.zeros(3)
+_dmi_vectors = {
+    "T": (_ex, _ey, _ez),
+    "Cnv_x": (_zero, np.cross(_ex, _ey), np.cross(_ex, _ez)),
+    "Cnv_y": (np.cross(_ey, _ex), _zero, np.cross(_ey, _ez)),
+    "Cnv_z": (np.cross(_ez, _ex), np.cross(_ez, _ey), _zero),
+    "D2d_x": (_zero, -_ey, _ez),
+    "D2d_y": (_ex, _zero, -_ez),
+    "D2d_z": (-_ex, _ey, _zero),
+}
+
+
+def supports(func):
+    """Check if ``func`` can be computed with the NumPy backend.
+
+    Parameters
+    ----------
+    func : callable
+
+        A property of an energy term or an energy container.
+
+    Returns
+    -------
+    bool
+
+        ``True`` if ``func`` is ``energy``, ``density`` or ``effective_field`` of
+        an energy term (or of an energy container with only such terms) that is
+        supported.
+
+    Examples
+    --------
+    1. Checking support of energy terms.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> oc.numpy_backend.supports(system.energy.zeeman.energy)
+    True
+    >>> oc.numpy_backend.supports(mm.Demag().energy)
+    False
+
+    """
+    if getattr(func, "__name__", None) not in ("energy", "density", "effective_field"):
+        return False
+    terms = func.__self__
+    if isinstance(terms, mm.EnergyTerm):
+        terms = [terms]
+    elif not isinstance(terms, mm.Energy):
+        return False
+    return all(_evaluator(term) is not None for term in terms)
+
+
+def compute(func, system):
+    """Compute ``energy``, ``density`` or ``effective_field`` with NumPy.
+
+    Parameters
+    ----------
+    func : callable
+
+        A property of an energy term or an energy container.
+
+    system : micromagneticmodel.System
+
+        Micromagnetic system for which the property is calculated.
+
+    Returns
+    -------
+    numbers.Real, discretisedfield.Field
+
+        Resulting value.
+
+    Raises
+    ------
+    ValueError
+
+        If ``func`` is not supported by the NumPy backend.
+
+    Examples
+    --------
+    1. Computing the Zeeman energy.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> oc.numpy_backend.compute(system.energy.zeeman.energy, system)
+    -8.8...e-22
+
+    """
+    if not supports(func):
+        raise ValueError(f"Computing {func} is not supported by the NumPy backend.")
+    terms = func.__self__
+    if isinstance(terms, mm.EnergyTerm):
+        terms = [terms]
+
+    mesh = system.m.mesh
+    Ms = np.linalg.norm(system.m.array, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m = np.where(Ms[..., None] > 0, system.m.array / Ms[..., None], 0)
+        Ms_inverse = np.where(Ms > 0, 1 / Ms, 0)
+
+    density = np.zeros(mesh.n)
+    field = np.zeros((*mesh.n, 3))
+    for term in terms:
+        term_density, term_field = _evaluator(term)(term, m, Ms_inverse, mesh)
+        density += term_density
+        field += term_field
+
+    if func.__name__ == "energy":
+        return float(density.sum() * mesh.dV)
+    elif func.__name__ == "density":
+        return df.Field(mesh, nvdim=1, value=density[..., None])
+    else:
+        return df.Field(mesh, nvdim=3, value=field)
+
+
+def _evaluator(term):
+    try:
+        cls = oc.scripts.oxs_class(term)
+    except ValueError:
+        return None
+    if cls.startswith("Oxs_DMI_"):
+        return _dmi if isinstance(term.D, numbers.Real) else None
+    return {
+        "Oxs_FixedZeeman": _zeeman,
+        "Oxs_UniaxialAnisotropy": _uniaxialanisotropy,
+        "Oxs_CubicAnisotropy": _cubicanisotropy,
+        "Oxs_UniformExchange": _exchange,
+    }.get(cls)
+
+
+def _scalar_parameter(value, mesh):
+    if isinstance(value, df.Field):
+        # OOMMF uses the norm of scalar fields (Oxs_VecMagScalarField).
+        return np.linalg.norm(value.array, axis=-1)
+    if isinstance(value, dict):
+        value = {"default": 0, **value}
+    return df.Field(mesh, nvdim=1, value=value).array[..., 0]
+
+
+def _vector_parameter(value, mesh, normalise=False):
+    if isinstance(value, df.Field):
+        array = value.array
+    else:
+        if isinstance(value, dict):
+            value = {"default": (0, 0, 0), **value}
+        array = df.Field(mesh, nvdim=3, value=value).array
+    if normalise:
+        norm = np.linalg.norm(array, axis=-1, keepdims=True)
+        array = np.divide(array, norm, out=np.zeros_like(array), where=norm > 0)
+    return array
+
+
+def _dot(a, b):
+    return np.einsum("...i,...i->...", a, b)
+
+
+def _neighbour(array, mesh, axis, step):
+    """Values of the neighbouring cells, or zero outside a non-periodic mesh."""
+    neighbour = np.roll(array, -step, axis=axis)
+    if mesh.region.dims[axis] not in mesh.bc:
+        index = [slice(None)] * array.ndim
+        index[axis] = -1 if step > 0 else 0
+        neighbour[tuple(index)] = 0
+    return neighbour
+
+
+def _zeeman(term, m, Ms_inverse, mesh):
+    H = _vector_parameter(term.H, mesh)
+    Ms = np.divide(1, Ms_inverse, out=np.zeros_like(Ms_inverse), where=Ms_inverse > 0)
+    return -mu0 * Ms * _dot(m, H), H
+
+
+def _uniaxialanisotropy(term, m, Ms_inverse, mesh):
+    K = _scalar_parameter(term.K, mesh)
+    u = _vector_parameter(term.u, mesh, normalise=True)
+    mu = _dot(m, u)
+    # As in OOMMF, the energy density is zero for the easy axis (K > 0) or the
+    # easy plane (K <= 0).
+    density = np.where(K > 0, K * (1 - mu**2), -K * mu**2) * (Ms_inverse > 0)
+    field = (2 / mu0 * K * mu * Ms_inverse)[..., None] * u
+    return density, field
+
+
+def _cubicanisotropy(term, m, Ms_inverse, mesh):
+    K = _scalar_parameter(term.K, mesh)
+    u1 = _vector_parameter(term.u1, mesh, normalise=True)
+    u2 = _vector_parameter(term.u2, mesh, normalise=True)
+    u3 = np.cross(u1, u2)
+    a1, a2, a3 = _dot(m, u1), _dot(m, u2), _dot(m, u3)
+    density = K * (a1**2 * a2**2 + a2**2 * a3**2 + a3**2 * a1**2)
+    coefficient = -2 / mu0 * K * Ms_inverse
+    field = (
+        (coefficient * a1 * (a2**2 + a3**2))[..., None] * u1
+        + (coefficient * a2 * (a3**2 + a1**2))[..., None] * u2
+        + (coefficient * a3 * (a1**2 + a2**2))[..., None] * u3
+    )
+    return density, field
+
+
+def _exchange(term, m, Ms_inverse, mesh):
+    magnetic = (Ms_inverse > 0).astype(float)[..., None]
+    laplacian = np.zeros_like(m)
+    for axis in range(3):
+        for step in (-1, 1):
+            neighbour = _neighbour(m, mesh, axis, step)
+            present = _neighbour(magnetic, mesh, axis, step)
+            laplacian += present * (neighbour - m) / mesh.cell[axis] ** 2
+    laplacian *= magnetic
+    density = -term.A * _dot(m, laplacian)
+    field = (2 / mu0 * term.A * Ms_inverse)[..., None] * laplacian
+    return density, field
+
+
+def _dmi(term, m, Ms_inverse, mesh):
+    crystalclass = {"O": "T", "Cnv": "Cnv_z", "D2d": "D2d_z"}.get(
+        term.crystalclass, term.crystalclass
+    )
+    curl = np.zeros_like(m)
+    for axis, vector in enumerate(_dmi_vectors[crystalclass]):
+        if np.any(vector):
+            derivative = (
+                _neighbour(m, mesh, axis, 1) - _neighbour(m, mesh, axis, -1)
+            ) / (2 * mesh.cell[axis])
+            curl += np.cross(vector, derivative)
+    curl *= (Ms_inverse > 0)[..., None]
+    density = term.D * _dot(m, curl)
+    field = (-2 / mu0 * term.D * Ms_inverse)[..., None] * curl
+    return density, field
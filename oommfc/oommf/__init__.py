@@ -3,6 +3,8 @@
 from .oommf import DockerOOMMFRunner as DockerOOMMFRunner
 from .oommf import ExeOOMMFRunner as ExeOOMMFRunner
 from .oommf import OOMMFRunner as OOMMFRunner
+from .oommf import OOMMFStallError as OOMMFStallError
+from .oommf import OOMMFTimeoutError as OOMMFTimeoutError
 from .oommf import Runner as Runner
 from .oommf import TclOOMMFRunner as TclOOMMFRunner
 from .oommf import overhead as overhead
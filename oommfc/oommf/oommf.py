@@ -1,20 +1,36 @@
 import abc
+import asyncio
 import atexit
 import contextlib
+import hashlib
+import itertools
+import json
 import logging
+import numbers
 import os
 import pathlib
+import shlex
 import shutil
+import signal
+import socket
 import subprocess as sp
 import sys
 import tempfile
+import threading
 import time
+import uuid
+import weakref
 
 import micromagneticmodel as mm
 import ubermagutil as uu
 
 import oommfc as oc
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 log = logging.getLogger("oommfc")
 
 
@@ -56,12 +72,123 @@ class OOMMFRunner(mm.ExternalRunner):
         """Simulation package name."""
         return "OOMMF"
 
-    def _call(self, argstr, need_stderr=False, n_threads=None, dry_run=False):
-        """This method should be implemented in subclass."""
+    def _call(
+        self,
+        argstr,
+        need_stderr=False,
+        n_threads=None,
+        dry_run=False,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+    ):
+        """This method should be implemented in subclass.
+
+        If ``restart=True``, OOMMF continues from the checkpoint file written by an
+        interrupted run (``boxsi -restart 1``) if there is one. ``parameters`` is a
+        string of names and values overriding ``Parameter`` declarations in the MIF
+        file (``boxsi -parameters``).
+
+        If the run takes longer than ``timeout`` seconds, or no file in
+        ``workingdir`` is created or changed for ``stall_timeout`` seconds, the
+        process tree of the run is stopped and ``OOMMFTimeoutError`` or
+        ``OOMMFStallError`` is raised.
+
+        """
+
+    async def _call_async(
+        self,
+        argstr,
+        n_threads=None,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+    ):
+        """This method should be implemented in subclass.
+
+        The arguments are the same as for ``_call``.
+
+        """
+        raise NotImplementedError(f"{self!r} does not support asynchronous runs.")
+
+    async def call_async(self, argstr, verbose=1, workingdir=None, **kwargs):
+        """Asynchronously call OOMMF by passing ``argstr`` to it.
+
+        This is the awaitable counterpart of ``call``. OOMMF is started in a
+        subprocess without blocking the event loop so that multiple runs can
+        be awaited concurrently.
+
+        Parameters
+        ----------
+        argstr : str
+
+            Argument string passed to OOMMF.
+
+        verbose : int, optional
+
+            If ``verbose=0``, no output is printed. For ``verbose>=1``
+            information about the runner and the runtime is printed to stdout.
+            Defaults to ``1``.
+
+        workingdir : pathlib.Path, optional
+
+            Directory in which OOMMF is started. If not specified the current
+            working directory is used.
+
+        Raises
+        ------
+        RuntimeError
+
+            If an error occured.
+
+        Returns
+        -------
+        subprocess.CompletedProcess
+
+            Completed OOMMF process.
+
+        """
+        if verbose >= 1:
+            context = uu.progress.summary(
+                package_name=self.package_name, runner_name=self.__class__.__name__
+            )
+        else:
+            context = uu.progress.quiet()
+
+        with context:
+            res = await self._call_async(argstr=argstr, workingdir=workingdir, **kwargs)
+
+        self._check_returncode(res)
+        return res
+
+    def _start(
+        self, argstr, n_threads=None, workingdir=None, timeout=None, stall_timeout=None
+    ):
+        """Start OOMMF without waiting for it and return an ``_OOMMFProcess``."""
+        raise NotImplementedError(f"{self!r} does not support supervised runs.")
+
+    def _check_returncode(self, res):
+        if res.returncode != 0:
+            msg = f"Error in {self.package_name} run.\n"
+            msg += f"command: {' '.join(res.args)}\n"
+            if sys.platform != "win32":
+                msg += f"stdout: {res.stdout.decode('utf-8', 'replace')}\n"
+                msg += f"stderr: {res.stderr.decode('utf-8', 'replace')}\n"
+            raise RuntimeError(msg)
 
     @abc.abstractmethod
-    def _kill(self, targets=("all",), dry_run=False):
-        """Kill OOMMF."""
+    def _kill(self, targets=None, dry_run=False):
+        """Kill the OOMMF applications started by this runner.
+
+        ``targets`` are OOMMF application IDs (OIDs). If ``None``, all
+        applications started by this runner are killed. The command of a dry run
+        kills all applications registered with the host server.
+
+        """
 
     @abc.abstractmethod
     def _launchhost(dry_run=False):
@@ -101,7 +228,7 @@ class OOMMFRunner(mm.ExternalRunner):
         '...'
 
         """
-        res = self.call(argstr="+version", need_stderr=True, verbose=0)
+        res = self._query("+version")
         return res.stderr.decode("utf-8").split("OOMMF")[-1].strip()
 
     @property
@@ -126,9 +253,13 @@ class OOMMFRunner(mm.ExternalRunner):
 
         """
         # in 2.0a3 platform information is written to stdout
-        res = self.call(argstr="+platform", need_stderr=True, verbose=0)
+        res = self._query("+platform")
         return res.stdout.decode("utf-8")
 
+    def _query(self, argstr):
+        """Run boxsi with an option such as ``+version`` that solves no problem."""
+        return self.call(argstr=argstr, need_stderr=True, verbose=0)
+
     @property
     def status(self):
         """Run a macrospin example for 1 ps through oommfc and print the OOMMF
@@ -174,19 +305,68 @@ class NativeOOMMFRunner(OOMMFRunner):
     Base class for ``TclOOMMFRunner`` and ``ExeOOMMFRunner``.
     Derived classes must implement a ``List`` ``self.oommf``.
 
+    On Linux and MacOS, the runner keeps one persistent ``mmArchive`` running for
+    each of its host servers, which writes the output of all runs registering with
+    that host. It is started by the first run on the host. This is not a pool of
+    solver processes: a new ``boxsi`` is started for every run, because OOMMF
+    cannot load a new problem into a ``boxsi`` process once a problem has been
+    solved. Queries that solve no problem (``version`` and ``platform``) do not
+    start the archive. The archives are stopped together with the other
+    applications of the runner when the Python session ends.
+
+    Parameters
+    ----------
+    host_servers : int or str, optional
+
+        OOMMF host servers with which the runs register. If ``None``,
+        ``oommfc.runner.host_servers`` is used. Defaults to ``None``.
+
     """
 
-    def __init__(self):
+    def __init__(self, host_servers=None):
         # oommf launchhost gets stuck on Windows
         # -> it is not possible to run multiple calculations in parallel
         super().__init__()
+        if host_servers is None:
+            host_servers = oc.runner.host_servers
+        self._hosts = None
         if sys.platform != "win32":
-            self.env = dict(OOMMF_HOSTPORT=self._launchhost(), **os.environ)
-        else:
-            self.env = os.environ
+            self._hosts = _HostServers(
+                self._launchhost,
+                host_servers,
+                archive=[*self.oommf, "mmArchive", "-tk", "0"],
+                registered=lambda env: self._applications(env).values(),
+            )
+        # Applications registered with a host server launched by this runner
+        # have been started by this runner, otherwise only applications in the
+        # process group of a boxsi process started by this runner are (e.g. the
+        # mmArchive launched by boxsi, which keeps running after boxsi exits).
+        self._own_host = self._hosts is not None and self._hosts.private
+        self._pids = set()  # PIDs of boxsi processes started by this runner
 
-    def _launchhost(self, dry_run=False):
-        command = [*self.oommf, "launchhost", "0"]
+    @property
+    def env(self):
+        """Environment of OOMMF applications registering with the first host."""
+        if self._hosts is None:
+            return os.environ
+        return self._hosts.env(0, archive=False)
+
+    def _host_env(self, index=None):
+        """Environment of a run; runs are assigned to the host servers in turn.
+
+        The persistent archive of the host server is started if it is not running.
+
+        """
+        if self._hosts is None:
+            return os.environ
+        return self._hosts.env(index)
+
+    def _query(self, argstr):
+        # No output is written, so the persistent archive is not needed.
+        return self.call(argstr=argstr, need_stderr=True, verbose=0, env=self.env)
+
+    def _launchhost(self, dry_run=False, port=0):
+        command = [*self.oommf, "launchhost", str(port)]
         if dry_run:
             return " ".join(command)
         else:
@@ -194,8 +374,30 @@ class NativeOOMMFRunner(OOMMFRunner):
             port = launchhost.stdout.decode("utf-8", "replace").strip("\n")
             return port
 
-    def _call(self, argstr, need_stderr=False, n_threads=None, dry_run=False):
+    def _boxsi_command(self, argstr, n_threads=None, restart=False, parameters=None):
         command = [*self.oommf, "boxsi", "+fg", argstr, "-exitondone", "1"]
+        if n_threads is not None:
+            command += ["-threads", str(n_threads)]
+        if restart:
+            command += ["-restart", "1"]
+        if parameters is not None:
+            command += ["-parameters", parameters]
+        return command
+
+    def _call(
+        self,
+        argstr,
+        need_stderr=False,
+        n_threads=None,
+        dry_run=False,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+        env=None,
+    ):
+        command = self._boxsi_command(argstr, n_threads, restart, parameters)
 
         # Not clear why we cannot get stderr and stdout on win32. Calls to
         # OOMMF get stuck.
@@ -203,32 +405,194 @@ class NativeOOMMFRunner(OOMMFRunner):
         if sys.platform == "win32" and not need_stderr:
             stdout = stderr = None  # pragma: no cover
 
-        if n_threads is not None:
-            command += ["-threads", str(n_threads)]
-
         if dry_run:
             return " ".join(command)
         else:
+            watchdog = _watchdog(timeout, stall_timeout, workingdir)
+            if env is None:
+                env = self._host_env()
+            cpus, locks = self._reserve_cpus(n_threads)
+            try:
+                with (
+                    self._kill_oommf_on_windows(),
+                    sp.Popen(
+                        _pinned(command, cpus),
+                        stdout=stdout,
+                        stderr=stderr,
+                        env=env,
+                        cwd=workingdir,
+                        start_new_session=_new_session,
+                    ) as process,
+                ):
+                    self._track(process.pid)
+                    stdout, stderr = _communicate(process, watchdog)
+                return sp.CompletedProcess(
+                    process.args, process.returncode, stdout, stderr
+                )
+            finally:
+                _cpu_placement.release(locks)
+
+    async def _call_async(
+        self,
+        argstr,
+        n_threads=None,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+        env=None,
+    ):
+        command = self._boxsi_command(argstr, n_threads, restart, parameters)
+        watchdog = _watchdog(timeout, stall_timeout, workingdir)
+        if env is None:
+            env = await asyncio.to_thread(self._host_env)
+        cpus, locks = await asyncio.to_thread(self._reserve_cpus, n_threads)
+        try:
             with self._kill_oommf_on_windows():
-                return sp.run(command, stdout=stdout, stderr=stderr, env=self.env)
+                process = await asyncio.create_subprocess_exec(
+                    *_pinned(command, cpus),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=env,
+                    cwd=workingdir,
+                    start_new_session=_new_session,
+                )
+                self._track(process.pid)
+                stdout, stderr = await _communicate_async(process, watchdog)
+        finally:
+            _cpu_placement.release(locks)
+        return sp.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    def _start(
+        self, argstr, n_threads=None, workingdir=None, timeout=None, stall_timeout=None
+    ):
+        watchdog = _watchdog(timeout, stall_timeout, workingdir)
+        cpus, locks = self._reserve_cpus(n_threads)
+
+        def release():
+            _cpu_placement.release(locks)
+
+        try:
+            process = _OOMMFProcess(
+                _pinned(self._boxsi_command(argstr, n_threads), cpus),
+                env=self._host_env(),
+                cwd=workingdir,
+                release=release,
+                watchdog=watchdog,
+            )
+        except Exception:
+            _cpu_placement.release(locks)
+            raise
+        self._track(process.pid)
+        return process
+
+    def _track(self, pid):
+        """Remember the PID of a boxsi process started by this runner.
+
+        The PID is kept after boxsi has exited because the applications it
+        started may still be running. PIDs of process groups without any
+        running process are dropped.
+
+        """
+        self._prune()
+        self._pids.add(pid)
+
+    def _prune(self):
+        if sys.platform == "win32":
+            return
+        for pid in list(self._pids):
+            try:
+                os.killpg(pid, 0)
+            except ProcessLookupError:
+                self._pids.discard(pid)
+            except PermissionError:
+                pass
+
+    def _started(self, pid):
+        """Check if the application with ``pid`` has been started by this runner."""
+        if pid in self._pids:
+            return True
+        if sys.platform == "win32":
+            return False
+        try:
+            # boxsi is started in a new session; the applications it starts
+            # belong to its process group.
+            return os.getpgid(pid) in self._pids
+        except OSError:
+            return False
+
+    @staticmethod
+    def _reserve_cpus(n_threads):
+        """Reserve CPUs for a run if ``oommfc.runner.pin_cpus`` is set."""
+        if not oc.runner.pin_cpus:
+            return None, []
+        return _cpu_placement.acquire(n_threads)
 
     @contextlib.contextmanager
-    def _kill_oommf_on_windows(self, targets=("all",)):
-        """Required for oc.delete; oommf keeps file ownership."""
+    def _kill_oommf_on_windows(self):
+        """Required for oc.delete; oommf keeps file ownership.
+
+        The applications registered with the host server during the run (e.g.
+        ``mmArchive`` launched by boxsi) are killed afterwards.
+
+        """
+        if sys.platform != "win32":
+            yield
+            return
+        before = self._applications()
         try:
             yield
         finally:
-            if sys.platform == "win32":
-                self._kill()
-
-    def _kill(self, targets=("all",), dry_run=False):
-        command = [*self.oommf, "killoommf"] + list(targets)
+            self._kill(targets=sorted(set(self._applications()) - set(before)))
+
+    def _applications(self, env=None):
+        """OIDs and PIDs of the applications registered with a host server."""
+        res = sp.run(
+            [*self.oommf, "pidinfo", "-noheader"],
+            stdout=sp.PIPE,
+            stderr=sp.DEVNULL,
+            env=self.env if env is None else env,
+        )
+        applications = {}
+        for line in res.stdout.decode("utf-8", "replace").splitlines():
+            fields = line.split()
+            if len(fields) >= 2 and fields[0].isdigit() and fields[1].isdigit():
+                applications[int(fields[0])] = int(fields[1])
+        return applications
+
+    def _kill(self, targets=None, dry_run=False):
         if dry_run:
-            return " ".join(command)
-        else:
+            # Job scripts launch their own host server.
+            return " ".join([*self.oommf, "killoommf", "all"])
+        if targets is not None:  # OIDs on the first host server
+            return self._killoommf(targets, self.env)
+        if self._hosts is not None:
+            self._hosts.stop_archives()
+        envs = [os.environ] if self._hosts is None else self._hosts.envs()
+        for env in envs:
+            self._killoommf(
+                [
+                    oid
+                    for oid, pid in self._applications(env).items()
+                    if self._own_host or self._started(pid)
+                ],
+                env,
+            )
+        self._prune()
+
+    def _killoommf(self, targets, env):
+        if targets:
             # Quietly kill oommf when used interactively
-            command.insert(-1, "-q")
-            sp.run(command, env=self.env)
+            command = [*self.oommf, "killoommf", "-q", *map(str, targets)]
+            sp.run(command, env=env)
+
+
+def _pinned(command, cpus):
+    """Run ``command`` on ``cpus`` with ``taskset`` (unchanged if ``None``)."""
+    if cpus is None:
+        return command
+    return ["taskset", "-c", ",".join(map(str, cpus)), *command]
 
 
 @uu.inherit_docs
@@ -241,12 +605,17 @@ class TclOOMMFRunner(NativeOOMMFRunner):
 
         Path to ``oommf.tcl`` file.
 
+    host_servers : int or str, optional
+
+        OOMMF host servers with which the runs register. If ``None``,
+        ``oommfc.runner.host_servers`` is used. Defaults to ``None``.
+
     """
 
-    def __init__(self, oommf_tcl):
+    def __init__(self, oommf_tcl, host_servers=None):
         self.oommf_tcl = oommf_tcl  # a path to oommf.tcl
         self.oommf = ["tclsh", self.oommf_tcl]
-        super().__init__()
+        super().__init__(host_servers)
 
     def errors(self):
         errors_file = os.path.join(os.path.dirname(self.oommf_tcl), "boxsi.errors")
@@ -269,12 +638,17 @@ class ExeOOMMFRunner(NativeOOMMFRunner):
 
         Name of the OOMMF executable. Defaults to ``oommf``.
 
+    host_servers : int or str, optional
+
+        OOMMF host servers with which the runs register. If ``None``,
+        ``oommfc.runner.host_servers`` is used. Defaults to ``None``.
+
     """
 
-    def __init__(self, oommf_exe="oommf"):
+    def __init__(self, oommf_exe="oommf", host_servers=None):
         self.oommf_exe = shutil.which(oommf_exe)
         self.oommf = [self.oommf_exe]
-        super().__init__()
+        super().__init__(host_servers)
 
     def errors(self):
         try:
@@ -297,6 +671,388 @@ class ExeOOMMFRunner(NativeOOMMFRunner):
         return f"ExeOOMMFRunner({self.oommf_exe})"
 
 
+class OOMMFTimeoutError(RuntimeError):
+    """OOMMF run stopped because it exceeded its wall-clock timeout.
+
+    ``reason`` is ``'timeout'`` (or ``'stall'`` for ``OOMMFStallError``).
+
+    """
+
+    reason = "timeout"
+
+
+class OOMMFStallError(OOMMFTimeoutError):
+    """OOMMF run stopped because it stopped writing output."""
+
+    reason = "stall"
+
+
+class _Watchdog:
+    """Detect OOMMF runs exceeding ``timeout`` or stalling for ``stall_timeout``.
+
+    A run stalls if no file in ``workingdir`` is created, grown, or modified for
+    ``stall_timeout`` seconds.
+
+    """
+
+    interval = 1  # seconds between scans of the working directory
+
+    def __init__(self, timeout=None, stall_timeout=None, workingdir=None):
+        for name, value in [("timeout", timeout), ("stall_timeout", stall_timeout)]:
+            if value is not None and (
+                isinstance(value, bool)
+                or not isinstance(value, numbers.Real)
+                or value <= 0
+            ):
+                msg = f"Invalid {name}={value!r}."
+                raise ValueError(msg)
+        self.timeout = timeout
+        self.stall_timeout = stall_timeout
+        self.workingdir = os.path.abspath(workingdir or os.getcwd())
+        self._start = self._scanned = self._progress = time.monotonic()
+        self._output = self._scan()
+
+    def check(self):
+        """Raise ``OOMMFTimeoutError`` or ``OOMMFStallError`` if a limit is hit."""
+        now = time.monotonic()
+        if self.timeout is not None and now - self._start > self.timeout:
+            msg = f"OOMMF run exceeded the timeout of {self.timeout} s."
+            raise OOMMFTimeoutError(msg)
+        if self.stall_timeout is not None and now - self._scanned >= self.interval:
+            self._scanned = now
+            output = self._scan()
+            if output != self._output:
+                self._output, self._progress = output, now
+            elif now - self._progress > self.stall_timeout:
+                msg = f"OOMMF has not written any output for {self.stall_timeout} s."
+                raise OOMMFStallError(msg)
+
+    def _scan(self):
+        output = set()
+        with contextlib.suppress(OSError), os.scandir(self.workingdir) as entries:
+            for entry in entries:
+                with contextlib.suppress(OSError):
+                    stat = entry.stat()
+                    output.add((entry.name, stat.st_size, stat.st_mtime_ns))
+        return output
+
+
+def _watchdog(timeout=None, stall_timeout=None, workingdir=None):
+    """``_Watchdog`` for a run or ``None`` if it has no limits."""
+    if timeout is None and stall_timeout is None:
+        return None
+    return _Watchdog(timeout, stall_timeout, workingdir)
+
+
+# OOMMF runs are started in a new session (on Linux and MacOS), so that the
+# processes they start (e.g. boxsi started by the oommf launcher) can be
+# stopped together without affecting any other process.
+_new_session = sys.platform != "win32"
+
+
+def _signal_tree(process, kill=False):
+    """Terminate (or kill) ``process`` and the processes it started."""
+    if sys.platform == "win32":
+        sp.run(
+            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+            stdout=sp.DEVNULL,
+            stderr=sp.DEVNULL,
+        )
+        return
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(process.pid, signal.SIGKILL if kill else signal.SIGTERM)
+
+
+def _stop_tree(process, timeout=5):
+    """Terminate the process tree of ``process``; kill it if it does not exit."""
+    if process.poll() is None:
+        _signal_tree(process)
+        try:
+            process.wait(timeout=timeout)
+        except sp.TimeoutExpired:
+            _signal_tree(process, kill=True)
+            process.wait()
+
+
+def _communicate(process, watchdog=None):
+    """``process.communicate()``, stopping the process if ``watchdog`` fires.
+
+    The process tree is also stopped if waiting is interrupted (e.g. with
+    ``KeyboardInterrupt``).
+
+    """
+    try:
+        if watchdog is None:
+            return process.communicate()
+        while True:
+            try:
+                return process.communicate(timeout=watchdog.interval)
+            except sp.TimeoutExpired:
+                watchdog.check()
+    except BaseException:
+        _stop_tree(process)
+        raise
+
+
+async def _communicate_async(process, watchdog=None, timeout=5):
+    """Asynchronous ``_communicate`` for ``asyncio.subprocess.Process``."""
+    communicate = asyncio.ensure_future(process.communicate())
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {communicate}, timeout=None if watchdog is None else watchdog.interval
+            )
+            if done:
+                return communicate.result()
+            watchdog.check()
+    except BaseException:
+        if process.returncode is None:
+            _signal_tree(process)
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                _signal_tree(process, kill=True)
+                await process.wait()
+        communicate.cancel()
+        raise
+
+
+class _OOMMFProcess:
+    """OOMMF process running in the background.
+
+    Standard output and error are written to temporary files, so that the
+    process never blocks on full pipes, however long it runs.
+
+    """
+
+    def __init__(
+        self, args, env=None, cwd=None, release=None, watchdog=None, on_stop=None
+    ):
+        self.args = args
+        self._stdout = tempfile.TemporaryFile()  # noqa: SIM115
+        self._stderr = tempfile.TemporaryFile()  # noqa: SIM115
+        self._process = sp.Popen(
+            args,
+            stdout=self._stdout,
+            stderr=self._stderr,
+            env=env,
+            cwd=cwd,
+            start_new_session=_new_session,
+        )
+        self._release = release  # called once the process has finished
+        self._watchdog = watchdog
+        self._on_stop = on_stop  # called after the process has been stopped
+        self._result = None
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    def poll(self):
+        return self._process.poll()
+
+    def wait(self, timeout=None):
+        return self._process.wait(timeout=timeout)
+
+    def check(self):
+        """Stop the process and raise if its watchdog detects a timeout or stall."""
+        if self._watchdog is not None and self._process.poll() is None:
+            try:
+                self._watchdog.check()
+            except OOMMFTimeoutError:
+                self.stop()
+                raise
+
+    def stop(self, timeout=5):
+        """Terminate the process tree and wait; kill it if it does not exit."""
+        running = self._process.poll() is None
+        _stop_tree(self._process, timeout=timeout)
+        if running and self._on_stop is not None:
+            self._on_stop()
+        self.result()
+
+    def result(self):
+        """Wait for the process and return its ``subprocess.CompletedProcess``."""
+        if self._result is None:
+            returncode = self._process.wait()
+            outputs = []
+            for f in (self._stdout, self._stderr):
+                f.seek(0)
+                outputs.append(f.read())
+                f.close()
+            self._result = sp.CompletedProcess(self.args, returncode, *outputs)
+            if self._release is not None:
+                self._release()
+        return self._result
+
+
+class _Archive:
+    """Persistent ``mmArchive`` registered with an OOMMF host server.
+
+    boxsi writes data tables and fields through an ``mmArchive`` registered with
+    its host server and only starts a new one if there is none. Keeping one
+    running avoids starting and registering an archive for every run.
+
+    """
+
+    def __init__(self, command, registered=None):
+        self.command = command
+        self.env = None
+        self._registered = registered  # PIDs of applications registered with a host
+        self._process = None
+
+    @property
+    def pid(self):
+        return None if self._process is None else self._process.pid
+
+    @property
+    def alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, env):
+        """(Re)start the archive if it or its host server is not running."""
+        if env != self.env:
+            self.stop()  # the host server has been relaunched
+            self.env = env
+        if not self.alive:
+            log.debug(
+                "Starting mmArchive for OOMMF host server on port %(port)s.",
+                {"port": env["OOMMF_HOSTPORT"]},
+            )
+            self._process = sp.Popen(
+                self.command,
+                stdout=sp.DEVNULL,
+                stderr=sp.DEVNULL,
+                env=env,
+                start_new_session=_new_session,
+            )
+            self._wait_registered()
+
+    def _wait_registered(self, timeout=10):
+        # boxsi started before the archive has registered would launch another
+        # archive, which is left running on the host after the run.
+        if self._registered is None or not _new_session:
+            return
+        deadline = time.monotonic() + timeout
+        while self.alive and time.monotonic() < deadline:
+            for pid in self._registered(self.env):
+                with contextlib.suppress(OSError):
+                    # The archive may be started by the oommf launcher.
+                    if os.getpgid(pid) == self._process.pid:
+                        return
+            time.sleep(0.1)
+        log.warning(
+            "mmArchive has not registered with OOMMF host server on port %(port)s.",
+            {"port": self.env["OOMMF_HOSTPORT"]},
+        )
+
+    def stop(self):
+        if self.alive:
+            _stop_tree(self._process)
+        self._process = None
+
+
+class _HostServers:
+    """OOMMF host servers with which the applications of a runner register.
+
+    ``servers`` is either the number of private host servers, which are launched
+    with ``launch`` and to which runs are assigned in turn, or ``"shared"`` for
+    the host server of the machine at ``OOMMF_HOSTPORT`` (or the default OOMMF
+    port), which is only launched if it is not running. Host servers that do not
+    accept connections are relaunched before they are used.
+
+    If ``archive`` is the command starting ``mmArchive``, a persistent archive
+    (``_Archive``) is kept running for every host server once it is used, so that
+    runs do not leave archives behind on the host. ``registered`` returns the
+    PIDs of the applications registered with a host server given its
+    environment. The archives are stopped when the object is garbage collected
+    or the Python session ends.
+
+    """
+
+    def __init__(self, launch, servers=1, archive=None, registered=None):
+        if servers != "shared" and (
+            not isinstance(servers, int) or isinstance(servers, bool) or servers < 1
+        ):
+            msg = f"Cannot use {servers=}."
+            raise ValueError(msg)
+        self.servers = servers
+        self._launch = launch
+        self._lock = threading.Lock()
+        self._turns = itertools.count()
+        if self.private:
+            self._ports = [launch() for _ in range(servers)]
+        else:
+            port = os.environ.get("OOMMF_HOSTPORT", _default_hostport)
+            self._ports = [port if _listening(port) else launch(port=port)]
+        self._archives = [
+            _Archive(archive, registered) if archive is not None else None
+            for _ in self._ports
+        ]
+        self._finalizer = weakref.finalize(self, _stop_archives, self._archives)
+
+    @property
+    def private(self):
+        """``True`` if the host servers have been launched for the runner."""
+        return self.servers != "shared"
+
+    def env(self, index=None, archive=True):
+        """Environment of an application registering with a running host server.
+
+        If ``index`` is ``None``, the host servers are used in turn. If
+        ``archive=True``, the persistent archive of the host server is started if
+        it is not running.
+
+        """
+        if index is None:
+            index = next(self._turns)
+        index %= len(self._ports)
+        with self._lock:
+            port = self._ports[index]
+            if not _listening(port):
+                log.warning(
+                    "OOMMF host server on port %(port)s is not running, relaunching.",
+                    {"port": port},
+                )
+                port = self._launch() if self.private else self._launch(port=port)
+                self._ports[index] = port
+            env = self._env(port)
+            if archive and self._archives[index] is not None:
+                self._archives[index].start(env)
+        return env
+
+    def envs(self):
+        """Environments of all host servers (without checking them)."""
+        return [self._env(port) for port in self._ports]
+
+    def stop_archives(self):
+        """Stop the persistent archives; they are restarted when used again."""
+        with self._lock:
+            _stop_archives(self._archives)
+
+    @staticmethod
+    def _env(port):
+        return dict(os.environ, OOMMF_HOSTPORT=port)
+
+
+def _stop_archives(archives):
+    for archive in archives:
+        if archive is not None:
+            archive.stop()
+
+
+_default_hostport = "15136"  # default port of the OOMMF host server
+
+
+def _listening(port):
+    """Check if a server accepts connections on ``port`` of the local host."""
+    try:
+        with socket.create_connection(("localhost", int(port)), timeout=1):
+            return True
+    except (OSError, ValueError):
+        return False
+
+
 @uu.inherit_docs
 class DockerOOMMFRunner(OOMMFRunner):
     """OOMMF runner using Docker.
@@ -320,40 +1076,319 @@ class DockerOOMMFRunner(OOMMFRunner):
         Alternatively, you can set SELinux to Permissive Mode to get read/write access.
         Defaults to ``False``.
 
+    persistent : bool, optional
+
+        If ``True``, a single container is started with the first run and kept
+        running. Every run is executed in it with ``docker exec`` instead of
+        creating a new container with ``docker run``, which avoids the container
+        start-up for every run. Streamed drives (``stream=True`` or ``callback``)
+        still use ``docker run`` so that they can be stopped. The container is
+        removed by ``_kill`` and when the Python session ends. Defaults to
+        ``False``.
+
+    mount : str, pathlib.Path, optional
+
+        Host directory mounted into the persistent container. Runs in working
+        directories outside ``mount`` use ``docker run``. Defaults to the home
+        directory.
+
+    max_execs : int, optional
+
+        Maximum number of runs executed concurrently in the persistent container.
+        Further runs wait until a run has finished. Defaults to ``1``.
+
+    Examples
+    --------
+    1. Running OOMMF in a persistent container.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> runner = oc.oommf.DockerOOMMFRunner(persistent=True)  # doctest: +SKIP
+    >>> system = mm.examples.macrospin()
+    >>> md = oc.MinDriver()
+    >>> md.drive(system, runner=runner)  # doctest: +SKIP
+    Running OOMMF (DockerOOMMFRunner)...
+    >>> md.drive(system, runner=runner)  # the container is reused  # doctest: +SKIP
+    Running OOMMF (DockerOOMMFRunner)...
+
     """
 
-    def __init__(self, docker_exe="docker", image="oommf/oommf:20b0", selinux=False):
+    def __init__(
+        self,
+        docker_exe="docker",
+        image="oommf/oommf:20b0",
+        selinux=False,
+        persistent=False,
+        mount=None,
+        max_execs=1,
+    ):
+        if not isinstance(max_execs, int) or max_execs < 1:
+            raise ValueError(f"Cannot run {max_execs=} runs concurrently.")
         super().__init__()
         self.docker_exe = docker_exe
         self.image = image
         self.selinux = selinux
+        self.persistent = persistent
+        self.mount = pathlib.Path(mount or pathlib.Path.home()).absolute()
+        self.max_execs = max_execs
+        self._container = None
+        self._container_lock = threading.Lock()
+        self._execs = threading.BoundedSemaphore(max_execs)
 
     def _launchhost(self, dry_run=False):
         if dry_run:
             return ""
 
-    def _call(self, argstr, need_stderr=False, n_threads=None, dry_run=False):
-        cmd = [
+    def _docker_command(
+        self,
+        argstr,
+        n_threads=None,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        reuse=True,
+        name=None,
+    ):
+        if workingdir is None:
+            workingdir = os.getcwd()
+        if restart:
+            argstr = f"{argstr} -restart 1"
+        if parameters is not None:
+            argstr = f"{argstr} -parameters {shlex.quote(parameters)}"
+        if n_threads is not None:
+            argstr = f"{argstr} -threads {n_threads}"
+        boxsi = (
+            f"tclsh /usr/local/oommf/oommf/oommf.tcl boxsi +fg {argstr} -exitondone 1"
+        )
+
+        containerdir = self._containerdir(workingdir) if reuse else None
+        if containerdir is None:
+            # Named containers are removed when OOMMF exits and can be killed if
+            # the run is stopped (see ``_kill_container``).
+            options = [] if name is None else ["--rm", "--name", name]
+            return [
+                self.docker_exe,
+                "run",
+                *options,
+                "-v",
+                f"{workingdir}:/io{':z' if self.selinux else ''}",
+                self.image,
+                "/bin/bash",
+                "-c",
+                boxsi,
+            ]
+        return [
             self.docker_exe,
-            "run",
-            "-v",
-            f"{os.getcwd()}:/io{':z' if self.selinux else ''}",
-            self.image,
+            "exec",
+            "-w",
+            containerdir,
+            self._start_container(),
             "/bin/bash",
             "-c",
-            f"tclsh /usr/local/oommf/oommf/oommf.tcl boxsi +fg {argstr} -exitondone 1",
+            boxsi,
         ]
-        if n_threads is not None:
-            cmd += ["-threads", str(n_threads)]
+
+    def _containerdir(self, workingdir):
+        """Path of ``workingdir`` in the persistent container or ``None``."""
+        if not self.persistent:
+            return None
+        try:
+            relative = pathlib.Path(workingdir).absolute().relative_to(self.mount)
+        except ValueError:
+            log.debug(
+                "%(workingdir)s is not in %(mount)s, using docker run.",
+                {"workingdir": workingdir, "mount": self.mount},
+            )
+            return None
+        return pathlib.PurePosixPath("/io", *relative.parts).as_posix()
+
+    def _start_container(self):
+        """Start the persistent container if needed and return its ID."""
+        with self._container_lock:
+            if self._container is None:
+                cmd = [
+                    self.docker_exe,
+                    "run",
+                    "-d",
+                    "--rm",
+                    "-v",
+                    f"{self.mount}:/io{':z' if self.selinux else ''}",
+                    self.image,
+                    "sleep",
+                    "infinity",
+                ]
+                res = sp.run(cmd, stdout=sp.PIPE, stderr=sp.PIPE)
+                if res.returncode != 0:
+                    msg = "Cannot start Docker container.\n"
+                    msg += f"command: {' '.join(cmd)}\n"
+                    msg += f"stderr: {res.stderr.decode('utf-8', 'replace')}\n"
+                    raise RuntimeError(msg)
+                self._container = res.stdout.decode("utf-8").strip()
+                log.debug("Started container %(id)s.", {"id": self._container})
+            return self._container
+
+    def _remove_container(self):
+        with self._container_lock:
+            if self._container is not None:
+                with contextlib.suppress(OSError):
+                    sp.run(
+                        [self.docker_exe, "rm", "-f", self._container],
+                        stdout=sp.DEVNULL,
+                        stderr=sp.DEVNULL,
+                    )
+                self._container = None
+
+    def _kill_container(self, cmd):
+        """Kill the container of a stopped ``docker run`` command.
+
+        Stopping the docker client does not stop the container, whose main
+        process (bash) ignores ``SIGTERM``.
+
+        """
+        if cmd[1] == "run" and "--name" in cmd:
+            name = cmd[cmd.index("--name") + 1]
+            log.debug("Killing container %(name)s.", {"name": name})
+            with contextlib.suppress(OSError):
+                sp.run(
+                    [self.docker_exe, "kill", name],
+                    stdout=sp.DEVNULL,
+                    stderr=sp.DEVNULL,
+                )
+
+    def _exec(self, cmd):
+        """Limit the number of concurrent runs in the persistent container."""
+        return self._execs if cmd[1] == "exec" else contextlib.nullcontext()
+
+    def _lost_container(self, cmd, res):
+        """Check if the persistent container was gone when ``cmd`` was run.
+
+        This happens if the container was removed or the Docker daemon restarted.
+        The next run starts a new container.
+
+        """
+        if cmd[1] == "exec" and b"No such container" in res.stderr:
+            log.warning("Container %(id)s is gone, restarting.", {"id": cmd[4]})
+            with self._container_lock:
+                if self._container == cmd[4]:
+                    self._container = None
+            return True
+        return False
+
+    def _call(
+        self,
+        argstr,
+        need_stderr=False,
+        n_threads=None,
+        dry_run=False,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+    ):
+        if workingdir is not None:
+            workingdir = pathlib.Path(workingdir).absolute()
+        args = (argstr, n_threads, workingdir, restart, parameters)
         if dry_run:
-            return " ".join(cmd)
-        else:
-            return sp.run(cmd, stdout=sp.PIPE, stderr=sp.PIPE)
+            # Commands of dry runs are used in job scripts without the container.
+            return " ".join(self._docker_command(*args, reuse=False))
+        watchdog = _watchdog(timeout, stall_timeout, workingdir)
+        for _ in range(2):  # a lost container is restarted once
+            # Watched runs use docker run because their container can be killed
+            # if they are stopped, unlike a run started with docker exec.
+            cmd = self._docker_command(
+                *args, reuse=watchdog is None, name=_container_name()
+            )
+            try:
+                with (
+                    self._exec(cmd),
+                    sp.Popen(
+                        cmd,
+                        stdout=sp.PIPE,
+                        stderr=sp.PIPE,
+                        start_new_session=_new_session,
+                    ) as process,
+                ):
+                    stdout, stderr = _communicate(process, watchdog)
+            except BaseException:
+                self._kill_container(cmd)
+                raise
+            res = sp.CompletedProcess(cmd, process.returncode, stdout, stderr)
+            if not self._lost_container(cmd, res):
+                break
+        return res
+
+    async def _call_async(
+        self,
+        argstr,
+        n_threads=None,
+        workingdir=None,
+        restart=False,
+        parameters=None,
+        timeout=None,
+        stall_timeout=None,
+    ):
+        workingdir = pathlib.Path(workingdir or os.getcwd()).absolute()
+        watchdog = _watchdog(timeout, stall_timeout, workingdir)
+        for _ in range(2):  # a lost container is restarted once
+            # Starting the container and waiting for a free slot must not block
+            # the event loop.
+            cmd = await asyncio.to_thread(
+                self._docker_command,
+                argstr,
+                n_threads,
+                workingdir,
+                restart,
+                parameters,
+                reuse=watchdog is None,
+                name=_container_name(),
+            )
+            execs = self._exec(cmd)
+            await asyncio.to_thread(execs.__enter__)
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=_new_session,
+                )
+                stdout, stderr = await _communicate_async(process, watchdog)
+            except BaseException:
+                await asyncio.to_thread(self._kill_container, cmd)
+                raise
+            finally:
+                execs.__exit__(None, None, None)
+            res = sp.CompletedProcess(cmd, process.returncode, stdout, stderr)
+            if not self._lost_container(cmd, res):
+                break
+        return res
+
+    def _start(
+        self, argstr, n_threads=None, workingdir=None, timeout=None, stall_timeout=None
+    ):
+        workingdir = pathlib.Path(workingdir or os.getcwd()).absolute()
+        # Supervised runs use docker run because their container can be killed
+        # if they are stopped, unlike a run started with docker exec.
+        cmd = self._docker_command(
+            argstr, n_threads, workingdir, reuse=False, name=_container_name()
+        )
+        return _OOMMFProcess(
+            cmd,
+            watchdog=_watchdog(timeout, stall_timeout, workingdir),
+            on_stop=lambda: self._kill_container(cmd),
+        )
 
-    def _kill(self, targets=("all",), dry_run=False):
-        # There is no need to kill OOMMF when run inside docker.
+    def _terminate(self):
+        # The container must also be removed on Windows.
+        self._remove_container()
+
+    def _kill(self, targets=None, dry_run=False):
+        # There is no need to kill OOMMF when run inside docker; only the
+        # persistent container is removed.
         if dry_run:
             return ""
+        self._remove_container()
 
     def errors(self):
         msg = "boxsi.errors cannot be retrieved from Docker container."
@@ -363,6 +1398,188 @@ class DockerOOMMFRunner(OOMMFRunner):
         return f"DockerOOMMFRunner(docker_exe={self.docker_exe}, image={self.image})"
 
 
+def _container_name():
+    return f"oommfc-{uuid.uuid4().hex}"
+
+
+class _ThreadLimiter:
+    """Limit the total number of OOMMF threads used by concurrent asynchronous runs.
+
+    Each run reserves as many slots as the number of threads it uses. Runs which do
+    not specify ``n_threads`` reserve the OOMMF default (``OOMMF_THREADS`` or 4). A
+    single run requesting more threads than available is allowed to run on its own.
+
+    """
+
+    def __init__(self, max_threads=None):
+        self.max_threads = max_threads
+        self.in_use = 0
+        self._condition = None
+        self._loop = None
+
+    @property
+    def capacity(self):
+        return self.max_threads or oc.autotune.available_cpus()
+
+    @staticmethod
+    def _threads(n_threads):
+        if n_threads is None:
+            n_threads = int(os.environ.get("OOMMF_THREADS", 4))
+        return n_threads
+
+    def _get_condition(self):
+        # asyncio primitives are bound to the event loop in which they are used.
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, n_threads=None):
+        """Reserve threads for the duration of a run."""
+        weight = min(self._threads(n_threads), self.capacity)
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_use + weight <= self.capacity)
+            self.in_use += weight
+        try:
+            yield
+        finally:
+            async with condition:
+                self.in_use -= weight
+                condition.notify_all()
+
+
+class _CPUPlacement:
+    """Reserve disjoint sets of CPUs for concurrent OOMMF runs.
+
+    A CPU is reserved with an exclusive ``flock`` on its lock file in ``dirname``,
+    which is shared by all Python processes of the user. Runs of different
+    threads and processes therefore never get the same CPUs, and the CPUs of a
+    process that dies are released by the operating system. CPUs of a single
+    NUMA node (read from ``nodes_dir``) are preferred; if no node has enough
+    free CPUs, the free CPUs of several nodes are combined. If not enough CPUs
+    are free, the run is not pinned.
+
+    """
+
+    def __init__(self, dirname=None, nodes_dir="/sys/devices/system/node", cpus=None):
+        self._dirname = dirname
+        self.nodes_dir = pathlib.Path(nodes_dir)
+        self._cpus = cpus
+        self._nodes = None
+        self._taskset = None
+
+    @property
+    def dirname(self):
+        if self._dirname is None:
+            self._dirname = pathlib.Path(
+                tempfile.gettempdir(), f"oommfc-cpus-{os.getuid()}"
+            )
+        return pathlib.Path(self._dirname)
+
+    @property
+    def nodes(self):
+        """CPUs usable by this process grouped by NUMA node."""
+        if self._nodes is None:
+            cpus = self._cpus
+            if cpus is None:
+                cpus = os.sched_getaffinity(0)
+            nodes = []
+            for cpulist in sorted(self.nodes_dir.glob("node*/cpulist")):
+                node = [
+                    cpu for cpu in _parse_cpulist(cpulist.read_text()) if cpu in cpus
+                ]
+                if node:
+                    nodes.append(node)
+            covered = {cpu for node in nodes for cpu in node}
+            if rest := sorted(set(cpus) - covered):  # no NUMA information
+                nodes.append(rest)
+            self._nodes = nodes
+        return self._nodes
+
+    @property
+    def supported(self):
+        if self._taskset is None:
+            self._taskset = (
+                fcntl is not None
+                and hasattr(os, "sched_getaffinity")
+                and shutil.which("taskset") is not None
+            )
+            if not self._taskset:
+                log.warning("Cannot pin OOMMF to CPUs on this system.")
+        return self._taskset
+
+    def acquire(self, n_threads=None):
+        """Reserve CPUs for a run with ``n_threads`` threads.
+
+        Returns the reserved CPUs (or ``None``) and the locks to be released.
+
+        """
+        if not self.supported:
+            return None, []
+        n = _ThreadLimiter._threads(n_threads)
+        self.dirname.mkdir(exist_ok=True)
+        # Only one thread or process at a time looks for free CPUs.
+        with open(self.dirname / "placement.lock", "w") as placement:
+            fcntl.flock(placement, fcntl.LOCK_EX)
+            free = {}  # free CPUs by node and their locks
+            for index, node in enumerate(self.nodes):
+                for cpu in node:
+                    lock = open(self.dirname / f"cpu{cpu}.lock", "w")  # noqa: SIM115
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        lock.close()  # reserved by another run
+                    else:
+                        free.setdefault(index, {})[cpu] = lock
+
+            fitting = [node for node in free.values() if len(node) >= n]
+            if fitting:
+                # The node with the fewest free CPUs is used to keep larger
+                # blocks of CPUs free for later runs.
+                nodes = [min(fitting, key=len)]
+            else:
+                nodes = sorted(free.values(), key=len, reverse=True)
+            cpus = [cpu for node in nodes for cpu in node][:n]
+            if len(cpus) < n:
+                cpus = []
+            locks = []
+            for node in free.values():
+                for cpu, lock in node.items():
+                    if cpu in cpus:
+                        locks.append(lock)
+                    else:
+                        lock.close()
+
+        if not cpus:
+            log.debug("No %(n)s free CPUs, OOMMF is not pinned.", {"n": n})
+            return None, []
+        log.debug("Pinning OOMMF to CPUs %(cpus)s.", {"cpus": cpus})
+        return sorted(cpus), locks
+
+    @staticmethod
+    def release(locks):
+        for lock in locks:
+            lock.close()
+
+
+def _parse_cpulist(cpulist):
+    """Parse a Linux CPU list such as ``'0-3,8-11'``."""
+    cpus = []
+    for part in cpulist.strip().split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        elif part:
+            cpus.append(int(part))
+    return cpus
+
+
+_cpu_placement = _CPUPlacement()
+
+
 class Runner:
     """Control the default runner.
 
@@ -386,6 +1603,56 @@ class Runner:
     docker_exe : str
         The name or path of the docker command. Defaults to ``'docker'``.
 
+    max_threads : int
+        Maximum total number of OOMMF threads used by simulations that run
+        concurrently through ``Driver.drive_async`` and ``oommfc.compute_async``.
+        Each run counts with its ``n_threads``. If ``None``, the number of CPUs
+        available to the process (``oommfc.autotune.available_cpus()``) is used.
+        Defaults to ``None``.
+
+    cache : oommfc.ResultCache
+        Cache of OOMMF results. If set, drives and ``oommfc.compute`` calls whose
+        input files are identical to a previous run load the results from the cache
+        instead of running OOMMF. Defaults to ``None`` (no caching).
+
+    discovery_cache : bool
+        If ``True`` the runner found by ``autoselect_runner()`` is stored in the
+        file ``runners.json`` in ``oommfc.cache.cache_dir()``, and the first call
+        to the property ``runner`` in a new Python process returns the stored
+        runner instead of searching for OOMMF again. Stored runners are keyed on
+        ``envvar``, ``oommf_exe``, ``docker_exe``, the value of ``envvar``,
+        ``PATH``, and the modification times of ``oommf.tcl`` and of the
+        executables, so that they are discarded when any of these changes. A
+        stored runner is used without running OOMMF if the size and modification
+        time of its ``oommf.tcl``, ``oommf`` executable, or ``docker`` executable
+        are unchanged. Otherwise, unless ``check_runner`` is ``False``, it is only
+        used if querying its OOMMF version succeeds. Defaults to ``True``.
+
+    check_runner : bool
+        If ``True`` a runner set with the property ``runner``, or restored from the
+        discovery cache although its executable has changed, is first checked to be
+        functional by querying its OOMMF version. Defaults to ``True``.
+
+    pin_cpus : bool
+        If ``True`` every OOMMF process started by a ``NativeOOMMFRunner`` is
+        pinned with ``taskset`` to its own set of CPUs (one per thread),
+        preferably on a single NUMA node, which is released when the run
+        finishes. CPUs are assigned disjointly across all threads and Python
+        processes of the user that use ``pin_cpus``. Runs for which not enough
+        CPUs are free are not pinned. Only supported on Linux. Defaults to
+        ``False``.
+
+    host_servers : int or str
+        OOMMF host servers with which the runs of a ``NativeOOMMFRunner``
+        register. If an integer, the runner launches that many private host
+        servers and assigns runs to them in turn, so that many concurrent runs do
+        not wait for a single host server to register them. If ``'shared'``, all
+        runners and Python processes on the machine use the host server at
+        ``OOMMF_HOSTPORT`` (or at the default OOMMF port ``15136``), which is
+        launched if it is not running. Host servers are checked before every run
+        and relaunched if they do not accept connections. Used by runners
+        created afterwards, not used on Windows. Defaults to ``1``.
+
     """
 
     def __init__(self):
@@ -393,7 +1660,26 @@ class Runner:
         self.envvar = "OOMMFTCL"
         self.oommf_exe = "oommf"
         self.docker_exe = "docker"
+        self.cache = None
+        self.discovery_cache = True
+        self.check_runner = True
+        self.pin_cpus = False
+        self.host_servers = 1
         self._runner = None
+        self._thread_limiter = _ThreadLimiter()
+
+    @property
+    def max_threads(self):
+        return self._thread_limiter.max_threads
+
+    @max_threads.setter
+    def max_threads(self, max_threads):
+        if max_threads is not None and (
+            not isinstance(max_threads, int) or max_threads < 1
+        ):
+            msg = f"Cannot limit the number of threads to {max_threads=}."
+            raise ValueError(msg)
+        self._thread_limiter.max_threads = max_threads
 
     @property
     def runner(self):
@@ -401,11 +1687,14 @@ class Runner:
 
         The default runner is determined using ``autoselect_runner()``. If
         ``cache_runner`` is ``True`` the runner is cached during the first call
-        and the same runner is returned in subsequent calls to this property.
+        and the same runner is returned in subsequent calls to this property. If
+        additionally ``discovery_cache`` is ``True``, a runner found in a previous
+        Python process for the same environment is used without running
+        ``autoselect_runner()``.
 
-        This property also allows to set a specific ``OOMMFRunner``. Before
-        setting, a new runner is first checked to be functional by calling
-        ``runner.status``.
+        This property also allows to set a specific ``OOMMFRunner``. Unless
+        ``check_runner`` is ``False``, a new runner is first checked to be
+        functional by querying ``runner.version``.
 
         Examples
         --------
@@ -422,8 +1711,6 @@ class Runner:
         >>> import oommfc as oc  # doctest: +SKIP
         ...
         >>> oc.runner.runner = oc.oommf.DockerOOMMFRunner()  # doctest: +SKIP
-        Running OOMMF ...
-        OOMMF found and running.
         >>> isinstance(oc.runner.runner,
         ...            oc.oommf.DockerOOMMFRunner)  # doctest: +SKIP
         True
@@ -432,13 +1719,24 @@ class Runner:
         if self.cache_runner and self._runner is not None:
             log.debug("Returning cached runner.")
             return self._runner
+        if self.cache_runner and self.discovery_cache:
+            self._runner = self._load_discovered()
+            if self._runner is not None:
+                return self._runner
         self.autoselect_runner()
         return self._runner
 
     @runner.setter
     def runner(self, runner):
-        if runner.status != 0:
-            raise ValueError(f"{runner=} cannot be used.")
+        if self.check_runner:
+            try:
+                version = runner.version
+            except (OSError, RuntimeError):
+                raise ValueError(f"{runner=} cannot be used.") from None
+            log.debug(
+                "Setting runner %(runner)s (OOMMF %(version)s).",
+                {"runner": runner, "version": version},
+            )
         self._runner = runner
 
     def autoselect_runner(self):
@@ -451,7 +1749,8 @@ class Runner:
         This method is also used to determine the default runner for the
         ``runner`` property as long as no runner has been cached. The method
         can be used to reset the default runner when a different runner has
-        been set explicitly.
+        been set explicitly. OOMMF is always probed and, if ``discovery_cache``
+        is ``True``, the runner found is stored for new Python processes.
 
         Raises
         ------
@@ -469,6 +1768,11 @@ class Runner:
         True
 
         """
+        self._runner = self._find_runner()
+        if self.discovery_cache:
+            self._store_discovered(self._runner)
+
+    def _find_runner(self):
         log.debug(
             "Starting autoselect_runner: cache_runner=%(cache_runner)s, "
             "envvar=%(envvar)s, oommf_exe=%(oommf_exe)s, "
@@ -502,8 +1806,7 @@ class Runner:
                         {"stdout": res.stdout, "stderr": res.stderr},
                     )
                 else:
-                    self._runner = TclOOMMFRunner(oommf_tcl)
-                    return
+                    return TclOOMMFRunner(oommf_tcl)
 
         # OOMMF available as an executable - in a conda env on Mac/Linux, or
         # oommf installed separately.
@@ -537,8 +1840,7 @@ class Runner:
             log.debug(res)
 
             if res.returncode == 0:
-                self._runner = ExeOOMMFRunner(oommf_exe)
-                return
+                return ExeOOMMFRunner(oommf_exe)
             else:
                 log.warning(
                     "oommf_exe=%(exe)s found but not executable.", {"exe": oommf_exe}
@@ -564,13 +1866,82 @@ class Runner:
                     {"stdout": res.stdout, "stderr": res.stderr},
                 )
             else:
-                self._runner = DockerOOMMFRunner(docker_exe=self.docker_exe)
-                return
+                return DockerOOMMFRunner(docker_exe=self.docker_exe)
 
         # If OOMMFRunner was not returned up to this point, we raise an
         # exception.
         raise OSError("Cannot find OOMMF.")
 
+    def _discovery_key(self):
+        """Hash of everything the result of ``autoselect_runner()`` depends on."""
+        oommf_tcl = os.environ.get(self.envvar)
+        paths = [oommf_tcl, shutil.which(self.oommf_exe), shutil.which(self.docker_exe)]
+        key = {
+            "platform": sys.platform,
+            "envvar": self.envvar,
+            "oommf_exe": self.oommf_exe,
+            "docker_exe": self.docker_exe,
+            "PATH": os.environ.get("PATH"),
+            "files": [[path, _mtime(path)] for path in paths],
+        }
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    def _load_discovered(self):
+        try:
+            with open(_discovery_file(), encoding="utf-8") as f:
+                entry = json.load(f)[self._discovery_key()]
+            cls, attr = _discoverable_runners[entry["runner"]]
+            runner = cls(entry[attr])
+        except (OSError, ValueError, LookupError, TypeError):
+            return None
+        fingerprint = _fingerprint(entry[attr])
+        unchanged = fingerprint is not None and entry.get("file") == fingerprint
+        if self.check_runner and not unchanged:
+            try:
+                version = runner.version
+            except (OSError, RuntimeError):
+                log.debug(
+                    "Runner %(runner)s from the discovery cache cannot be used.",
+                    {"runner": runner},
+                )
+                return None
+            log.debug(
+                "Stored runner %(runner)s runs OOMMF %(version)s.",
+                {"runner": runner, "version": version},
+            )
+            self._store_discovered(runner)
+        log.debug(
+            "Using runner %(runner)s from the discovery cache.", {"runner": runner}
+        )
+        return runner
+
+    def _store_discovered(self, runner):
+        name = type(runner).__name__
+        if name not in _discoverable_runners:
+            return
+        filename = _discovery_file()
+        try:
+            with open(filename, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        if not isinstance(entries, dict):
+            entries = {}
+        key = self._discovery_key()
+        entries.pop(key, None)  # the most recent entry is stored last
+        _, attr = _discoverable_runners[name]
+        value = getattr(runner, attr)
+        entries[key] = {"runner": name, attr: value, "file": _fingerprint(value)}
+        entries = dict(list(entries.items())[-_max_discovered_runners:])
+        try:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            tmp = filename.with_name(f"{filename.name}.{os.getpid()}")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, filename)
+        except OSError:
+            log.debug("Cannot write the discovery cache %(file)s.", {"file": filename})
+
     def __repr__(self):
         # avoid selecting a runner when calling __repr__
         _runner = self._runner if self._runner is not None else "UNSET"
@@ -578,6 +1949,37 @@ class Runner:
         return f"OOMMF runner: {_runner}\nrunner is cached: {self.cache_runner}"
 
 
+# Runners which can be found by ``Runner.autoselect_runner`` and the attribute
+# that is stored in the discovery cache to recreate them.
+_discoverable_runners = {
+    "TclOOMMFRunner": (TclOOMMFRunner, "oommf_tcl"),
+    "ExeOOMMFRunner": (ExeOOMMFRunner, "oommf_exe"),
+    "DockerOOMMFRunner": (DockerOOMMFRunner, "docker_exe"),
+}
+_max_discovered_runners = 32
+
+
+def _discovery_file():
+    return oc.cache.cache_dir() / "runners.json"
+
+
+def _fingerprint(command):
+    """Path, size, and modification time of ``oommf.tcl`` or an executable."""
+    path = shutil.which(command) or command
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
 def overhead():
     """Run a macrospin example for 1 ps through ``oommfc`` and directly and
     return the difference in run times.
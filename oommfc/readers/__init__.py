@@ -0,0 +1,4 @@
+"""Fast readers for OOMMF output files."""
+
+from .odt import OdtReader as OdtReader
+from .ovf import read_ovf as read_ovf
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import pathlib
+import re
+
+import numpy as np
+import pandas as pd
+import ubermagtable as ut
+import ubermagtable.util.util
+
+# Number of bytes at the beginning of the table used to recognise the file
+# belonging to a sidecar.
+_head_size = 4096
+
+
+class OdtReader:
+    """Incremental reader of OOMMF ``.odt`` table files.
+
+    The reader remembers the column schema and the byte offset up to which the
+    file has been parsed. Every call to ``read`` only parses the rows that have
+    been appended to the file since the previous call (e.g. while OOMMF is still
+    running), so that repeatedly reading a growing table costs time proportional
+    to the number of new rows. Incomplete last lines are left for the next call.
+
+    If ``sidecar=True``, the parsed columns are additionally stored in a binary
+    sidecar directory ``<filename>.columns`` (one NumPy ``.npy`` file per column
+    and a ``meta.json`` file with the schema and the parsed offset). New readers
+    of the same file load the columns from the sidecar and only parse rows that
+    are not in the sidecar yet.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        OOMMF ``.odt`` file.
+
+    x : str, optional
+
+        Independent variable name used for ``table``. Defaults to ``None``.
+
+    rename : bool, optional
+
+        If ``rename=True``, the column names are renamed with their shorter
+        versions (as in ``ubermagtable.Table.fromfile``). Defaults to ``True``.
+
+    sidecar : bool, optional
+
+        If ``True``, read and update the columnar binary sidecar. Defaults to
+        ``False``.
+
+    Examples
+    --------
+    1. Reading a table file incrementally.
+
+    >>> import oommfc as oc
+    ...
+    >>> reader = oc.readers.OdtReader("macrospin.odt", x="t")  # doctest: +SKIP
+    >>> new_rows = reader.read()  # doctest: +SKIP
+    >>> reader.n_rows  # doctest: +SKIP
+    5
+    >>> reader.table  # doctest: +SKIP
+    <ubermagtable.table.Table object at ...>
+
+    """
+
+    def __init__(self, filename, /, x=None, rename=True, sidecar=False):
+        self.filename = pathlib.Path(filename)
+        self.x = x
+        self.rename = rename
+        self.sidecar = sidecar
+        self.offset = 0
+        self.columns = None
+        self.units = None
+        self._chunks = []
+        self._data = None
+        if sidecar:
+            self._load_sidecar()
+
+    @property
+    def n_rows(self):
+        """Number of rows read so far."""
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def read(self):
+        """Parse all complete rows appended since the last call.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+            New rows (possibly empty).
+
+        Raises
+        ------
+        ValueError
+
+            If the file is not an OOMMF table or its columns change.
+
+        """
+        with open(self.filename, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1  # only parse complete lines
+        lines = chunk[:end].decode("utf-8").splitlines()
+
+        if self.offset == 0 and lines and not lines[0].startswith("# ODT"):
+            raise ValueError(f"File {self.filename} is not an OOMMF table file.")
+
+        data_lines = []
+        for line in lines:
+            if line.startswith("#"):
+                self._parse_header(line)
+            elif line.strip():
+                data_lines.append(line)
+        self.offset += end
+
+        if data_lines:
+            if self.columns is None:
+                raise ValueError(f"No columns defined in {self.filename}.")
+            rows = np.loadtxt(data_lines, dtype=np.float64, ndmin=2)
+            self._chunks.append(rows)
+            self._data = None
+        else:
+            rows = np.empty((0, len(self.columns or [])))
+        if self.sidecar and end:
+            self._update_sidecar(rows)
+
+        return pd.DataFrame(rows, columns=self.columns)
+
+    @property
+    def data(self):
+        """All rows read so far as ``pandas.DataFrame``."""
+        if self._data is None:
+            n_columns = len(self.columns or [])
+            array = (
+                np.concatenate(self._chunks)
+                if self._chunks
+                else np.empty((0, n_columns))
+            )
+            self._chunks = [array] if len(array) else []
+            self._data = pd.DataFrame(array, columns=self.columns)
+        return self._data
+
+    @property
+    def table(self):
+        """All rows read so far as ``ubermagtable.Table``."""
+        units = dict(zip(self.columns or [], self.units or []))
+        return ut.Table(data=self.data, units=units, x=self.x)
+
+    def _parse_header(self, line):
+        if line.startswith("# Columns:"):
+            columns = re.split(r"Oxs_|Anv_|Southampton_|My_|YY_|UHH_|Xf_", line)[1:]
+            columns = [re.sub(r"[{}]", "", col).strip() for col in columns]
+            if self.rename:
+                columns = [
+                    ubermagtable.util.util.rename_column(
+                        col, ubermagtable.util.util.oommf_dict
+                    )
+                    for col in columns
+                ]
+            if self.columns is not None and columns != self.columns:
+                raise ValueError(f"Columns in {self.filename} have changed.")
+            self.columns = columns
+        elif line.startswith("# Units:"):
+            self.units = [re.sub(r"[{}]", "", unit) for unit in line.split()[2:]]
+
+    @property
+    def _sidecar_dir(self):
+        return pathlib.Path(f"{self.filename}.columns")
+
+    def _head(self):
+        with open(self.filename, "rb") as f:
+            return hashlib.sha256(f.read(min(self.offset, _head_size))).hexdigest()
+
+    def _load_sidecar(self):
+        try:
+            with open(self._sidecar_dir / "meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if meta["rename"] != self.rename or meta["offset"] > os.path.getsize(
+            self.filename
+        ):
+            return
+        self.offset = meta["offset"]
+        if self._head() != meta["head"]:  # the file has been replaced
+            self.offset = 0
+            return
+        self.columns, self.units = meta["columns"], meta["units"]
+        if meta["n_rows"]:
+            self._chunks = [
+                np.column_stack(
+                    [
+                        np.load(self._sidecar_dir / f"{i}.npy", mmap_mode="r")[
+                            : meta["n_rows"]
+                        ]
+                        for i in range(len(self.columns))
+                    ]
+                )
+            ]
+
+    def _update_sidecar(self, rows):
+        self._sidecar_dir.mkdir(exist_ok=True)
+        start = self.n_rows - len(rows)
+        for i in range(rows.shape[1]):
+            _append_npy(self._sidecar_dir / f"{i}.npy", rows[:, i], start)
+        meta = {
+            "offset": self.offset,
+            "n_rows": self.n_rows,
+            "rename": self.rename,
+            "columns": self.columns,
+            "units": self.units,
+            "head": self._head(),
+        }
+        tmp = self._sidecar_dir / f"meta.json.{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._sidecar_dir / "meta.json")
+
+
+def _append_npy(filename, values, start):
+    """Write a one-dimensional array to an ``.npy`` file in place from ``start``.
+
+    Rows after ``start`` (e.g. written before an interrupted update) are
+    overwritten.
+
+    """
+    values = np.ascontiguousarray(values, dtype="<f8")
+    if start == 0 or not filename.exists():
+        np.save(filename, values)
+        return
+    with open(filename, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version != (1, 0):
+            raise ValueError(f"Cannot append to {filename}.")  # pragma: no cover
+        np.lib.format.read_array_header_1_0(f)
+        header_size = f.tell()
+        f.truncate(header_size + start * values.itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(values.tobytes())
+        # NumPy pads the header so that the array can grow without changing the
+        # size of the header.
+        f.seek(0)
+        np.lib.format.write_array_header_1_0(
+            f,
+            {"descr": "<f8", "fortran_order": False, "shape": (start + len(values),)},
+        )
+        if f.tell() != header_size:
+            raise ValueError(f"Cannot append to {filename}.")  # pragma: no cover
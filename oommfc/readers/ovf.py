@@ -0,0 +1,135 @@
+import pathlib
+
+import numpy as np
+
+_check_values = {4: 1234567.0, 8: 123456789012345.0}
+
+
+def read_ovf(filename, out=None):
+    """Read a binary OVF file by memory-mapping its data block.
+
+    The header of the file is validated and the data block is memory-mapped
+    without reading it into memory. If ``out`` is not passed, a read-only
+    ``numpy.ndarray`` view of the mapped data with shape ``(nx, ny, nz,
+    valuedim)`` is returned, i.e. no data is copied until the array is accessed.
+    Otherwise, the data is copied directly into ``out`` (e.g. the array of an
+    existing ``discretisedfield.Field``) without any intermediate arrays.
+
+    Only ``binary 4`` and ``binary 8`` OVF 1.0 and OVF 2.0 files with a
+    rectangular mesh can be read. Text files have to be read with
+    ``discretisedfield.Field.from_file``.
+
+    Parameters
+    ----------
+    filename : str, pathlib.Path
+
+        Name of the OVF file.
+
+    out : numpy.ndarray, optional
+
+        Array with shape ``(nx, ny, nz, valuedim)`` into which the data is copied.
+        Defaults to ``None``.
+
+    Returns
+    -------
+    numpy.ndarray
+
+        Field values. If ``out`` is passed, ``out`` is returned.
+
+    Raises
+    ------
+    ValueError
+
+        If the file is not a binary OVF file, the check value is not correct, or
+        the shape of ``out`` does not match the data.
+
+    Examples
+    --------
+    1. Reading an OVF file.
+
+    >>> import discretisedfield as df
+    >>> import oommfc as oc
+    ...
+    >>> mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 3e-9), n=(10, 5, 3))
+    >>> field = df.Field(mesh, nvdim=3, value=(0, 0, 1))
+    >>> field.to_file("m.omf")
+    >>> array = oc.readers.read_ovf("m.omf")
+    >>> array.shape
+    (10, 5, 3, 3)
+    >>> (array == field.array).all()
+    True
+
+    2. Reading into an existing array.
+
+    >>> field2 = df.Field(mesh, nvdim=3)
+    >>> _ = oc.readers.read_ovf("m.omf", out=field2.array)
+    >>> field2.allclose(field)
+    True
+    >>> import os
+    >>> os.remove("m.omf")
+
+    """
+    filename = pathlib.Path(filename)
+    header, offset, dtype = _read_header(filename)
+    shape = (*(header[f"{key}nodes"] for key in "zyx"), header["valuedim"])
+
+    if out is not None and out.shape != (*reversed(shape[:3]), shape[3]):
+        raise ValueError(
+            f"Cannot read {filename} with data shape"
+            f" {(*reversed(shape[:3]), shape[3])} into an array with shape"
+            f" {out.shape}."
+        )
+
+    data = np.memmap(filename, dtype=dtype, mode="r", offset=offset, shape=shape)
+    # OVF stores the x index fastest.
+    view = data.transpose(2, 1, 0, 3)
+    if out is None:
+        return view.view(np.ndarray)
+    np.copyto(out, view, casting="unsafe")
+    return out
+
+
+def _read_header(filename):
+    header = {}
+    offset = 0
+    with open(filename, "rb") as f:
+        first_line = next(f)
+        offset += len(first_line)
+        if not first_line.startswith(b"# OOMMF"):
+            raise ValueError(f"File {filename} is not an OVF file.")
+        ovf_v2 = b"2.0" in first_line
+        for line in f:
+            offset += len(line)
+            line = line.decode("utf-8")
+            if line.lower().startswith("# begin: data"):
+                mode, *nbytes = line.split()[3:]
+                break
+            key, sep, value = line[1:].partition(":")
+            if sep:
+                header[key.strip().lower()] = value.strip()
+        else:
+            raise ValueError(f"File {filename} does not contain a data block.")
+
+        if mode.lower() != "binary" or int(nbytes[0]) not in _check_values:
+            raise ValueError(
+                f"Cannot memory-map {filename}: only binary 4 and binary 8 data is"
+                " supported."
+            )
+        nbytes = int(nbytes[0])
+        # OVF2 uses little-endian and OVF1 uses big-endian
+        dtype = np.dtype(f"{'<' if ovf_v2 else '>'}{'d' if nbytes == 8 else 'f'}")
+        check = np.frombuffer(f.read(nbytes), dtype=dtype)
+        if check.size != 1 or check[0] != _check_values[nbytes]:
+            raise ValueError(
+                f"Cannot read file {filename}. The check value is not correct:"
+                f" Expected {_check_values[nbytes]}, got {check}."
+            )
+        offset += nbytes
+
+    if header.get("meshtype", "rectangular") != "rectangular":
+        raise ValueError(f"Cannot read {filename} with an irregular mesh.")
+    for key in "xyz":
+        header[f"{key}nodes"] = int(header[f"{key}nodes"])
+    # valuedim is fixed to 3 and not in the header for OVF 1.0
+    header["valuedim"] = int(header["valuedim"]) if ovf_v2 else 3
+    return header, offset, dtype
@@ -0,0 +1,179 @@
+"""Timing and resource usage of OOMMF runs.
+
+``Driver.drive`` (also with ``stream`` or ``callback``), ``Driver.drive_async``,
+``Driver.resume``, ``oommfc.compute``, ``oommfc.compute_many``,
+``oommfc.compute_batch``, and ``oommfc.compute_async`` record where the time of
+a run goes and which resources OOMMF used. The statistics are stored as
+``system.last_run_stats``, logged with the ``oommfc`` logger (level ``INFO``),
+and, for drives, stored in ``info.json`` under ``'run_stats'``.
+
+"""
+
+import contextlib
+import contextvars
+import logging
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = logging.getLogger("oommfc")
+
+_current = contextvars.ContextVar("run_stats", default=None)
+
+# OOMMF runs measured at the moment and in total, to detect overlapping runs.
+_lock = threading.Lock()
+_active = 0
+_started = 0
+
+
+class RunStats:
+    """Timing and resource usage of a single OOMMF run.
+
+    The wall-clock time of a run is split into phases, which do not overlap:
+
+    - ``'write_mif'``: generating and writing the MIF file,
+    - ``'write_fields'``: writing ``m0.omf`` and the ``.ovf`` files of spatially
+      varying parameters,
+    - ``'oommf'``: running OOMMF, including its startup (see
+      ``oommfc.oommf.overhead``),
+    - ``'read_data'``: reading the results written by OOMMF.
+
+    CPU times and the peak resident set size are taken from the resource usage
+    of the child processes of Python (``resource.getrusage(RUSAGE_CHILDREN)``).
+    They are not available on Windows and do not include OOMMF running inside
+    Docker. The resource usage of child processes cannot be attributed to a
+    single run, so CPU times and the peak resident set size are ``None`` if
+    another measured OOMMF run (e.g. of ``drive_async`` or another thread) was
+    running at the same time. Python only records the largest peak of all child
+    processes so far, so the peak resident set size is also ``None`` if OOMMF
+    used less memory than an earlier child process.
+
+    Examples
+    --------
+    1. Timing of a drive.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> system = mm.examples.macrospin()
+    >>> oc.MinDriver().drive(system)  # doctest: +SKIP
+    Running OOMMF...
+    >>> system.last_run_stats["phases"]  # doctest: +SKIP
+    {'write_mif': 0.002, 'write_fields': 0.001, 'oommf': 0.853, 'read_data': 0.012}
+
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.cpu_user = self.cpu_system = self.max_rss = None
+        self._stack = []  # names of the active (nested) phases
+        self._since = None
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Measure the time of phase ``name``, excluding nested phases."""
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch()
+
+    def _switch(self, name=None):
+        now = time.perf_counter()
+        if self._stack:
+            phase = self._stack[-1]
+            self.phases[phase] = self.phases.get(phase, 0) + now - self._since
+        if name is None:
+            self._stack.pop()
+        else:
+            self._stack.append(name)
+        self._since = now
+
+    @contextlib.contextmanager
+    def oommf(self):
+        """Measure the time and resource usage of running OOMMF."""
+        global _active, _started
+        with _lock:
+            overlap = _active > 0
+            _active += 1
+            _started += 1
+            started = _started
+            before = _children_usage()
+        try:
+            with self.phase("oommf"):
+                yield
+        finally:
+            with _lock:
+                _active -= 1
+                overlap = overlap or _started != started
+                after = _children_usage()
+        if before is None or after is None or overlap:
+            return
+        self.cpu_user = after.ru_utime - before.ru_utime
+        self.cpu_system = after.ru_stime - before.ru_stime
+        if after.ru_maxrss > before.ru_maxrss:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.max_rss = after.ru_maxrss * scale
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Record phases of nested ``oommfc.runstats.phase`` contexts."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def to_dict(self):
+        """Statistics as a JSON-serialisable ``dict``.
+
+        ``'total'`` and ``'phases'`` are in seconds, ``'cpu_user'`` and
+        ``'cpu_system'`` (CPU time of OOMMF) in seconds, and ``'max_rss'`` in
+        bytes.
+
+        """
+        return {
+            "total": time.perf_counter() - self._start,
+            "phases": dict(self.phases),
+            "cpu_user": self.cpu_user,
+            "cpu_system": self.cpu_system,
+            "max_rss": self.max_rss,
+        }
+
+    def record(self, system, description):
+        """Store the statistics as ``system.last_run_stats`` and log them."""
+        stats = self.to_dict()
+        system.last_run_stats = stats
+        log.info(
+            "%(description)s of %(name)s took %(total).3f s: %(phases)s.",
+            {
+                "description": description,
+                "name": system.name,
+                "total": stats["total"],
+                "phases": ", ".join(
+                    f"{phase} {seconds:.3f} s" for phase, seconds in self.phases.items()
+                ),
+            },
+        )
+        return stats
+
+
+def phase(name):
+    """Measure phase ``name`` of the active ``RunStats``, if there is one."""
+    stats = _current.get()
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.phase(name)
+
+
+def _children_usage():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN)
@@ -1,10 +1,13 @@
 from .driver import driver_script as driver_script
 from .energy import energy_script as energy_script
+from .energy import oxs_class as oxs_class
+from .energy import oxs_output as oxs_output
 from .evolver import evolver_script as evolver_script
 from .mesh import mesh_script as mesh_script
 from .system import system_script as system_script
 from .util import box_atlas as box_atlas
 from .util import file_vector_field as file_vector_field
+from .util import mif_script as mif_script
 from .util import setup_m0 as setup_m0
 from .util import setup_scalar_parameter as setup_scalar_parameter
 from .util import setup_vector_parameter as setup_vector_parameter
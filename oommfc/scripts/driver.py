@@ -2,12 +2,19 @@ import micromagneticmodel as mm
 import ubermagutil.typesystem as ts
 
 import oommfc as oc
+from .util import mif_script
 
 
+@mif_script
 def driver_script(
-    driver, system, fixed_subregions=None, compute=None, output_step=False, **kwargs
+    driver,
+    system,
+    fixed_subregions=None,
+    compute=None,
+    output_step=False,
+    checkpoint=False,
+    **kwargs,
 ):
-    mif = ""
     if isinstance(driver, oc.HysteresisDriver):
         # Check evolver and set default if not passed.
         if not hasattr(driver, "evolver"):
@@ -26,34 +33,35 @@ def driver_script(
             resstr = f"{{main_atlas {' '.join(fixed_subregions)}}}"
             driver.evolver.fixed_spins = resstr
 
-        mif += oc.scripts.evolver_script(driver.evolver)
+        yield from oc.scripts.evolver_script.iter(driver.evolver)
 
         # Oxs_UZeeman
-        mif += "# OxS_UZeeman\n"
-        mif += "Specify Oxs_UZeeman:hysteresis {\n"
-        mif += "  Hrange {\n"
+        yield "# OxS_UZeeman\n"
+        yield "Specify Oxs_UZeeman:hysteresis {\n"
+        yield "  Hrange {\n"
         for Hstart, Hend, n in kwargs["Hsteps"]:
-            mif += "    {{ {} {} {} {} {} {} {} }}\n".format(*Hstart, *Hend, n - 1)
-        mif += "  }\n"
-        mif += "}\n\n"
+            yield "    {{ {} {} {} {} {} {} {} }}\n".format(*Hstart, *Hend, n - 1)
+        yield "  }\n"
+        yield "}\n\n"
 
         # Minimisation driver script.
-        mif += "# MinDriver\n"
-        mif += "Specify Oxs_MinDriver {\n"
-        mif += "  evolver :evolver\n"
-        mif += "  mesh :mesh\n"
-        mif += "  Ms :m0_norm\n"
-        mif += "  m0 :m0\n"
+        yield "# MinDriver\n"
+        yield "Specify Oxs_MinDriver {\n"
+        yield "  evolver :evolver\n"
+        yield "  mesh :mesh\n"
+        yield "  Ms :m0_norm\n"
+        yield "  m0 :m0\n"
         for attr, value in driver:
             if attr != "evolver":
-                mif += f"  {attr} {value}\n"
-        mif += "}\n\n"
+                yield f"  {attr} {value}\n"
+        yield from _checkpoint_script(driver, system, checkpoint)
+        yield "}\n\n"
 
         # Saving results.
-        mif += "Destination table mmArchive\n"
-        mif += "Destination mags mmArchive\n\n"
-        mif += "Schedule DataTable table Stage 1\n"
-        mif += "Schedule Oxs_MinDriver::Magnetization mags Stage 1"
+        yield "Destination table mmArchive\n"
+        yield "Destination mags mmArchive\n\n"
+        yield "Schedule DataTable table Stage 1\n"
+        yield "Schedule Oxs_MinDriver::Magnetization mags Stage 1"
 
     if isinstance(driver, oc.MinDriver):
         # Check evolver and set default if not passed.
@@ -76,25 +84,26 @@ def driver_script(
         # What is saved in output?
         output_str = "Step" if output_step else "Stage"
 
-        mif += oc.scripts.evolver_script(driver.evolver)
+        yield from oc.scripts.evolver_script.iter(driver.evolver)
 
         # Minimisation driver script.
-        mif += "# MinDriver\n"
-        mif += "Specify Oxs_MinDriver {\n"
-        mif += "  evolver :evolver\n"
-        mif += "  mesh :mesh\n"
-        mif += "  Ms :m0_norm\n"
-        mif += "  m0 :m0\n"
+        yield "# MinDriver\n"
+        yield "Specify Oxs_MinDriver {\n"
+        yield "  evolver :evolver\n"
+        yield "  mesh :mesh\n"
+        yield "  Ms :m0_norm\n"
+        yield "  m0 :m0\n"
         for attr, value in driver:
             if attr != "evolver":
-                mif += f"  {attr} {value}\n"
-        mif += "}\n\n"
+                yield f"  {attr} {value}\n"
+        yield from _checkpoint_script(driver, system, checkpoint)
+        yield "}\n\n"
 
         # Saving results.
-        mif += "Destination table mmArchive\n"
-        mif += "Destination mags mmArchive\n\n"
-        mif += f"Schedule DataTable table {output_str} 1\n"
-        mif += f"Schedule Oxs_MinDriver::Magnetization mags {output_str} 1"
+        yield "Destination table mmArchive\n"
+        yield "Destination mags mmArchive\n\n"
+        yield f"Schedule DataTable table {output_str} 1\n"
+        yield f"Schedule Oxs_MinDriver::Magnetization mags {output_str} 1"
 
     if isinstance(driver, oc.TimeDriver):
         # Check evolver and set default if not passed.
@@ -180,33 +189,43 @@ def driver_script(
             resstr = f"{{main_atlas {' '.join(fixed_subregions)}}}"
             driver.evolver.fixed_spins = resstr
 
-        mif += oc.scripts.evolver_script(driver.evolver, **kwargs)
+        yield from oc.scripts.evolver_script.iter(driver.evolver, **kwargs)
 
         # Extract time and number of steps.
         t, n = kwargs["t"], kwargs["n"]
 
         # TimeDriver
-        mif += "# TimeDriver\n"
-        mif += "Specify Oxs_TimeDriver {\n"
-        mif += "  evolver :evolver\n"
-        mif += "  mesh :mesh\n"
-        mif += "  Ms :m0_norm\n"
-        mif += "  m0 :m0\n"
-        mif += f"  stopping_time {t / n}\n"
-        mif += f"  stage_count {n}\n"
+        yield "# TimeDriver\n"
+        yield "Specify Oxs_TimeDriver {\n"
+        yield "  evolver :evolver\n"
+        yield "  mesh :mesh\n"
+        yield "  Ms :m0_norm\n"
+        yield "  m0 :m0\n"
+        yield f"  stopping_time {t / n}\n"
+        yield f"  stage_count {n}\n"
         for attr, value in driver:
             if attr != "evolver":
-                mif += f"  {attr} {value}\n"
-        mif += "}\n\n"
+                yield f"  {attr} {value}\n"
+        yield from _checkpoint_script(driver, system, checkpoint)
+        yield "}\n\n"
 
         # Saving results
-        mif += "Destination table mmArchive\n"
-        mif += "Destination mags mmArchive\n"
-        mif += "Destination archive mmArchive\n\n"
-        mif += "Schedule DataTable table Stage 1\n"
-        mif += "Schedule Oxs_TimeDriver::Magnetization mags Stage 1\n"
+        yield "Destination table mmArchive\n"
+        yield "Destination mags mmArchive\n"
+        yield "Destination archive mmArchive\n\n"
+        yield "Schedule DataTable table Stage 1\n"
+        yield "Schedule Oxs_TimeDriver::Magnetization mags Stage 1\n"
 
         if compute is not None:
-            mif += compute
-
-    return mif
+            yield compute
+
+
+def _checkpoint_script(driver, system, checkpoint):
+    # Checkpoints are written to the drive directory, where ``Driver.resume``
+    # expects them. Attributes set explicitly on the driver take precedence.
+    if not checkpoint:
+        return
+    if not hasattr(driver, "checkpoint_file"):
+        yield f"  checkpoint_file {system.name}.restart\n"
+    if checkpoint is not True and not hasattr(driver, "checkpoint_interval"):
+        yield f"  checkpoint_interval {checkpoint}\n"
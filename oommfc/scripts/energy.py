@@ -1,60 +1,184 @@
 import contextlib
 import numbers
+import re
 import warnings
 
 import discretisedfield as df
 
 import oommfc as oc
+from .util import mif_script
 
 
+def _exchange_class(term):
+    if isinstance(term.A, numbers.Real):
+        return "Oxs_UniformExchange"
+    elif isinstance(term.A, dict):
+        return "Oxs_Exchange6Ngbr"
+    else:
+        return "Oxs_ExchangePtwise"
+
+
+def _zeeman_class(term):
+    if (
+        isinstance(term.wave, str)
+        or isinstance(term.func, str)
+        or callable(term.func)  # tlist is computed by the driver
+    ):
+        if isinstance(term.H, (df.Field, dict)):
+            return "Oxs_TransformZeeman"
+        return "Oxs_ScriptUZeeman"
+    elif isinstance(term.tcl_strings, dict):
+        return term.tcl_strings["energy"]
+    else:
+        return "Oxs_FixedZeeman"
+
+
+def _dmi_class(term):
+    if term.crystalclass in ["T", "O"]:
+        return "Oxs_DMI_T"
+    elif term.crystalclass in ["D2d", "Cnv"]:  # deprecated names
+        return f"Oxs_DMI_{term.crystalclass}_z"
+    else:
+        return f"Oxs_DMI_{term.crystalclass}"
+
+
+def _uniaxialanisotropy_class(term):
+    if isinstance(term.K2, (numbers.Real, dict, df.Field)):
+        return "Southampton_UniaxialAnisotropy4"
+    return "Oxs_UniaxialAnisotropy"
+
+
+# Oxs class used for every energy term type. Classes depending on the type of the
+# term's parameters are determined by a function of the term.
+oxs_classes = {
+    "Exchange": _exchange_class,
+    "Zeeman": _zeeman_class,
+    "Demag": "Oxs_Demag",
+    "DMI": _dmi_class,
+    "UniaxialAnisotropy": _uniaxialanisotropy_class,
+    "CubicAnisotropy": "Oxs_CubicAnisotropy",
+    "MagnetoElastic": "YY_FixedMEL",
+    "RKKY": "Oxs_TwoSurfaceExchange",
+}
+
+
+def oxs_class(term):
+    """Return the name of the Oxs class of an energy term.
+
+    The class is looked up in ``oxs_classes`` without generating the MIF script of
+    the term, i.e. without writing any files.
+
+    Parameters
+    ----------
+    term : micromagneticmodel.energy.EnergyTerm
+
+        Energy term.
+
+    Returns
+    -------
+    str
+
+        Name of the Oxs class including its prefix (e.g. ``'Oxs_'``).
+
+    Raises
+    ------
+    ValueError
+
+        If the energy term is not supported.
+
+    Examples
+    --------
+    1. Oxs class of an energy term.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> oc.scripts.oxs_class(mm.Exchange(A=1e-11))
+    'Oxs_UniformExchange'
+    >>> oc.scripts.oxs_class(mm.UniaxialAnisotropy(K1=1e5, K2=1e3, u=(0, 0, 1)))
+    'Southampton_UniaxialAnisotropy4'
+
+    """
+    try:
+        cls = oxs_classes[term.__class__.__name__]
+    except KeyError:
+        raise ValueError(f"Energy term {term!r} is not supported.") from None
+    return cls if isinstance(cls, str) else cls(term)
+
+
+def oxs_output(term, output, prefix=True):
+    """Return the OOMMF name of an output (e.g. ``'Field'``) of an energy term.
+
+    If ``prefix=False``, the prefix of the Oxs class is removed, as in the column
+    names of tables read with ``rename=False``.
+
+    Examples
+    --------
+    1. Output names of an energy term.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> oc.scripts.oxs_output(mm.Demag(), "Field")
+    'Oxs_Demag:demag:Field'
+    >>> oc.scripts.oxs_output(mm.Demag(), "Energy", prefix=False)
+    'Demag:demag:Energy'
+
+    """
+    cls = oxs_class(term)
+    if not prefix:
+        cls = re.sub(r"^(Oxs|Anv|Southampton|My|YY|UHH|Xf)_", "", cls)
+    return f"{cls}:{term.name}:{output}"
+
+
+@mif_script
 def energy_script(system):
-    mif = ""
     for term in system.energy:
-        mif += globals()[f"{term.__class__.__name__.lower()}_script"](term, system)
-
-    return mif
+        script = globals()[f"{term.__class__.__name__.lower()}_script"]
+        yield from script.iter(term, system)
 
 
+@mif_script
 def exchange_script(term, system):
+    cls = oxs_class(term)
     if isinstance(term.A, numbers.Real):
-        mif = "# UniformExchange\n"
-        mif += f"Specify Oxs_UniformExchange:{term.name} {{\n"
-        mif += f"  A {term.A}\n"
-        mif += "}\n\n"
+        yield "# UniformExchange\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  A {term.A}\n"
+        yield "}\n\n"
 
     elif isinstance(term.A, dict):
         default_value = term.A.get("default", 0)
-        mif = "# Exchange6Ngbr\n"
-        mif += f"Specify Oxs_Exchange6Ngbr:{term.name} {{\n"
-        mif += f"  default_A {default_value}\n"
-        mif += "  atlas :main_atlas\n"
-        mif += "  A {\n"
+        yield "# Exchange6Ngbr\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  default_A {default_value}\n"
+        yield "  atlas :main_atlas\n"
+        yield "  A {\n"
         for key, value in term.A.items():
             if key != "default":
                 if ":" in key:
                     region1, region2 = key.split(":")
                 else:
                     region1, region2 = key, key
-                mif += f"    {region1} {region2} {value}\n"
-        mif += "  }\n"
-        mif += "}\n\n"
+                yield f"    {region1} {region2} {value}\n"
+        yield "  }\n"
+        yield "}\n\n"
 
     elif isinstance(term.A, df.Field):
         Amif, Aname = oc.scripts.setup_scalar_parameter(term.A, f"{term.name}_A")
-        mif = Amif
-        mif += "# ExchangePtwise\n"
-        mif += f"Specify Oxs_ExchangePtwise:{term.name} {{\n"
-        mif += f"  A {Aname}\n"
-        mif += "}\n\n"
-
-    return mif
+        yield Amif
+        yield "# ExchangePtwise\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  A {Aname}\n"
+        yield "}\n\n"
 
 
+@mif_script
 def zeeman_script(term, system):
     Hmif, Hname = oc.scripts.setup_vector_parameter(term.H, f"{term.name}_H")
+    cls = oxs_class(term)
 
-    mif = ""
-    mif += Hmif
+    yield Hmif
 
     if isinstance(term.wave, str) or isinstance(term.func, str):
         if isinstance(term.wave, str):
@@ -65,249 +189,236 @@ def zeeman_script(term, system):
             )
         if isinstance(term.H, (df.Field, dict)):
             if term.wave == "sin" or term.func == "sin":
-                mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-                mif += "  set PI [expr {4*atan(1.)}]\n"
-                mif += f"  set w [expr {{ {term.f}*2*$PI }}]\n"
-                mif += f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
-                mif += "  set wt [expr { $w*$tt }]\n"
-                mif += "  set f [expr {sin($wt)}]\n"
-                mif += "  set df [expr {$w*cos($wt)}]\n"
-                mif += "  set ft [expr { $f }]\n"
-                mif += "  set dft [expr { $df }]\n"
-                mif += (
+                yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+                yield "  set PI [expr {4*atan(1.)}]\n"
+                yield f"  set w [expr {{ {term.f}*2*$PI }}]\n"
+                yield f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
+                yield "  set wt [expr { $w*$tt }]\n"
+                yield "  set f [expr {sin($wt)}]\n"
+                yield "  set df [expr {$w*cos($wt)}]\n"
+                yield "  set ft [expr { $f }]\n"
+                yield "  set dft [expr { $df }]\n"
+                yield (
                     "  return [list $ft 0 0 0 $ft 0 0 0 $ft "
                     "$dft 0 0 0 $dft 0 0 0 $dft ] \n"
                 )
-                mif += "}\n\n"
+                yield "}\n\n"
 
             elif term.wave == "sinc" or term.func == "sinc":
-                mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-                mif += "  set PI [expr {4*atan(1.)}]\n"
-                mif += f"  set w [expr {{ {term.f}*2*$PI }}]\n"
-                mif += f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
-                mif += "  set wt [expr {$w*$tt}]\n"
-                mif += "  set sinwt [expr {sin($wt)}]\n"
-                mif += "  set coswt [expr {cos($wt)}]\n"
-                mif += "  if {$wt != 0} { set f [expr {$sinwt/$wt}] }\n"
-                mif += "  if {$wt == 0} { set f [expr {1}] }\n"
-                mif += (
+                yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+                yield "  set PI [expr {4*atan(1.)}]\n"
+                yield f"  set w [expr {{ {term.f}*2*$PI }}]\n"
+                yield f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
+                yield "  set wt [expr {$w*$tt}]\n"
+                yield "  set sinwt [expr {sin($wt)}]\n"
+                yield "  set coswt [expr {cos($wt)}]\n"
+                yield "  if {$wt != 0} { set f [expr {$sinwt/$wt}] }\n"
+                yield "  if {$wt == 0} { set f [expr {1}] }\n"
+                yield (
                     "  if {$wt != 0} { set df "
                     "[expr {($wt*$w*$coswt - $w*$sinwt)/($wt*$wt)}] }\n"
                 )
-                mif += "  if {$wt == 0} { set df [expr {0}] }\n"
-                mif += "  set ft [expr { $f }]\n"
-                mif += "  set dft [expr { $df }]\n"
-                mif += (
+                yield "  if {$wt == 0} { set df [expr {0}] }\n"
+                yield "  set ft [expr { $f }]\n"
+                yield "  set dft [expr { $df }]\n"
+                yield (
                     "  return [list $ft 0 0 0 $ft 0 0 0 $ft "
                     "$dft 0 0 0 $dft 0 0 0 $dft ] \n"
                 )
-                mif += "}\n\n"
-
-            mif += "# TransformZeeman\n"
-            mif += f"Specify Oxs_TransformZeeman:{term.name} {{\n"
-            mif += "  type general\n"
-            mif += "  script_args total_time\n"
-            mif += f"  script TimeFunction:{term.name}\n"
-            mif += f"  field {Hname}\n"
-            mif += "}\n\n"
+                yield "}\n\n"
+
+            yield "# TransformZeeman\n"
+            yield f"Specify {cls}:{term.name} {{\n"
+            yield "  type general\n"
+            yield "  script_args total_time\n"
+            yield f"  script TimeFunction:{term.name}\n"
+            yield f"  field {Hname}\n"
+            yield "}\n\n"
         else:
             if term.wave == "sin" or term.func == "sin":
-                mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-                mif += "  set PI [expr {4*atan(1.)}]\n"
-                mif += f"  set w [expr {{ {term.f}*2*$PI }}]\n"
-                mif += f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
-                mif += "  set wt [expr { $w*$tt }]\n"
-                mif += "  set f [expr {sin($wt)}]\n"
-                mif += "  set df [expr {$w*cos($wt)}]\n"
-                mif += f"  set Hx [expr {{ {term.H[0]}*$f }}]\n"
-                mif += f"  set Hy [expr {{ {term.H[1]}*$f }}]\n"
-                mif += f"  set Hz [expr {{ {term.H[2]}*$f }}]\n"
-                mif += f"  set dHx [expr {{ {term.H[0]}*$df }}]\n"
-                mif += f"  set dHy [expr {{ {term.H[1]}*$df }}]\n"
-                mif += f"  set dHz [expr {{ {term.H[2]}*$df }}]\n"
-                mif += "  return [list $Hx $Hy $Hz $dHx $dHy $dHz ] \n"
-                mif += "}\n\n"
+                yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+                yield "  set PI [expr {4*atan(1.)}]\n"
+                yield f"  set w [expr {{ {term.f}*2*$PI }}]\n"
+                yield f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
+                yield "  set wt [expr { $w*$tt }]\n"
+                yield "  set f [expr {sin($wt)}]\n"
+                yield "  set df [expr {$w*cos($wt)}]\n"
+                yield f"  set Hx [expr {{ {term.H[0]}*$f }}]\n"
+                yield f"  set Hy [expr {{ {term.H[1]}*$f }}]\n"
+                yield f"  set Hz [expr {{ {term.H[2]}*$f }}]\n"
+                yield f"  set dHx [expr {{ {term.H[0]}*$df }}]\n"
+                yield f"  set dHy [expr {{ {term.H[1]}*$df }}]\n"
+                yield f"  set dHz [expr {{ {term.H[2]}*$df }}]\n"
+                yield "  return [list $Hx $Hy $Hz $dHx $dHy $dHz ] \n"
+                yield "}\n\n"
             elif term.wave == "sinc" or term.func == "sinc":
-                mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-                mif += "  set PI [expr {4*atan(1.)}]\n"
-                mif += f"  set w [expr {{ {term.f}*2*$PI }}]\n"
-                mif += f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
-                mif += "  set wt [expr {$w*$tt}]\n"
-                mif += "  set sinwt [expr {sin($wt)}]\n"
-                mif += "  set coswt [expr {cos($wt)}]\n"
-                mif += "  if {$wt != 0} { set f [expr {$sinwt/$wt}] }\n"
-                mif += "  if {$wt == 0} { set f [expr {1}] }\n"
-                mif += (
+                yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+                yield "  set PI [expr {4*atan(1.)}]\n"
+                yield f"  set w [expr {{ {term.f}*2*$PI }}]\n"
+                yield f"  set tt [expr {{ $total_time - {term.t0} }}]\n"
+                yield "  set wt [expr {$w*$tt}]\n"
+                yield "  set sinwt [expr {sin($wt)}]\n"
+                yield "  set coswt [expr {cos($wt)}]\n"
+                yield "  if {$wt != 0} { set f [expr {$sinwt/$wt}] }\n"
+                yield "  if {$wt == 0} { set f [expr {1}] }\n"
+                yield (
                     "  if {$wt != 0} { set df "
                     "[expr {($wt*$w*$coswt - $w*$sinwt)/($wt*$wt)}] }\n"
                 )
-                mif += "  if {$wt == 0} { set df [expr {0}] }\n"
-                mif += f"  set Hx [expr {{ {term.H[0]}*$f }}]\n"
-                mif += f"  set Hy [expr {{ {term.H[1]}*$f }}]\n"
-                mif += f"  set Hz [expr {{ {term.H[2]}*$f }}]\n"
-                mif += f"  set dHx [expr {{ {term.H[0]}*$df }}]\n"
-                mif += f"  set dHy [expr {{ {term.H[1]}*$df }}]\n"
-                mif += f"  set dHz [expr {{ {term.H[2]}*$df }}]\n"
-                mif += "  return [list $Hx $Hy $Hz $dHx $dHy $dHz ] \n"
-                mif += "}\n\n"
-
-            mif += "# ScriptUZeeman\n"
-            mif += f"Specify Oxs_ScriptUZeeman:{term.name} {{\n"
-            mif += "  script_args total_time\n"
-            mif += f"  script TimeFunction:{term.name}\n"
-            mif += "}\n\n"
+                yield "  if {$wt == 0} { set df [expr {0}] }\n"
+                yield f"  set Hx [expr {{ {term.H[0]}*$f }}]\n"
+                yield f"  set Hy [expr {{ {term.H[1]}*$f }}]\n"
+                yield f"  set Hz [expr {{ {term.H[2]}*$f }}]\n"
+                yield f"  set dHx [expr {{ {term.H[0]}*$df }}]\n"
+                yield f"  set dHy [expr {{ {term.H[1]}*$df }}]\n"
+                yield f"  set dHz [expr {{ {term.H[2]}*$df }}]\n"
+                yield "  return [list $Hx $Hy $Hz $dHx $dHy $dHz ] \n"
+                yield "}\n\n"
+
+            yield "# ScriptUZeeman\n"
+            yield f"Specify {cls}:{term.name} {{\n"
+            yield "  script_args total_time\n"
+            yield f"  script TimeFunction:{term.name}\n"
+            yield "}\n\n"
     elif hasattr(term, "tlist"):
         if isinstance(term.H, (df.Field, dict)):
-            mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-            mif += f"  set tstep {term.dt}\n"
-            mif += "  set index [expr round($total_time/$tstep)]\n"
+            yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+            yield f"  set tstep {term.dt}\n"
+            yield "  set index [expr round($total_time/$tstep)]\n"
             tstr = " ".join(map(str, term.tlist))
             for char, replacement in [[",", ""], ["[", "{ "], ["]", " }"]]:
                 tstr = tstr.replace(char, replacement)
-            mif += f"  set H_t_fac {{ {tstr} }}\n"
+            yield f"  set H_t_fac {{ {tstr} }}\n"
             dtstr = " ".join(map(str, term.dtlist))
             for char, replacement in [[",", ""], ["[", "{ "], ["]", " }"]]:
                 dtstr = dtstr.replace(char, replacement)
-            mif += f"  set dH_t_fac {{ {dtstr} }}\n"
-            mif += "  set H [lindex $H_t_fac $index]\n"
-            mif += "  set dH [lindex $dH_t_fac $index]\n"
+            yield f"  set dH_t_fac {{ {dtstr} }}\n"
+            yield "  set H [lindex $H_t_fac $index]\n"
+            yield "  set dH [lindex $dH_t_fac $index]\n"
             if isinstance(term.tlist[0], list):
-                mif += (
+                yield (
                     "  return [list"
                     f" {' '.join([f'[lindex $H {i}]' for i in range(9)])}"
                     f" {' '.join([f'[lindex $dH {i}]' for i in range(9)])}"
                     "]\n"
                 )
             else:
-                mif += "  return [list $H $H $H $dH $dH $dH]\n"
-            mif += "}\n\n"
+                yield "  return [list $H $H $H $dH $dH $dH]\n"
+            yield "}\n\n"
 
-            mif += "# TransformZeeman\n"
-            mif += f"Specify Oxs_TransformZeeman:{term.name} {{\n"
+            yield "# TransformZeeman\n"
+            yield f"Specify {cls}:{term.name} {{\n"
             if isinstance(term.tlist[0], list):
-                mif += "  type general\n"
+                yield "  type general\n"
             else:
-                mif += "  type diagonal\n"
-            mif += "  script_args total_time\n"
-            mif += f"  script TimeFunction:{term.name}\n"
-            mif += f"  field {Hname}\n"
-            mif += "}\n\n"
+                yield "  type diagonal\n"
+            yield "  script_args total_time\n"
+            yield f"  script TimeFunction:{term.name}\n"
+            yield f"  field {Hname}\n"
+            yield "}\n\n"
         else:
-            mif += f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
-            mif += f"  set tstep {term.dt}\n"
-            mif += "  set index [expr round($total_time/$tstep)]\n"
-            mif += f"  set H_t_fac {{ {' '.join(map(str, term.tlist))} }}\n"
-            mif += f"  set dH_t_fac {{ {' '.join(map(str, term.dtlist))} }}\n"
-            mif += "  set H_fac [lindex $H_t_fac $index]\n"
-            mif += "  set dH_fac [lindex $dH_t_fac $index]\n"
-            mif += f"  set Hx [expr {{ {term.H[0]}*$H_fac }}]\n"
-            mif += f"  set Hy [expr {{ {term.H[1]}*$H_fac }}]\n"
-            mif += f"  set Hz [expr {{ {term.H[2]}*$H_fac }}]\n"
-            mif += f"  set dHx [expr {{ {term.H[0]}*$dH_fac }}]\n"
-            mif += f"  set dHy [expr {{ {term.H[1]}*$dH_fac }}]\n"
-            mif += f"  set dHz [expr {{ {term.H[2]}*$dH_fac }}]\n"
-            mif += "  return [list $Hx $Hy $Hz $dHx $dHy $dHz]\n"
-            mif += "}\n\n"
-
-            mif += "# ScriptUZeeman\n"
-            mif += f"Specify Oxs_ScriptUZeeman:{term.name} {{\n"
-            mif += "  script_args total_time\n"
-            mif += f"  script TimeFunction:{term.name}\n"
-            mif += "}\n\n"
+            yield f"proc TimeFunction:{term.name} {{ total_time }} {{\n"
+            yield f"  set tstep {term.dt}\n"
+            yield "  set index [expr round($total_time/$tstep)]\n"
+            yield f"  set H_t_fac {{ {' '.join(map(str, term.tlist))} }}\n"
+            yield f"  set dH_t_fac {{ {' '.join(map(str, term.dtlist))} }}\n"
+            yield "  set H_fac [lindex $H_t_fac $index]\n"
+            yield "  set dH_fac [lindex $dH_t_fac $index]\n"
+            yield f"  set Hx [expr {{ {term.H[0]}*$H_fac }}]\n"
+            yield f"  set Hy [expr {{ {term.H[1]}*$H_fac }}]\n"
+            yield f"  set Hz [expr {{ {term.H[2]}*$H_fac }}]\n"
+            yield f"  set dHx [expr {{ {term.H[0]}*$dH_fac }}]\n"
+            yield f"  set dHy [expr {{ {term.H[1]}*$dH_fac }}]\n"
+            yield f"  set dHz [expr {{ {term.H[2]}*$dH_fac }}]\n"
+            yield "  return [list $Hx $Hy $Hz $dHx $dHy $dHz]\n"
+            yield "}\n\n"
+
+            yield "# ScriptUZeeman\n"
+            yield f"Specify {cls}:{term.name} {{\n"
+            yield "  script_args total_time\n"
+            yield f"  script TimeFunction:{term.name}\n"
+            yield "}\n\n"
     elif isinstance(term.tcl_strings, dict):
-        mif += term.tcl_strings["script"]
-        mif += f"\n# {term.tcl_strings['energy'][4:]}\n"  # 3.9 removeprefix
-        mif += f"Specify {term.tcl_strings['energy']}:{term.name} {{\n"
-        mif += f"  script {term.tcl_strings['script_name']}\n"
+        yield term.tcl_strings["script"]
+        yield f"\n# {term.tcl_strings['energy'][4:]}\n"  # 3.9 removeprefix
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  script {term.tcl_strings['script_name']}\n"
         for key in ["type", "script_args"]:
             with contextlib.suppress(KeyError):
-                mif += f"  {key} {term.tcl_strings[key]}\n"
-        if term.tcl_strings["energy"] == "Oxs_TransformZeeman":
-            mif += f"  field {Hname}\n"
-        mif += "}\n\n"
+                yield f"  {key} {term.tcl_strings[key]}\n"
+        if cls == "Oxs_TransformZeeman":
+            yield f"  field {Hname}\n"
+        yield "}\n\n"
     else:
-        mif += "# FixedZeeman\n"
-        mif += f"Specify Oxs_FixedZeeman:{term.name} {{\n"
-        mif += f"  field {Hname}\n"
-        mif += "}\n\n"
-
-    return mif
+        yield "# FixedZeeman\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  field {Hname}\n"
+        yield "}\n\n"
 
 
+@mif_script
 def demag_script(term, system):
-    mif = "# Demag\n"
-    if system.m.mesh.bc in ("neumann", "dirichlet", ""):  # no PBC
-        oxs_cls = "Oxs_Demag"
-    else:  # PBC
-        if len(system.m.mesh.bc) == 1:
-            oxs_cls = "Oxs_Demag"
-        elif len(system.m.mesh.bc) >= 2:
-            msg = (
-                "Demagnetisation energy term with periodic boundary "
-                "conditions in three directions is not supported."
-            )
-            raise ValueError(msg)
-
-    mif += f"Specify {oxs_cls}:{term.name} {{\n"
+    yield "# Demag\n"
+    if system.m.mesh.bc not in ("neumann", "dirichlet", "") and (
+        len(system.m.mesh.bc) >= 2
+    ):
+        msg = (
+            "Demagnetisation energy term with periodic boundary "
+            "conditions in three directions is not supported."
+        )
+        raise ValueError(msg)
+
+    yield f"Specify {oxs_class(term)}:{term.name} {{\n"
     if hasattr(term, "asymptotic_radius"):
-        mif += f"  asymptotic_radius {term.asymptotic_radius}\n"
-    mif += "}\n\n"
-
-    return mif
+        yield f"  asymptotic_radius {term.asymptotic_radius}\n"
+    yield "}\n\n"
 
 
+@mif_script
 def dmi_script(term, system):
-    if term.crystalclass in ["T", "O"]:
-        oxs = "Oxs_DMI_T"
-    elif (tcc := term.crystalclass) in ["D2d_x", "D2d_y", "D2d_z", "D2d"]:
-        if tcc == "D2d":
-            warnings.warn(
-                "Use of `D2d` is deprecated; use `D2d_z` instead.",
-                FutureWarning,
-                stacklevel=2,
-            )
-            tcc = "D2d_z"
-        oxs = f"Oxs_DMI_{tcc}"
-    elif (tcc := term.crystalclass) in ["Cnv_x", "Cnv_y", "Cnv_z", "Cnv"]:
-        if tcc == "Cnv":
-            msg = "Use of `Cnv` is deprecated; use `Cnv_z` instead."
-            warnings.warn(msg, FutureWarning, stacklevel=2)
-            tcc = "Cnv_z"
-        oxs = f"Oxs_DMI_{tcc}"
-
-    mif = f"# DMI of crystallographic class {term.crystalclass}\n"
-    mif += f"Specify {oxs}:{term.name} {{\n"
+    if term.crystalclass == "D2d":
+        warnings.warn(
+            "Use of `D2d` is deprecated; use `D2d_z` instead.",
+            FutureWarning,
+            stacklevel=2,
+        )
+    elif term.crystalclass == "Cnv":
+        msg = "Use of `Cnv` is deprecated; use `Cnv_z` instead."
+        warnings.warn(msg, FutureWarning, stacklevel=2)
+
+    yield f"# DMI of crystallographic class {term.crystalclass}\n"
+    yield f"Specify {oxs_class(term)}:{term.name} {{\n"
 
     if isinstance(term.D, numbers.Real):
-        mif += f"  default_D {term.D}\n"
-        mif += "  atlas :main_atlas\n"
-        mif += "  D {\n"
+        yield f"  default_D {term.D}\n"
+        yield "  atlas :main_atlas\n"
+        yield "  D {\n"
         if len(system.m.mesh.subregions) == 0:
-            mif += f"    main main {term.D}\n"
+            yield f"    main main {term.D}\n"
         else:
-            mif += f"    entire entire {term.D}\n"
-        mif += "  }\n"
-        mif += "}\n\n"
+            yield f"    entire entire {term.D}\n"
+        yield "  }\n"
+        yield "}\n\n"
 
     elif isinstance(term.D, dict):
         default_value = term.D.get("default", 0)
-        mif += f"  default_D {default_value}\n"
-        mif += "  atlas :main_atlas\n"
-        mif += "  D {\n"
+        yield f"  default_D {default_value}\n"
+        yield "  atlas :main_atlas\n"
+        yield "  D {\n"
         for key, value in term.D.items():
             if key != "default":
                 if ":" in key:
                     region1, region2 = key.split(":")
                 else:
                     region1, region2 = key, key
-                mif += f"    {region1} {region2} {value}\n"
-        mif += "  }\n"
-        mif += "}\n\n"
-
-    return mif
+                yield f"    {region1} {region2} {value}\n"
+        yield "  }\n"
+        yield "}\n\n"
 
 
+@mif_script
 def uniaxialanisotropy_script(term, system):
+    cls = oxs_class(term)
     umif, uname = oc.scripts.setup_vector_parameter(term.u, f"{term.name}_u")
 
     # Determine if higher-order anisotropy is defined
@@ -315,52 +426,49 @@ def uniaxialanisotropy_script(term, system):
         k1mif, k1name = oc.scripts.setup_scalar_parameter(term.K1, f"{term.name}_K1")
         k2mif, k2name = oc.scripts.setup_scalar_parameter(term.K2, f"{term.name}_K2")
 
-        mif = ""
-        mif += k1mif
-        mif += k2mif
-        mif += umif
-        mif += "# UniaxialAnisotropy\n"
-        mif += f"Specify Southampton_UniaxialAnisotropy4:{term.name} {{\n"
-        mif += f"  K1 {k1name}\n"
-        mif += f"  K2 {k2name}\n"
-        mif += f"  axis {uname}\n"
-        mif += "}\n\n"
+        yield k1mif
+        yield k2mif
+        yield umif
+        yield "# UniaxialAnisotropy\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  K1 {k1name}\n"
+        yield f"  K2 {k2name}\n"
+        yield f"  axis {uname}\n"
+        yield "}\n\n"
 
     else:
         kmif, kname = oc.scripts.setup_scalar_parameter(term.K, f"{term.name}_K")
 
-        mif = ""
-        mif += kmif
-        mif += umif
-        mif += "# UniaxialAnisotropy\n"
-        mif += f"Specify Oxs_UniaxialAnisotropy:{term.name} {{\n"
-        mif += f"  K1 {kname}\n"
-        mif += f"  axis {uname}\n"
-        mif += "}\n\n"
-
-    return mif
+        yield kmif
+        yield umif
+        yield "# UniaxialAnisotropy\n"
+        yield f"Specify {cls}:{term.name} {{\n"
+        yield f"  K1 {kname}\n"
+        yield f"  axis {uname}\n"
+        yield "}\n\n"
 
 
+@mif_script
 def cubicanisotropy_script(term, system):
+    cls = oxs_class(term)
     kmif, kname = oc.scripts.setup_scalar_parameter(term.K, f"{term.name}_K")
     u1mif, u1name = oc.scripts.setup_vector_parameter(term.u1, f"{term.name}_u1")
     u2mif, u2name = oc.scripts.setup_vector_parameter(term.u2, f"{term.name}_u2")
 
-    mif = ""
-    mif += kmif
-    mif += u1mif
-    mif += u2mif
-    mif += "# CubicAnisotropy\n"
-    mif += f"Specify Oxs_CubicAnisotropy:{term.name} {{\n"
-    mif += f"  K1 {kname}\n"
-    mif += f"  axis1 {u1name}\n"
-    mif += f"  axis2 {u2name}\n"
-    mif += "}\n\n"
-
-    return mif
+    yield kmif
+    yield u1mif
+    yield u2mif
+    yield "# CubicAnisotropy\n"
+    yield f"Specify {cls}:{term.name} {{\n"
+    yield f"  K1 {kname}\n"
+    yield f"  axis1 {u1name}\n"
+    yield f"  axis2 {u2name}\n"
+    yield "}\n\n"
 
 
+@mif_script
 def magnetoelastic_script(term, system):
+    cls = oxs_class(term)
     B1mif, B1name = oc.scripts.setup_scalar_parameter(term.B1, f"{term.name}_B1")
     B2mif, B2name = oc.scripts.setup_scalar_parameter(term.B2, f"{term.name}_B2")
     ediagmif, ediagname = oc.scripts.setup_vector_parameter(
@@ -370,23 +478,22 @@ def magnetoelastic_script(term, system):
         term.e_offdiag, f"{term.name}_eoffdiag"
     )
 
-    mif = ""
-    mif += B1mif
-    mif += B2mif
-    mif += ediagmif
-    mif += eoffdiagmif
-    mif += "# MagnetoElastic\n"
-    mif += f"Specify YY_FixedMEL:{term.name} {{\n"
-    mif += f"  B1 {B1name}\n"
-    mif += f"  B2 {B2name}\n"
-    mif += f"  e_diag_field {ediagname}\n"
-    mif += f"  e_offdiag_field {eoffdiagname}\n"
-    mif += "}\n\n"
-
-    return mif
+    yield B1mif
+    yield B2mif
+    yield ediagmif
+    yield eoffdiagmif
+    yield "# MagnetoElastic\n"
+    yield f"Specify {cls}:{term.name} {{\n"
+    yield f"  B1 {B1name}\n"
+    yield f"  B2 {B2name}\n"
+    yield f"  e_diag_field {ediagname}\n"
+    yield f"  e_offdiag_field {eoffdiagname}\n"
+    yield "}\n\n"
 
 
+@mif_script
 def rkky_script(term, system):
+    cls = oxs_class(term)
     sr1 = system.m.mesh.subregions[term.subregions[0]]
     sr2 = system.m.mesh.subregions[term.subregions[1]]
 
@@ -398,42 +505,38 @@ def rkky_script(term, system):
         elif value == second:
             second_name = key
 
-    mif = ""
-
-    mif += "# Scalar field for RKKY surfaces\n"
-    mif += "Specify Oxs_LinearScalarField:rkkyfield {\n"
+    yield "# Scalar field for RKKY surfaces\n"
+    yield "Specify Oxs_LinearScalarField:rkkyfield {\n"
     vectorval = df.util.assemble_index(
         0, 3, {system.m.mesh.region._dim2index(direction): 1}
     )
-    mif += "  vector {{{} {} {}}}\n".format(*vectorval)
-    mif += "  norm 1.0\n"
-    mif += "}\n\n"
+    yield "  vector {{{} {} {}}}\n".format(*vectorval)
+    yield "  norm 1.0\n"
+    yield "}\n\n"
 
-    mif += "# TwoSurfaceExchange\n"
-    mif += f"Specify Oxs_TwoSurfaceExchange:{term.name} {{\n"
+    yield "# TwoSurfaceExchange\n"
+    yield f"Specify {cls}:{term.name} {{\n"
     if isinstance(term.sigma, numbers.Real):
-        mif += f"  sigma {term.sigma}\n"
+        yield f"  sigma {term.sigma}\n"
     if isinstance(term.sigma2, numbers.Real):
-        mif += f"  sigma2 {term.sigma2}\n"
-
-    mif += "  surface1 {\n"
-    mif += "    atlas :main_atlas\n"
-    mif += f"    region {first_name}\n"
-    mif += "    scalarfield :rkkyfield\n"
-    mif += f"    scalarvalue {first.pmax[system.m.mesh.region._dim2index(direction)]}\n"
-    mif += "    scalarside -\n"
-    mif += "  }\n"
-
-    mif += "  surface2 {\n"
-    mif += "    atlas :main_atlas\n"
-    mif += f"    region {second_name}\n"
-    mif += "    scalarfield :rkkyfield\n"
-    mif += (
+        yield f"  sigma2 {term.sigma2}\n"
+
+    yield "  surface1 {\n"
+    yield "    atlas :main_atlas\n"
+    yield f"    region {first_name}\n"
+    yield "    scalarfield :rkkyfield\n"
+    yield f"    scalarvalue {first.pmax[system.m.mesh.region._dim2index(direction)]}\n"
+    yield "    scalarside -\n"
+    yield "  }\n"
+
+    yield "  surface2 {\n"
+    yield "    atlas :main_atlas\n"
+    yield f"    region {second_name}\n"
+    yield "    scalarfield :rkkyfield\n"
+    yield (
         f"    scalarvalue {second.pmin[system.m.mesh.region._dim2index(direction)]}\n"
     )
-    mif += "    scalarside +\n"
-    mif += "  }\n"
-
-    mif += "}\n\n"
+    yield "    scalarside +\n"
+    yield "  }\n"
 
-    return mif
+    yield "}\n\n"
@@ -1,7 +1,9 @@
 import oommfc as oc
+from .util import mif_script
 
 
-def system_script(system, ovf_format, **kwargs):
+@mif_script
+def system_script(system, ovf_format, m0_source=None, **kwargs):
     if ovf_format == "bin8":
         output_format = "binary 8"
     elif ovf_format == "bin4":
@@ -10,21 +12,19 @@ def system_script(system, ovf_format, **kwargs):
         output_format = "text %#.15g"
     else:
         raise ValueError(f"Invalid {ovf_format=}.")
-    mif = "# MIF 2.2\n\n"
+    yield "# MIF 2.2\n\n"
     # Output options
-    mif += "SetOptions {\n"
-    mif += f"  basename {system.name}\n"
-    mif += "  scalar_output_format %.12g\n"
-    mif += f"  scalar_field_output_format {{{output_format}}}\n"
-    mif += f"  vector_field_output_format {{{output_format}}}\n"
-    mif += "}\n\n"
+    yield "SetOptions {\n"
+    yield f"  basename {system.name}\n"
+    yield "  scalar_output_format %.12g\n"
+    yield f"  scalar_field_output_format {{{output_format}}}\n"
+    yield f"  vector_field_output_format {{{output_format}}}\n"
+    yield "}\n\n"
 
     # Mesh and energy scripts.
-    mif += oc.scripts.mesh_script(system.m.mesh)
-    mif += oc.scripts.energy_script(system)
+    yield from oc.scripts.mesh_script.iter(system.m.mesh)
+    yield from oc.scripts.energy_script.iter(system)
 
     # Magnetisation script.
-    m0mif, _, _ = oc.scripts.setup_m0(system.m, "m0")
-    mif += m0mif
-
-    return mif
+    m0mif, _, _ = oc.scripts.setup_m0(system.m, "m0", source=m0_source)
+    yield m0mif
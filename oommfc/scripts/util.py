@@ -1,53 +1,99 @@
+import functools
 import numbers
+import os
+import pathlib
+import shutil
 
 import discretisedfield as df
 import numpy as np
 
+import oommfc as oc
 
-def box_atlas(pmin, pmax, name):
-    mif = f"# BoxAtlas for {name}_atlas\n"
-    mif += f"Specify Oxs_BoxAtlas:{name}_atlas {{\n"
-    mif += f"  xrange {{ {pmin[0]} {pmax[0]} }}\n"
-    mif += f"  yrange {{ {pmin[1]} {pmax[1]} }}\n"
-    mif += f"  zrange {{ {pmin[2]} {pmax[2]} }}\n"
-    mif += f"  name {name}\n"
-    mif += "}\n\n"
 
-    return mif
+def mif_script(func):
+    """Decorate a generator of MIF chunks.
+
+    Calling the decorated function returns the whole MIF script as a string. The
+    undecorated generator is available as ``func.iter`` and is used to compose
+    scripts and to stream them into a file chunk by chunk, without building
+    intermediate strings.
+
+    Examples
+    --------
+    1. Defining a MIF script.
+
+    >>> import oommfc as oc
+    ...
+    >>> @oc.scripts.mif_script
+    ... def comment_script(lines):
+    ...     for line in lines:
+    ...         yield f"# {line}\\n"
+    >>> comment_script(["a", "b"])
+    '# a\\n# b\\n'
+    >>> list(comment_script.iter(["a", "b"]))
+    ['# a\\n', '# b\\n']
+
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return "".join(func(*args, **kwargs))
+
+    wrapper.iter = func
+    return wrapper
+
+
+@mif_script
+def box_atlas(pmin, pmax, name):
+    yield f"# BoxAtlas for {name}_atlas\n"
+    yield f"Specify Oxs_BoxAtlas:{name}_atlas {{\n"
+    yield f"  xrange {{ {pmin[0]} {pmax[0]} }}\n"
+    yield f"  yrange {{ {pmin[1]} {pmax[1]} }}\n"
+    yield f"  zrange {{ {pmin[2]} {pmax[2]} }}\n"
+    yield f"  name {name}\n"
+    yield "}\n\n"
 
 
+@mif_script
 def atlas_vector_field(value, name, atlas="main_atlas"):
-    mif = f"# {name}\n"
-    mif += f"Specify Oxs_AtlasVectorField:{name} {{\n"
-    mif += f"  atlas :{atlas}\n"
-    mif += "  default_value {{{} {} {}}}\n".format(*value["default"])
-    mif += "  values {\n"
+    yield f"# {name}\n"
+    yield f"Specify Oxs_AtlasVectorField:{name} {{\n"
+    yield f"  atlas :{atlas}\n"
+    yield "  default_value {{{} {} {}}}\n".format(*value["default"])
+    yield "  values {\n"
     for region, val in value.items():
         if region != "default":
-            mif += "    {} {{{} {} {}}}\n".format(region, *val)
-    mif += "  }"
-    mif += "}\n\n"
-
-    return mif
+            yield "    {} {{{} {} {}}}\n".format(region, *val)
+    yield "  }\n"
+    yield "}\n\n"
 
 
+@mif_script
 def atlas_scalar_field(value, name, atlas="main_atlas"):
-    mif = f"# {name}\n"
-    mif += f"Specify Oxs_AtlasScalarField:{name} {{\n"
-    mif += f"  atlas :{atlas}\n"
-    mif += "  default_value {}\n".format(value["default"])
-    mif += "  values {\n"
+    yield f"# {name}\n"
+    yield f"Specify Oxs_AtlasScalarField:{name} {{\n"
+    yield f"  atlas :{atlas}\n"
+    yield "  default_value {}\n".format(value["default"])
+    yield "  values {\n"
     for region, val in value.items():
         if region != "default":
-            mif += f"    {region} {val}\n"
-    mif += "  }"
-    mif += "}\n\n"
-
-    return mif
-
-
-def setup_m0(field, name):
-    field.to_file(f"{name}.omf")
+            yield f"    {region} {val}\n"
+    yield "  }\n"
+    yield "}\n\n"
+
+
+def setup_m0(field, name, source=None):
+    with oc.runstats.phase("write_fields"):
+        if source is None:
+            field.to_file(f"{name}.omf")
+        else:
+            # OVF file containing the values of ``field`` (e.g. the output of the
+            # previous drive), linked instead of encoding the field again.
+            pathlib.Path(f"{name}.omf").unlink(missing_ok=True)
+            try:
+                os.link(source, f"{name}.omf")
+            except OSError:  # e.g. file systems without hard links
+                shutil.copyfile(source, f"{name}.omf")
     # Magnetisation
     mif = file_vector_field(f"{name}.omf", f"{name}", "main_atlas")
     # Ms
@@ -56,28 +102,27 @@ def setup_m0(field, name):
     return mif, f"{name}", f"{name}_norm"
 
 
+@mif_script
 def file_vector_field(filename, name, atlas):
-    mif = f"# {name} file\n"
-    mif += f"Specify Oxs_FileVectorField:{name} {{\n"
-    mif += f"  file {filename}\n"
-    mif += f"  atlas :{atlas}\n"
-    mif += "}\n\n"
-
-    return mif
+    yield f"# {name} file\n"
+    yield f"Specify Oxs_FileVectorField:{name} {{\n"
+    yield f"  file {filename}\n"
+    yield f"  atlas :{atlas}\n"
+    yield "}\n\n"
 
 
+@mif_script
 def vector_norm_scalar_field(field, name):
-    mif = f"# {name}\n"
-    mif += f"Specify Oxs_VecMagScalarField:{name} {{\n"
-    mif += f"    field :{field}\n"
-    mif += "}\n\n"
-
-    return mif
+    yield f"# {name}\n"
+    yield f"Specify Oxs_VecMagScalarField:{name} {{\n"
+    yield f"    field :{field}\n"
+    yield "}\n\n"
 
 
 def setup_scalar_parameter(parameter, name):
     if isinstance(parameter, df.Field):
-        parameter.to_file(f"{name}.ovf", extend_scalar=True)
+        with oc.runstats.phase("write_fields"):
+            parameter.to_file(f"{name}.ovf", extend_scalar=True)
         mif = file_vector_field(f"{name}.ovf", f"{name}", "main_atlas")
         mif += vector_norm_scalar_field(f"{name}", f"{name}_norm")
         return mif, f"{name}_norm"
@@ -97,7 +142,8 @@ def setup_scalar_parameter(parameter, name):
 
 def setup_vector_parameter(parameter, name):
     if isinstance(parameter, df.Field):
-        parameter.to_file(f"{name}.ovf")
+        with oc.runstats.phase("write_fields"):
+            parameter.to_file(f"{name}.ovf")
         mif = file_vector_field(f"{name}.ovf", f"{name}", "main_atlas")
         return mif, f"{name}"
 
@@ -0,0 +1,531 @@
+import datetime
+import filecmp
+import hashlib
+import itertools
+import json
+import numbers
+import os
+import pathlib
+import re
+import shutil
+
+import oommfc as oc
+
+# ``import oommfc`` imports this module, so that ``oommfc.sweep`` is the function.
+# Heavy dependencies are therefore only imported in the functions using them.
+
+
+class SweepResult:
+    """Results of a parameter sweep.
+
+    Parameters
+    ----------
+    params : pandas.DataFrame
+
+        Parameters of the individual points; one row per point.
+
+    systems : list
+
+        Driven systems (``micromagneticmodel.System``) in the order of ``params``.
+
+    """
+
+    def __init__(self, params, systems):
+        self.params = params
+        self.systems = systems
+
+    @property
+    def m(self):
+        """Final magnetisation arrays of all points.
+
+        Returns
+        -------
+        numpy.ndarray, list
+
+            Array with shape ``(n_points, *mesh.n, 3)`` if all points share the
+            same mesh, otherwise a list of arrays.
+
+        """
+        import numpy as np
+
+        arrays = [system.m.array for system in self.systems]
+        if len({array.shape for array in arrays}) == 1:
+            return np.stack(arrays)
+        return arrays
+
+    @property
+    def table(self):
+        """Data tables of all points in one ``pandas.DataFrame``.
+
+        Each row is extended with the index of the point (column ``point``) and the
+        swept parameters.
+
+        """
+        import pandas as pd
+
+        frames = []
+        for index, (point, system) in enumerate(
+            zip(self.params.to_dict("records"), self.systems)
+        ):
+            data = system.table.data.copy()
+            data.insert(0, "point", index)
+            for i, (key, value) in enumerate(point.items()):
+                data.insert(i + 1, key, [value] * len(data))
+            frames.append(data)
+        return pd.concat(frames, ignore_index=True)
+
+    def __len__(self):
+        return len(self.systems)
+
+    def __repr__(self):
+        return f"SweepResult(n_points={len(self)}, params={list(self.params.columns)})"
+
+
+def sweep(
+    system_factory,
+    driver,
+    params,
+    /,
+    dirname=".",
+    name="sweep",
+    max_workers=None,
+    n_threads_per_job=1,
+    runner=None,
+    ovf_format="bin8",
+    verbose=1,
+    template=False,
+    **kwargs,
+):
+    """Drive a system for every point of a parameter grid.
+
+    For every point ``system_factory(**point)`` creates a new system that is driven
+    with ``driver``. All input files are written up front (using
+    ``Driver.write_mif``) to ``dirname/name/point-<index>``, before the OOMMF runs
+    are distributed over ``max_workers`` concurrent workers. OOMMF runs in separate
+    processes, so each worker only dispatches and waits for its OOMMF process.
+
+    The points and their state are recorded in ``dirname/name/sweep.json`` and in
+    the ``info.json`` file of every point, together with a hash of the input files
+    and driver arguments of the point. Calling ``sweep`` again with the same
+    arguments resumes an interrupted (or partially failed) sweep: points that were
+    successfully driven are read from disk and only the remaining points are run.
+    Points whose input files or driver arguments have changed since they were
+    driven (e.g. because of a different ``system_factory`` or ``kwargs``) are run
+    again.
+
+    With ``template=True`` the MIF file and all input files are written only once,
+    to ``dirname/name/template``. Swept values become MIF ``Parameter``
+    declarations, which are set for every point with ``boxsi -parameters``. The
+    point directories only contain links to the template files. This requires
+    that every parameter is a number (or a sequence of numbers) that
+    ``system_factory`` passes unchanged to scalar or vector values of energy
+    terms or dynamics terms (e.g. ``H``, ``A``, ``K``, or ``alpha``). The template
+    is checked against the complete input files of the first point.
+
+    Parameters
+    ----------
+    system_factory : callable
+
+        Function returning a ``micromagneticmodel.System`` for the parameters of one
+        point, passed as keyword arguments.
+
+    driver : oommfc.Driver
+
+        Driver used to drive every system.
+
+    params : dict, list
+
+        Either a dictionary mapping parameter names to sequences of values, in which
+        case all combinations of values (the Cartesian product) are used, or a list
+        of dictionaries with the parameters of the individual points.
+
+    dirname : str, optional
+
+        Name of a base directory in which the sweep is stored. If not specified the
+        current working directory is used.
+
+    name : str, optional
+
+        Name of the sweep directory. Defaults to ``'sweep'``.
+
+    max_workers : int, optional
+
+        Maximum number of concurrent OOMMF runs. If not specified, as many runs are
+        started as fit on the CPUs available to the process
+        (``oommfc.autotune.available_cpus()``) with ``n_threads_per_job`` threads
+        each. ``sweep`` only sizes the number of workers; the runs are pinned to
+        disjoint sets of CPUs by native runners if ``oommfc.runner.pin_cpus`` is
+        ``True``, otherwise their placement is left to the operating system.
+
+    n_threads_per_job : int, optional
+
+        Number of threads used by every OOMMF run. Defaults to ``1``.
+
+    runner : oommfc.oommf.OOMMFRunner, optional
+
+        OOMMF Runner which is going to be used for running the calculations. If
+        ``None``, the default runner is used. Defaults to ``None``.
+
+    ovf_format : str
+
+        Format of the magnetisation output files written by OOMMF. Can be
+        one of ``'bin8'`` (binary, double precision), ``'bin4'`` (binary,
+        single precision) or ``'txt'`` (text-based, double precision).
+        Defaults to ``'bin8'``.
+
+    verbose : int, optional
+
+        If ``verbose=0``, no output is printed. For ``verbose>=1`` one line is
+        printed for every point. Defaults to ``1``.
+
+    template : bool, optional
+
+        If ``True``, all points are run with one MIF file, in which the swept
+        values are MIF parameters. Defaults to ``False``.
+
+    kwargs
+
+        Additional keyword arguments passed to the driver, e.g. ``t`` and ``n`` for
+        ``TimeDriver``.
+
+    Returns
+    -------
+    oommfc.sweep.SweepResult
+
+        Driven systems, their final magnetisation and data tables.
+
+    Raises
+    ------
+    ValueError
+
+        If the sweep directory contains a sweep with different points or if the
+        parameters cannot be used in a template.
+
+    RuntimeError
+
+        If OOMMF failed for any of the points. All other points are completed
+        before the error is raised.
+
+    Examples
+    --------
+    1. Relaxing a macrospin in different external fields.
+
+    >>> import micromagneticmodel as mm
+    >>> import oommfc as oc
+    ...
+    >>> def system_factory(Hz):
+    ...     system = mm.examples.macrospin()
+    ...     system.energy.zeeman.H = (0, 0, Hz)
+    ...     return system
+    >>> result = oc.sweep(
+    ...     system_factory, oc.MinDriver(), {"Hz": [1e5, 2e5]}, verbose=0
+    ... )
+    >>> result.m.shape
+    (2, 1, 1, 1, 3)
+
+    """
+    import concurrent.futures
+
+    import pandas as pd
+    import ubermagutil as uu
+
+    driver.drive_kwargs_setup(kwargs)
+    if kwargs["stream"] or kwargs["callback"] is not None:
+        raise ValueError("sweep does not support stream and callback.")
+    points = _points(params)
+    if max_workers is None:
+        max_workers = _default_max_workers(n_threads_per_job)
+
+    sweepdir = pathlib.Path(dirname, name).absolute()
+    sweepdir.mkdir(parents=True, exist_ok=True)
+    manifest = {"driver": driver.__class__.__name__, "points": points}
+    if template:
+        manifest["template"] = True
+    manifest_file = sweepdir / "sweep.json"
+    if manifest_file.exists():
+        with open(manifest_file, encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing != manifest:
+            msg = (
+                f"Directory {sweepdir} contains a different sweep. Use a different"
+                " name or dirname."
+            )
+            raise ValueError(msg)
+    else:
+        with open(manifest_file, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    kwargs["n_threads"] = n_threads_per_job
+
+    systems = [system_factory(**point) for point in points]
+    for system in systems:
+        driver._check_system(system)
+    if template:
+        if any(system.name != systems[0].name for system in systems):
+            raise ValueError("All systems of a template sweep must have the same name.")
+        templatedir = sweepdir / "template"
+        _write_template(
+            driver, system_factory, points, templatedir, ovf_format, **kwargs
+        )
+        template_hash = _input_hash(driver, systems[0], templatedir, kwargs)
+
+    # Write all input files up front. The input files of a point are written to
+    # a separate directory first, so that a completed point whose inputs have not
+    # changed is left untouched.
+    pending = []
+    for index, (point, system) in enumerate(zip(points, systems)):
+        workingdir = sweepdir / f"point-{index}"
+        if template:
+            inputdir = None
+            digest = hashlib.sha256(
+                f"{template_hash} {_parameters(point)}".encode()
+            ).hexdigest()
+        else:
+            inputdir = sweepdir / f".point-{index}"
+            shutil.rmtree(inputdir, ignore_errors=True)
+            inputdir.mkdir()
+            with uu.changedir(inputdir):
+                driver._write_input_files(
+                    system=system, ovf_format=ovf_format, **kwargs
+                )
+            digest = _input_hash(driver, system, inputdir, kwargs)
+        if _completed(workingdir, digest):
+            if inputdir is not None:
+                shutil.rmtree(inputdir)
+            continue
+
+        # Remove output of an interrupted, failed, or outdated run.
+        shutil.rmtree(workingdir, ignore_errors=True)
+        start_time = datetime.datetime.now()
+        if template:
+            workingdir.mkdir()
+            for filename in templatedir.iterdir():
+                _link(filename, workingdir / filename.name)
+        else:
+            os.replace(inputdir, workingdir)
+        with uu.changedir(workingdir):
+            driver._write_info_json(system, start_time, **point)
+            driver._extend_info_json(input_hash=digest)
+        pending.append((index, workingdir, start_time))
+
+    if runner is None:
+        runner = oc.runner.runner
+
+    failed = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                driver._call,
+                system=systems[index],
+                runner=runner,
+                verbose=0,
+                workingdir=workingdir,
+                parameters=_parameters(points[index]) if template else None,
+                **kwargs,
+            ): (index, workingdir, start_time)
+            for index, workingdir, start_time in pending
+        }
+        for future in concurrent.futures.as_completed(futures):
+            index, workingdir, start_time = futures[future]
+            success = future.exception() is None
+            with uu.changedir(workingdir):
+                driver._update_info_json(start_time, datetime.datetime.now(), success)
+            if not success:
+                failed.append((index, future.exception()))
+            if verbose >= 1:
+                print(
+                    f"Point {index} ({points[index]}):"
+                    f" {'done' if success else 'failed'}."
+                )
+
+    if failed:
+        msg = f"OOMMF failed for {len(failed)} of {len(points)} points.\n"
+        msg += "\n".join(f"point-{index}: {error}" for index, error in failed)
+        raise RuntimeError(msg)
+
+    for index, system in enumerate(systems):
+        with uu.changedir(sweepdir / f"point-{index}"):
+            driver._read_data(system, read_mode=kwargs["read_mode"])
+        system.drive_number += 1
+
+    return SweepResult(pd.DataFrame(points), systems)
+
+
+def _default_max_workers(n_threads_per_job):
+    # The CPU affinity and cgroup quota (e.g. in containers or SLURM jobs) of the
+    # process limit the CPUs that can be used without oversubscription.
+    return max(1, oc.autotune.available_cpus() // n_threads_per_job)
+
+
+def _points(params):
+    if isinstance(params, dict):
+        keys = list(params)
+        points = [
+            dict(zip(keys, values))
+            for values in itertools.product(*(params[key] for key in keys))
+        ]
+    else:
+        points = [dict(point) for point in params]
+    if not points:
+        raise ValueError("Cannot sweep over an empty set of parameters.")
+    # Round trip through json to compare points with the stored sweep.
+    return json.loads(json.dumps(points, default=_to_json))
+
+
+def _to_json(value):
+    import numpy as np
+
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Cannot store parameter value {value!r}.")
+
+
+def _completed(workingdir, digest):
+    """Check if a point has been driven successfully with inputs ``digest``."""
+    try:
+        with open(workingdir / "info.json", encoding="utf-8") as f:
+            info = json.load(f)
+    except FileNotFoundError:
+        return False
+    return info.get("success", False) and info.get("input_hash") == digest
+
+
+# Drive arguments which do not change the result of a point.
+_run_options = {
+    "n_threads",
+    "read_mode",
+    "stream",
+    "callback",
+    "checkpoint",
+    "timeout",
+    "stall_timeout",
+}
+
+
+def _input_hash(driver, system, workingdir, kwargs):
+    """Hash of the input files of a point and of the driver arguments."""
+    options = {key: value for key, value in kwargs.items() if key not in _run_options}
+    digest = hashlib.sha256(
+        oc.cache.input_hash(driver._miffilename(system), workingdir).encode()
+    )
+    digest.update(driver.__class__.__name__.encode())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _names(point):
+    """MIF parameter names and values of a point; vectors are split into components."""
+    names = {}
+    for key, value in point.items():
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", key):
+            raise ValueError(f"Cannot use {key=} as MIF parameter name.")
+        if isinstance(value, numbers.Real):
+            names[key] = value
+        elif isinstance(value, list) and all(
+            isinstance(v, numbers.Real) for v in value
+        ):
+            names.update({f"{key}_{i}": v for i, v in enumerate(value)})
+        else:
+            raise ValueError(f"Cannot use {value=} of {key!r} as MIF parameter.")
+    return names
+
+
+def _parameters(point):
+    return " ".join(f"{name} {value}" for name, value in _names(point).items())
+
+
+def _write_template(driver, system_factory, points, templatedir, ovf_format, **kwargs):
+    """Write MIF and input files in which the swept values are MIF parameters.
+
+    The system is created with a distinct placeholder value for every parameter
+    and the placeholders are replaced with parameters in the MIF file. The
+    template is checked against the input files written for the first point.
+
+    """
+    import ubermagutil as uu
+
+    names = _names(points[0])
+    placeholders = {name: 1.2345e-300 * (i + 1) for i, name in enumerate(names)}
+    placeholder_point = {}
+    for key, value in points[0].items():
+        if isinstance(value, list):
+            value = [placeholders[f"{key}_{i}"] for i in range(len(value))]
+        else:
+            value = placeholders[key]
+        placeholder_point[key] = value
+
+    shutil.rmtree(templatedir, ignore_errors=True)
+    checkdir = templatedir.with_name(f"{templatedir.name}-check")
+    shutil.rmtree(checkdir, ignore_errors=True)
+    for dirname, point in [(templatedir, placeholder_point), (checkdir, points[0])]:
+        dirname.mkdir()
+        system = system_factory(**point)
+        with uu.changedir(dirname):
+            driver._write_input_files(system=system, ovf_format=ovf_format, **kwargs)
+    miffilename = driver._miffilename(system)
+
+    try:
+        for filename in templatedir.iterdir():
+            if filename.name != miffilename and not filecmp.cmp(
+                filename, checkdir / filename.name, shallow=False
+            ):
+                raise ValueError(f"Input file {filename.name} depends on parameters.")
+        mif = (templatedir / miffilename).read_text(encoding="utf-8")
+        expected = mif
+        for name, placeholder in placeholders.items():
+            if str(placeholder) not in mif:
+                raise ValueError(f"Parameter {name!r} cannot be found in the MIF file.")
+            expected = expected.replace(str(placeholder), str(names[name]))
+        if expected != (checkdir / miffilename).read_text(encoding="utf-8"):
+            raise ValueError("The MIF file cannot be written as a template.")
+    finally:
+        shutil.rmtree(checkdir, ignore_errors=True)
+
+    mif = _parametrise(mif, {str(v): name for name, v in placeholders.items()})
+    header, rest = mif.split("\n", 1)
+    declarations = "".join(
+        f"Parameter {name} {value}\n" for name, value in names.items()
+    )
+    mif = f"{header}\n\n{declarations}{rest}"
+    (templatedir / miffilename).write_text(mif, encoding="utf-8")
+
+
+def _parametrise(mif, placeholders):
+    """Replace placeholder values in ``Specify`` blocks with MIF parameters."""
+    lines = []
+    block = None
+    for line in mif.splitlines(keepends=True):
+        if block is not None:
+            block.append(line)
+            if line.rstrip("\n") == "}":
+                lines.extend(_substitute(block, placeholders))
+                block = None
+        elif re.fullmatch(r"Specify \S+ \{\n", line):
+            block = [line]
+        elif any(placeholder in line for placeholder in placeholders):
+            raise ValueError(f"Cannot use parameters outside Specify blocks: {line!r}.")
+        else:
+            lines.append(line)
+    return "".join(lines)
+
+
+def _substitute(block, placeholders):
+    text = "".join(block)
+    if not any(placeholder in text for placeholder in placeholders):
+        return block
+    if any(char in text for char in "$[\\"):
+        raise ValueError(f"Cannot use parameters in {block[0].strip()!r}.")
+    for placeholder, name in placeholders.items():
+        if f"-{placeholder}" in text:
+            raise ValueError(f"Cannot use negated parameter {name!r}.")
+        text = text.replace(placeholder, f"${name}")
+    # Variables are only substituted in Specify blocks wrapped in subst.
+    head, body = text.split("\n", 1)
+    return [f"{head[:-1]}[subst {{\n", f"{body[:-2]}}}]\n"]
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except OSError:  # e.g. file systems without hard links
+        shutil.copy2(source, target)
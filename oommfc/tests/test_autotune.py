@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+import micromagneticmodel as mm
+import pytest
+
+import oommfc as oc
+
+
+@pytest.fixture
+def cache_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def test_available_cpus(tmp_path):
+    assert oc.autotune.available_cpus() >= 1
+
+    assert oc.autotune._cgroup_cpu_quota(root=tmp_path) is None
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert oc.autotune._cgroup_cpu_quota(root=tmp_path) is None
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000\n")
+    assert oc.autotune._cgroup_cpu_quota(root=tmp_path) == 2
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert oc.autotune._cgroup_cpu_quota(root=tmp_path) is None
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert oc.autotune._cgroup_cpu_quota(root=tmp_path) == 1.5
+
+
+def test_scaling(cache_home, monkeypatch):
+    system = mm.examples.macrospin()
+    times = oc.autotune.scaling(system, candidates=[1, 2], trial_time=0.01)
+    assert list(times) == [1, 2]
+    assert all(t > 0 for t in times.values())
+    assert system.drive_number == 0
+
+    with open(cache_home / "oommfc" / "threads.json", encoding="utf-8") as f:
+        (entry,) = json.load(f).values()
+    assert entry["iterations"] >= 10
+    assert entry["times"] == {str(n): t for n, t in times.items()}
+
+    # The cached scaling curve is used for the same mesh size and energy terms.
+    def trial(*args):
+        raise AssertionError("No trials must be run.")
+
+    monkeypatch.setattr(oc.autotune, "_trial", trial)
+    assert oc.autotune.scaling(system, candidates=[2]) == {2: times[2]}
+    assert oc.autotune.optimal_n_threads(system, candidates=[1, 2]) in (1, 2)
+    with pytest.raises(AssertionError):
+        oc.autotune.scaling(system, candidates=[1, 4])
+    with pytest.raises(AssertionError):
+        oc.autotune.scaling(system, candidates=[1, 2], refresh=True)
+    system.energy += mm.Exchange(A=1e-11)
+    with pytest.raises(AssertionError):
+        oc.autotune.scaling(system, candidates=[1, 2])
+
+    with pytest.raises(ValueError):
+        oc.autotune.scaling(system, candidates=[0])
+
+
+@pytest.mark.parametrize(
+    "times, expected",
+    [({1: 1.0, 2: 0.6, 4: 0.5}, 4), ({1: 1.0, 2: 0.97, 4: 1.2}, 1), ({1: 1.0}, 1)],
+)
+def test_optimal_n_threads(monkeypatch, times, expected):
+    monkeypatch.setattr(oc.autotune, "scaling", lambda *args, **kwargs: times)
+    assert oc.autotune.optimal_n_threads(mm.examples.macrospin()) == expected
+
+
+def test_auto(monkeypatch, tmp_path):
+    calls = []
+
+    def optimal_n_threads(system, /, runner=None):
+        calls.append(system)
+        return 1
+
+    monkeypatch.setattr(oc.autotune, "optimal_n_threads", optimal_n_threads)
+    system = mm.examples.macrospin()
+
+    oc.TimeDriver().drive(system, t=1e-12, n=1, n_threads="auto", dirname=tmp_path)
+    with open(tmp_path / system.name / "drive-0" / "info.json") as f:
+        assert json.load(f)["n_threads"] == 1
+
+    asyncio.run(oc.MinDriver().drive_async(system, n_threads="auto", dirname=tmp_path))
+    with open(tmp_path / system.name / "drive-1" / "info.json") as f:
+        assert json.load(f)["n_threads"] == 1
+
+    oc.compute(system.energy.energy, system, n_threads="auto", dirname=tmp_path)
+    oc.compute_many([system.energy.energy], system, n_threads="auto", dirname=tmp_path)
+    oc.compute(system.energy.energy, system, n_threads=2, dirname=tmp_path)
+    assert len(calls) == 4
+
+    # Invalid arguments are rejected before the trial simulations.
+    with pytest.raises(ValueError):
+        oc.MinDriver().drive(system, n_threads="auto", timeout=-1, dirname=tmp_path)
+    with pytest.raises(ValueError):
+        asyncio.run(
+            oc.MinDriver().drive_async(
+                system, n_threads="auto", read_mode="wrong", dirname=tmp_path
+            )
+        )
+    assert len(calls) == 4
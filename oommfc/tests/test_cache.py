@@ -0,0 +1,105 @@
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import oommfc as oc
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = oc.ResultCache(dirname=tmp_path / "cache")
+    oc.runner.cache = cache
+    yield cache
+    oc.runner.cache = None
+
+
+def test_drive(cache, tmp_path, capsys):
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+
+    md.drive(system, dirname=tmp_path)
+    assert cache.stats["hits"] == 0
+    assert cache.stats["misses"] == 1
+    assert cache.stats["entries"] == 1
+    m = system.m.array.copy()
+
+    system = mm.examples.macrospin()
+    capsys.readouterr()
+    md.drive(system, dirname=tmp_path)
+    assert "Loaded OOMMF result from cache." in capsys.readouterr().out
+    assert cache.stats["hits"] == 1
+    assert cache.stats["entries"] == 1
+    assert np.allclose(system.m.array, m)
+    assert len(system.table.data) > 0
+
+    # Different input files must not hit the cache.
+    system = mm.examples.macrospin()
+    system.energy.zeeman.H = (0, 0, 1e5)
+    md.drive(system, dirname=tmp_path)
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+    assert cache.stats["entries"] == 2
+
+
+def test_compute(cache, tmp_path):
+    system = mm.examples.macrospin()
+    energy = oc.compute(system.energy.energy, system, dirname=tmp_path)
+    assert oc.compute(system.energy.energy, system, dirname=tmp_path) == energy
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_key_runner(tmp_path):
+    class Runner:
+        def __init__(self, version):
+            self.version = version
+
+        def __repr__(self):
+            return f"Runner({self.version})"
+
+    cache = oc.ResultCache(dirname=tmp_path / "cache")
+    (tmp_path / "test.mif").write_text("# MIF 2.2")
+    key = cache.key("test.mif", tmp_path)
+    assert cache.key("test.mif", tmp_path, runner=Runner("2.0b0")) != key
+    assert cache.key("test.mif", tmp_path, runner=Runner("2.0b0")) == cache.key(
+        "test.mif", tmp_path, runner=Runner("2.0b0")
+    )
+    assert cache.key("test.mif", tmp_path, runner=Runner("2.0b0")) != cache.key(
+        "test.mif", tmp_path, runner=Runner("2.1a0")
+    )
+
+
+def test_input_hash_parameters(tmp_path):
+    mif = "# MIF 2.2\nParameter m0file a.omf\nSpecify X [subst {\n  file $m0file\n}]\n"
+    (tmp_path / "test.mif").write_text(mif)
+    (tmp_path / "a.omf").write_text("a")
+    (tmp_path / "b.omf").write_text("b")
+    key = oc.cache.input_hash("test.mif", tmp_path, "m0file b.omf")
+
+    # Input files set by parameters are part of the hash.
+    (tmp_path / "a.omf").write_text("c")
+    assert oc.cache.input_hash("test.mif", tmp_path, "m0file b.omf") == key
+    (tmp_path / "b.omf").write_text("c")
+    assert oc.cache.input_hash("test.mif", tmp_path, "m0file b.omf") != key
+    assert oc.cache.input_hash("test.mif", tmp_path) != oc.cache.input_hash(
+        "test.mif", tmp_path, "m0file b.omf"
+    )
+
+
+def test_eviction(tmp_path):
+    cache = oc.ResultCache(dirname=tmp_path / "cache", max_entries=2)
+    (tmp_path / "out.txt").write_text("x" * 100)
+    for key in ["a", "b", "c"]:
+        cache.store(key, tmp_path, ["out.txt"])
+    assert cache.stats["entries"] == 2
+    assert not cache.load("a", tmp_path)
+    assert cache.load("c", tmp_path)
+
+    cache.max_size = 150
+    cache.store("d", tmp_path, ["out.txt"])
+    assert cache.stats["entries"] == 1
+    assert cache.load("d", tmp_path)
+
+    cache.clear()
+    assert cache.stats["entries"] == 0
+    assert repr(cache).startswith("ResultCache(")
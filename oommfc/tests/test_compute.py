@@ -0,0 +1,102 @@
+import asyncio
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import oommfc as oc
+
+
+def test_compute_async(tmp_path):
+    system = mm.examples.macrospin()
+
+    async def main():
+        return await asyncio.gather(
+            oc.compute_async(system.energy.energy, system, dirname=tmp_path),
+            oc.compute_async(
+                system.energy.zeeman.effective_field, system, dirname=tmp_path
+            ),
+        )
+
+    energy, field = asyncio.run(main())
+    assert isinstance(energy, float)
+    assert isinstance(field, df.Field)
+    assert system.compute_number == 2
+    assert energy == oc.compute(system.energy.energy, system, dirname=tmp_path)
+
+
+def test_compute_many(tmp_path):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), cell=(5e-9, 5e-9, 5e-9))
+    system = mm.System(name="compute_many")
+    system.energy = mm.Exchange(A=1e-11) + mm.Demag() + mm.Zeeman(H=(0, 0, 1e5))
+    system.m = df.Field(mesh, nvdim=3, value=(0, 1, 1), norm=8e5)
+
+    funcs = [system.energy.energy, system.energy.effective_field]
+    for term in system.energy:
+        funcs += [term.energy, term.effective_field, term.density]
+    values = oc.compute_many(funcs + [system.energy.energy], system, dirname=tmp_path)
+
+    # A single OOMMF run computes all values.
+    assert system.compute_number == 1
+    assert len(list((tmp_path / "compute_many").iterdir())) == 1
+    assert list(values) == funcs
+    for func in funcs:
+        expected = oc.compute(func, system, dirname=tmp_path)
+        if isinstance(expected, float):
+            assert values[func] == expected
+        else:
+            assert values[func].allclose(expected)
+
+    assert oc.compute_many([], system) == {}
+
+
+def test_oxs_class():
+    from oommfc.compute import oxs_class
+
+    system = mm.examples.macrospin()
+    with pytest.warns(FutureWarning):
+        assert oxs_class(system.energy.zeeman, system) == "FixedZeeman"
+
+
+def test_compute_batch(tmp_path):
+    system = mm.examples.macrospin()
+    m = system.m.array.copy()
+    states = [(0, 0, 8e5), -system.m, (8e5, 0, 0)]
+
+    energies = oc.compute_batch(system.energy.energy, system, states, dirname=tmp_path)
+    assert energies.shape == (3,)
+    assert system.compute_number == 1
+    assert (system.m.array == m).all()
+
+    # The MIF file is written once and the states are MIF parameters.
+    workingdir = tmp_path / "macrospin" / "compute-0"
+    assert [f.name for f in workingdir.glob("*.mif")] == ["macrospin.mif"]
+    mif = (workingdir / "macrospin.mif").read_text()
+    assert "Parameter m0file m0.omf" in mif
+    assert "file $m0file" in mif
+
+    fields = oc.compute_batch(
+        system.energy.zeeman.effective_field, system, states, dirname=tmp_path
+    )
+    assert len(fields) == 3
+    assert all(isinstance(field, df.Field) for field in fields[1:])
+
+    for index, state in enumerate(states):
+        system.m.update_field_values(
+            state.array if isinstance(state, df.Field) else state
+        )
+        assert energies[index] == oc.compute(
+            system.energy.energy, system, dirname=tmp_path
+        )
+        assert fields[index].allclose(
+            oc.compute(system.energy.zeeman.effective_field, system, dirname=tmp_path)
+        )
+
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(2, 1, 1), n=(2, 1, 1))
+    with pytest.raises(ValueError):
+        oc.compute_batch(
+            system.energy.energy,
+            system,
+            [df.Field(mesh, nvdim=3, value=(0, 0, 1))],
+            dirname=tmp_path,
+        )
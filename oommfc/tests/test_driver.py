@@ -0,0 +1,243 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import oommfc as oc
+
+
+def macrospin(name):
+    system = mm.examples.macrospin()
+    renamed = mm.System(name=name, T=system.T)
+    renamed.energy = system.energy
+    renamed.dynamics = system.dynamics
+    renamed.m = system.m
+    return renamed
+
+
+def test_drive_async(tmp_path):
+    systems = [macrospin(f"macrospin_{i}") for i in range(3)]
+
+    td = oc.TimeDriver()
+
+    async def main():
+        await asyncio.gather(
+            *(
+                td.drive_async(system, t=1e-12, n=2, dirname=tmp_path, n_threads=1)
+                for system in systems
+            )
+        )
+
+    asyncio.run(main())
+
+    for system in systems:
+        assert system.drive_number == 1
+        assert len(system.table.data) == 2
+        with open(tmp_path / system.name / "drive-0" / "info.json") as f:
+            assert json.load(f)["success"]
+
+
+def test_drive_async_error(tmp_path):
+    system = mm.examples.macrospin()
+    runner = oc.oommf.TclOOMMFRunner("wrong_name")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(oc.MinDriver().drive_async(system, dirname=tmp_path, runner=runner))
+
+    with open(tmp_path / system.name / "drive-0" / "info.json") as f:
+        assert not json.load(f)["success"]
+
+
+def test_drive_stream(tmp_path):
+    system = mm.examples.macrospin()
+    td = oc.TimeDriver()
+
+    stream = td.drive(system, t=5e-12, n=5, dirname=tmp_path, stream=True)
+    stages = list(stream)
+    assert [stage for stage, *_ in stages] == list(range(5))
+    for stage, t, m, row in stages:
+        assert t == pytest.approx((stage + 1) * 1e-12)
+        assert m.shape == system.m.array.shape
+        assert row["stage"] == stage
+    assert system.drive_number == 1
+    assert len(system.table.data) == 5
+
+    # Stop early.
+    stream = td.drive(system, t=5e-12, n=5, dirname=tmp_path, stream=True)
+    for stage, _, m, _ in stream:  # noqa: B007
+        if stage == 1:
+            break
+    stream.close()
+    assert system.drive_number == 2
+    assert np.array_equal(system.m.array, m)
+    assert len(system.table.data) >= 2  # rows read before stopping
+    with open(tmp_path / system.name / "drive-1" / "info.json") as f:
+        assert not json.load(f)["success"]
+
+
+def test_drive_callback(tmp_path):
+    system = mm.examples.macrospin()
+    td = oc.TimeDriver()
+
+    stages = []
+
+    def callback(stage, t, m, row):
+        stages.append(stage)
+        return row["t"] >= 2e-12
+
+    td.drive(system, t=5e-12, n=5, dirname=tmp_path, callback=callback)
+    assert stages == [0, 1]
+    assert system.drive_number == 1
+    assert len(system.table.data) >= 2
+    with open(tmp_path / system.name / "drive-0" / "info.json") as f:
+        assert json.load(f)["success"]
+
+    # Without stopping all stages are passed to the callback.
+    stages.clear()
+    td.drive(system, t=5e-13, n=5, dirname=tmp_path, callback=callback)
+    assert stages == list(range(5))
+    assert len(system.table.data) == 5
+
+    with pytest.raises(ValueError):
+        asyncio.run(td.drive_async(system, t=5e-12, n=5, callback=callback))
+
+
+def test_checkpoint_resume(tmp_path, monkeypatch):
+    system = mm.examples.macrospin()
+    td = oc.TimeDriver()
+
+    def interrupt(stage, t, m, row):
+        if stage == 1:
+            raise KeyboardInterrupt
+
+    td.drive(system, t=5e-12, n=5, dirname=tmp_path, checkpoint=True)
+    with pytest.raises(KeyboardInterrupt):
+        td.drive(
+            system,
+            t=5e-12,
+            n=5,
+            dirname=tmp_path,
+            checkpoint=1,
+            callback=interrupt,
+            timeout=600,
+        )
+    drivedir = tmp_path / system.name / "drive-1"
+    mif = (drivedir / f"{system.name}.mif").read_text()
+    assert f"checkpoint_file {system.name}.restart" in mif
+    assert "checkpoint_interval 1" in mif
+
+    # The resumed run is supervised like the interrupted drive.
+    runner = oc.runner.runner
+    calls = []
+
+    def call(*args, **kwargs):
+        calls.append(kwargs)
+        return type(runner)._call(runner, *args, **kwargs)
+
+    monkeypatch.setattr(runner, "_call", call)
+    system = mm.examples.macrospin()  # e.g. in a new session
+    td.resume(system, dirname=tmp_path)
+    monkeypatch.undo()
+    assert calls[-1]["restart"]
+    assert calls[-1]["timeout"] == 600
+    assert system.drive_number == 2
+    assert len(system.table.data) == 5
+    assert system.last_run_stats["phases"]["oommf"] > 0
+    with open(drivedir / "info.json") as f:
+        assert json.load(f)["success"]
+
+    with pytest.raises(ValueError, match="finished successfully"):
+        td.resume(system, dirname=tmp_path)
+    with pytest.raises(ValueError):
+        oc.MinDriver().resume(system, dirname=tmp_path)
+    with pytest.raises(ValueError):
+        td.drive(system, t=5e-12, n=5, dirname=tmp_path, checkpoint="yes")
+
+    command = oc.runner.runner._call(argstr="a.mif", dry_run=True, restart=True)
+    assert command.endswith("-restart 1")
+
+
+def test_chained_m0(tmp_path, monkeypatch):
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+
+    md.drive(system, dirname=tmp_path)
+    md.drive(system, dirname=tmp_path)
+    drivedir = tmp_path / system.name
+    (omffile,) = (drivedir / "drive-0").glob(f"{system.name}-*.omf")
+    # the output of the first drive is used as m0 of the second drive
+    assert (drivedir / "drive-1" / "m0.omf").samefile(omffile)
+
+    # The output file is not read to check that system.m is unchanged.
+    (omffile,) = (drivedir / "drive-1").glob(f"{system.name}-*.omf")
+    with monkeypatch.context() as m:
+        m.setattr(oc.readers, "read_ovf", None)
+        assert md._m0_source(system) == omffile
+    os.utime(omffile)  # the output file has been changed
+    assert md._m0_source(system) is None
+
+    system.m.array[0, 0, 0] = (1e6, 0, 0)  # changed in place
+    md.drive(system, dirname=tmp_path)
+    assert not (drivedir / "drive-2" / "m0.omf").samefile(omffile)
+    assert np.allclose(
+        oc.readers.read_ovf(drivedir / "drive-2" / "m0.omf")[0, 0, 0], (1e6, 0, 0)
+    )
+
+    system.m = system.m.orientation * 8e5  # replaced
+    md.drive(system, dirname=tmp_path)
+    assert (drivedir / "drive-3" / "m0.omf").stat().st_nlink == 1
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shell script as executable.")
+def test_watchdog(tmp_path):
+    # boxsi hangs without writing any output.
+    oommf = tmp_path / "oommf"
+    oommf.write_text('#!/bin/sh\ncase "$1" in boxsi) sleep 60 & wait;; esac\n')
+    oommf.chmod(0o755)
+    runner = oc.oommf.ExeOOMMFRunner(str(oommf))
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+
+    def watchdog(number):
+        with open(tmp_path / system.name / f"drive-{number}" / "info.json") as f:
+            info = json.load(f)
+        assert not info["success"]
+        return info["watchdog"]["reason"]
+
+    start = time.monotonic()
+    with pytest.raises(oc.OOMMFTimeoutError) as excinfo:
+        md.drive(system, dirname=tmp_path, runner=runner, timeout=0.5, verbose=0)
+    assert not isinstance(excinfo.value, oc.OOMMFStallError)
+    assert watchdog(0) == "timeout"
+    with pytest.raises(oc.OOMMFStallError):
+        md.drive(system, dirname=tmp_path, runner=runner, stall_timeout=1, verbose=0)
+    assert watchdog(1) == "stall"
+    with pytest.raises(oc.OOMMFTimeoutError):
+        asyncio.run(
+            md.drive_async(
+                system, dirname=tmp_path, runner=runner, timeout=1, verbose=0
+            )
+        )
+    assert watchdog(2) == "timeout"
+    with pytest.raises(oc.OOMMFStallError):
+        list(
+            md.drive(
+                system,
+                dirname=tmp_path,
+                runner=runner,
+                stall_timeout=1,
+                stream=True,
+                verbose=0,
+            )
+        )
+    assert watchdog(3) == "stall"
+    assert time.monotonic() - start < 30
+
+    for value in [0, -1, "1", True]:
+        with pytest.raises(ValueError):
+            md.drive(system, dirname=tmp_path, runner=runner, timeout=value)
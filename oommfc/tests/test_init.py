@@ -1,6 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
 import oommfc as oc
 
 
 def test_version():
     assert isinstance(oc.__version__, str)
     assert "." in oc.__version__
+
+
+def test_lazy_imports():
+    # Heavy submodules and dependencies are only imported when they are needed.
+    heavy = [
+        "asyncio",
+        "discretisedfield",
+        "micromagneticmodel",
+        "numpy",
+        "pandas",
+        "pytest",
+        "ubermagtable",
+        "ubermagutil",
+        "oommfc.cache",
+        "oommfc.drivers",
+        "oommfc.numpy_backend",
+    ]
+    code = f"import sys, oommfc; print(*sorted(set({heavy}) & set(sys.modules)))"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True) == "\n"
+
+
+def test_submodule_import():
+    # Importing a submodule must not shadow the function of the same name.
+    code = (
+        "import oommfc.compute, oommfc.sweep, oommfc as oc;"
+        " from oommfc.compute import compute_many;"
+        " print(callable(oc.compute), callable(oc.sweep), callable(compute_many))"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output.split() == ["True", "True", "True"]
+
+
+def test_lazy_attributes():
+    assert callable(oc.compute)
+    assert callable(oc.sweep)
+    assert issubclass(oc.MinDriver, oc.Driver)
+    assert oc.ResultCache is oc.cache.ResultCache
+    assert oc.runner is oc.runner
+    assert "MinDriver" in dir(oc)
+    with pytest.raises(AttributeError):
+        oc.missing  # noqa: B018
@@ -0,0 +1,120 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+
+import oommfc as oc
+
+terms = [
+    mm.Zeeman(H=(1e5, 2e4, -3e5)),
+    mm.Zeeman(H={"r1": (1e5, 0, 0), "r2": (0, 0, 1e5)}),
+    mm.UniaxialAnisotropy(K=1e5, u=(1, 1, 0)),
+    mm.UniaxialAnisotropy(K={"r1": -1e5, "r2": 2e5}, u=(0, 0, 1)),
+    mm.CubicAnisotropy(K=-3e4, u1=(1, 0, 0), u2=(0, 1, 1)),
+    mm.Exchange(A=1e-11),
+    *(
+        mm.DMI(D=3e-3, crystalclass=crystalclass)
+        for crystalclass in ["T", "Cnv_x", "Cnv_y", "Cnv_z", "D2d_x", "D2d_y", "D2d_z"]
+    ),
+]
+
+
+def system_for(term, bc=""):
+    subregions = {
+        "r1": df.Region(p1=(0, 0, 0), p2=(2e-9, 3e-9, 2e-9)),
+        "r2": df.Region(p1=(2e-9, 0, 0), p2=(4e-9, 3e-9, 2e-9)),
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(4e-9, 3e-9, 2e-9), n=(4, 3, 2), bc=bc, subregions=subregions
+    )
+    array = np.random.default_rng(0).normal(size=(*mesh.n, 3))
+    array *= 8e5 / np.linalg.norm(array, axis=-1, keepdims=True)
+    array[0, 0, 0] = 0  # empty cell
+
+    system = mm.System(name="numpy_backend")
+    system.energy = term
+    system.m = df.Field(mesh, nvdim=3, value=array)
+    return system
+
+
+@pytest.mark.parametrize("bc", ["", "xy"])
+@pytest.mark.parametrize("term", terms, ids=lambda term: repr(term)[:40])
+def test_oommf(term, bc, tmp_path):
+    # Regression test against OOMMF.
+    system = system_for(term, bc)
+    for func in [term.energy, term.density, term.effective_field]:
+        expected = oc.compute(func, system, dirname=tmp_path, verbose=0)
+        value = oc.compute(func, system, backend="numpy")
+        if isinstance(expected, float):
+            assert np.isclose(value, expected, rtol=1e-6, atol=1e-30)
+        else:
+            assert np.allclose(
+                value.array, expected.array, rtol=1e-6, atol=1e-9 * abs(expected).max()
+            )
+
+
+@pytest.mark.parametrize("bc", ["", "xy"])
+@pytest.mark.parametrize("term", terms, ids=lambda term: repr(term)[:40])
+def test_effective_field(term, bc):
+    # Rotating m in a cell by a small angle about an axis k changes the energy
+    # by -mu0 Ms V k . (m x H) per angle.
+    system = system_for(term, bc)
+    array = system.m.array.copy()
+    field = oc.compute(term.effective_field, system, backend="numpy").array
+    energy = oc.compute(term.energy, system, backend="numpy")
+    assert np.isclose(
+        energy,
+        oc.compute(term.density, system, backend="numpy").array.sum()
+        * system.m.mesh.dV,
+    )
+
+    angle = 1e-5
+    for index in [(1, 1, 0), (3, 2, 1), (0, 2, 1)]:
+        Ms = np.linalg.norm(array[index])
+        m = array[index] / Ms
+        for k in np.eye(3):
+            energies = []
+            for sign in (1, -1):
+                rotated = array.copy()
+                rotated[index] = Ms * (
+                    m * np.cos(angle)
+                    + np.cross(k, m) * np.sin(sign * angle)
+                    + k * (k @ m) * (1 - np.cos(angle))
+                )
+                system.m.array = rotated
+                energies.append(oc.compute(term.energy, system, backend="numpy"))
+            derivative = (energies[0] - energies[1]) / (2 * angle)
+            expected = (
+                -oc.numpy_backend.mu0
+                * Ms
+                * system.m.mesh.dV
+                * (k @ np.cross(m, field[index]))
+            )
+            assert np.isclose(derivative, expected, rtol=1e-4, atol=1e-6 * abs(energy))
+
+
+def test_backend(tmp_path):
+    system = system_for(mm.Exchange(A=1e-11) + mm.Zeeman(H=(0, 0, 1e5)))
+    energy = oc.compute(system.energy.energy, system, backend="numpy")
+    assert np.isclose(
+        energy,
+        sum(oc.compute(term.energy, system, backend="auto") for term in system.energy),
+    )
+    values = oc.compute_many(
+        [system.energy.energy, system.energy.density], system, backend="auto"
+    )
+    assert values[system.energy.energy] == energy
+    assert values[system.energy.density].nvdim == 1
+    assert system.compute_number == 0
+
+    system.energy += mm.Demag()
+    with pytest.raises(ValueError, match="not supported"):
+        oc.compute(system.energy.energy, system, backend="numpy")
+    with pytest.raises(ValueError):
+        oc.compute(system.energy.energy, system, backend="jax")
+    with pytest.raises(ValueError):
+        oc.compute(system.energy.__len__, system, backend="numpy")
+
+    # Unsupported values are computed with OOMMF.
+    oc.compute(system.energy.energy, system, dirname=tmp_path, backend="auto")
+    assert system.compute_number == 1
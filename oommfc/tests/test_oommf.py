@@ -1,13 +1,19 @@
+import asyncio
 import contextlib
 import os
 import re
+import shutil
+import socket
+import subprocess as sp
 import sys
+import time
 
 import micromagneticmodel as mm
 import pytest
 
 import oommfc as oc
 import oommfc.oommf as oo
+import oommfc.oommf.oommf as oommf
 
 
 def check_runner(runner):
@@ -79,6 +85,29 @@ def test_exe_oommf_runner():
     assert re.match(r"^ExeOOMMFRunner\(.*\)$", repr(runner))
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="No host servers on Windows.")
+def test_persistent_archive(tmp_path):
+    runner = oo.ExeOOMMFRunner()
+    (archive,) = runner._hosts._archives
+    assert runner.version
+    assert isinstance(runner.platform, str)
+    assert archive.pid is None  # queries do not start the archive
+
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+    md.drive(system, dirname=tmp_path, runner=runner)
+    pid = archive.pid
+    assert archive.alive
+    md.drive(system, dirname=tmp_path, runner=runner)
+    assert archive.pid == pid  # both simulations used the same archive
+    assert len(list((tmp_path / system.name).glob("drive-*"))) == 2
+
+    runner._kill()
+    assert not archive.alive
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
 @pytest.mark.skip("OOMMF inside docker cannot be tested on CI [non-default user].")
 def test_docker_oommf_runner():
     runner = oo.DockerOOMMFRunner()
@@ -105,6 +134,135 @@ def test_docker_no_oommf_run():
         runner.errors()
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="Python script as executable.")
+def test_docker_persistent(monkeypatch, tmp_path):
+    calls = tmp_path / "calls.txt"
+    docker = tmp_path / "bin" / "docker"
+    docker.parent.mkdir()
+    docker.write_text(
+        f"""#!{sys.executable}
+import sys
+args = sys.argv[1:]
+with open({str(calls)!r}, "a") as f:
+    f.write(" ".join(args) + "\\n")
+if args[:2] == ["run", "-d"]:
+    print("container-%d" % len(open({str(calls)!r}).readlines()))
+elif "+version" in args[-1]:
+    sys.stderr.write("oommf boxsi OOMMF 2.0b0\\n")
+"""
+    )
+    docker.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{docker.parent}{os.pathsep}{os.environ['PATH']}")
+    workingdir = tmp_path / "work" / "dir"
+    workingdir.mkdir(parents=True)
+    monkeypatch.chdir(workingdir)
+
+    def docker_calls():
+        return calls.read_text().splitlines()
+
+    runner = oo.DockerOOMMFRunner(persistent=True, mount=tmp_path / "work")
+    assert runner.version == "2.0b0"
+    assert runner.version == "2.0b0"
+    asyncio.run(runner.call_async("+version", verbose=0, workingdir=workingdir))
+    run, *execs = docker_calls()
+    assert run.startswith(f"run -d --rm -v {tmp_path / 'work'}:/io ")
+    assert len(execs) == 3
+    assert all(call.startswith("exec -w /io/dir container-1 ") for call in execs)
+
+    asyncio.run(
+        runner.call_async(
+            "test.mif", verbose=0, workingdir=workingdir, restart=True, parameters="a 1"
+        )
+    )
+    assert "test.mif -restart 1 -parameters 'a 1'" in docker_calls()[-1]
+
+    # Working directories outside the mount, watched runs, and dry runs use
+    # docker run.
+    runner.call("+version", verbose=0, workingdir=tmp_path)
+    assert re.match(
+        rf"run --rm --name oommfc-\w+ -v {tmp_path}:/io ", docker_calls()[-1]
+    )
+    runner.call("+version", verbose=0, timeout=60)
+    assert docker_calls()[-1].startswith("run --rm --name oommfc-")
+    assert runner._call("+version", dry_run=True, n_threads=2).startswith(
+        "docker run -v "
+    )
+    assert "-threads 2" in runner._call("+version", dry_run=True, n_threads=2)
+
+    runner._kill()
+    assert docker_calls()[-1] == "rm -f container-1"
+    runner.call("+version", verbose=0)
+    assert docker_calls()[-2].startswith("run -d ")
+    assert docker_calls()[-1].startswith("exec -w /io/dir container-")
+    runner._kill()
+
+    with pytest.raises(ValueError):
+        oo.DockerOOMMFRunner(persistent=True, max_execs=0)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Python script as executable.")
+def test_docker_watchdog(monkeypatch, tmp_path):
+    monkeypatch.setattr(oommf._Watchdog, "interval", 0.1)
+    started = tmp_path / "started.txt"
+    running = tmp_path / "running.txt"
+    docker = tmp_path / "bin" / "docker"
+    docker.parent.mkdir()
+    # Stopping the client does not stop its container; docker kill does.
+    docker.write_text(
+        f"""#!{sys.executable}
+import pathlib, sys, time
+args = sys.argv[1:]
+running = pathlib.Path({str(running)!r})
+names = running.read_text().split() if running.exists() else []
+if args[0] == "run":
+    name = args[args.index("--name") + 1]
+    with open({str(started)!r}, "a") as f:
+        f.write(name + "\\n")
+    running.write_text(" ".join([*names, name]))
+    time.sleep(60)
+elif args[0] == "kill":
+    running.write_text(" ".join(n for n in names if n != args[1]))  # --rm
+elif args[0] == "ps":
+    print(*names, sep="\\n")
+"""
+    )
+    docker.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{docker.parent}{os.pathsep}{os.environ['PATH']}")
+
+    def ps():
+        res = sp.run(["docker", "ps", "--format", "{{.Names}}"], stdout=sp.PIPE)
+        return res.stdout.decode().split()
+
+    def wait_started(n):
+        for _ in range(50):
+            if started.exists() and len(started.read_text().split()) == n:
+                return True
+            time.sleep(0.1)
+        return False
+
+    runner = oo.DockerOOMMFRunner(persistent=True, mount=tmp_path)
+    with pytest.raises(oc.OOMMFTimeoutError):
+        runner._call("test.mif", workingdir=tmp_path, timeout=1)
+    assert wait_started(1)
+    assert ps() == []
+
+    with pytest.raises(oc.OOMMFStallError):
+        asyncio.run(
+            runner._call_async("test.mif", workingdir=tmp_path, stall_timeout=1)
+        )
+    assert wait_started(2)
+    assert ps() == []
+
+    process = runner._start("test.mif", workingdir=tmp_path, timeout=1)
+    assert wait_started(3)
+    with pytest.raises(oc.OOMMFTimeoutError):
+        while True:
+            process.check()
+            time.sleep(0.1)
+    assert ps() == []
+    assert len(set(started.read_text().split())) == 3  # unique container names
+
+
 def test_get_oommf_runner(monkeypatch):
     monkeypatch.setenv("OOMMFTCL", "wrong_name")  # wrong environment variable
     oc.runner.autoselect_runner()
@@ -180,6 +338,97 @@ def test_set_invalid_runner():
         oc.runner.runner = oo.TclOOMMFRunner("wrong_name")
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="Shell script as executable.")
+def test_discovery_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    calls = tmp_path / "calls.txt"
+    oommf = tmp_path / "bin" / "oommf"
+    oommf.parent.mkdir()
+    oommf.write_text(
+        f'#!/bin/sh\necho "$@" >> {calls}\n'
+        "case \"$*\" in *+version*) echo 'oommf boxsi OOMMF 2.0b0' >&2;; esac\n"
+    )
+    oommf.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{oommf.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.delenv("OOMMFTCL", raising=False)
+
+    def n_probes():
+        return calls.read_text().count("+version") if calls.exists() else 0
+
+    def cached_runner():
+        runner = oo.Runner()
+        runner.discovery_cache = True
+        return runner
+
+    runner = oo.Runner()
+    runner.discovery_cache = False
+    assert isinstance(runner.runner, oo.ExeOOMMFRunner)
+    assert n_probes() == 1
+    assert not (tmp_path / "cache").exists()
+
+    assert isinstance(cached_runner().runner, oo.ExeOOMMFRunner)
+    assert n_probes() == 2
+    assert (tmp_path / "cache" / "oommfc" / "runners.json").exists()
+
+    # A new process uses the stored runner without running OOMMF.
+    runner = cached_runner()
+    assert repr(runner.runner) == f"ExeOOMMFRunner({oommf})"
+    assert n_probes() == 2
+
+    # Changing the executable invalidates the stored runner.
+    os.utime(oommf, ns=(0, 0))
+    assert isinstance(cached_runner().runner, oo.ExeOOMMFRunner)
+    assert n_probes() == 3
+    assert repr(cached_runner().runner) == f"ExeOOMMFRunner({oommf})"
+    assert n_probes() == 3
+
+    # Setting a runner only queries the version or skips the check.
+    runner = oo.Runner()
+    runner.runner = oo.ExeOOMMFRunner(str(oommf))
+    assert n_probes() == 4
+    assert "boxsi +fg +version" in calls.read_text().splitlines()[-1]
+    runner.check_runner = False
+    runner.runner = oo.ExeOOMMFRunner(str(oommf))
+    assert n_probes() == 4
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shell script as executable.")
+def test_discovery_cache_invalid(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    (tmp_path / "oommfc").mkdir()
+    (tmp_path / "oommfc" / "runners.json").write_text("[1, 2")
+    runner = oo.Runner()
+    runner.discovery_cache = True
+    assert runner._load_discovered() is None
+    runner.autoselect_runner()
+    assert runner._load_discovered() is not None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shell script as executable.")
+def test_discovery_cache_broken_runner(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    oommf = tmp_path / "bin" / "oommf"
+    oommf.parent.mkdir()
+    oommf.write_text("#!/bin/sh\necho 'oommf boxsi OOMMF 2.0b0' >&2\n")
+    oommf.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{oommf.parent}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.delenv("OOMMFTCL", raising=False)
+    runner = oo.Runner()
+    runner.discovery_cache = True
+    runner.autoselect_runner()
+    stored = runner._load_discovered()
+    assert repr(stored) == f"ExeOOMMFRunner({oommf})"
+
+    # A stored runner whose executable has changed for the same key is only used
+    # if OOMMF still works.
+    mtime = os.stat(oommf).st_mtime_ns
+    oommf.write_text("#!/bin/sh\nexit 1\n")
+    os.utime(oommf, ns=(mtime, mtime))
+    assert runner._load_discovered() is None
+    runner.check_runner = False
+    assert repr(runner._load_discovered()) == f"ExeOOMMFRunner({oommf})"
+
+
 def test_status():
     assert oc.runner.runner.status == 0
     oc.runner._runner = oo.TclOOMMFRunner("wrong_name")  # force wrong runner
@@ -229,3 +478,322 @@ def test_silent(capsys):
     captured = capsys.readouterr()
     assert captured.out == ""
     assert captured.err == ""
+
+
+def test_max_threads():
+    assert oc.runner.max_threads is None
+    oc.runner.max_threads = 4
+    assert oc.runner.max_threads == 4
+    with pytest.raises(ValueError):
+        oc.runner.max_threads = 0
+
+    limiter = oc.runner._thread_limiter
+    running = []
+    peak = []
+
+    async def job(n_threads):
+        async with limiter.reserve(n_threads):
+            running.append(min(n_threads, 4))
+            peak.append(sum(running))
+            await asyncio.sleep(0.01)
+            running.remove(min(n_threads, 4))
+
+    async def main():
+        await asyncio.gather(*(job(n) for n in (2, 2, 3, 1, 8)))
+
+    asyncio.run(main())
+    assert max(peak) <= 4
+    assert limiter.in_use == 0
+
+
+@pytest.mark.skipif(oommf.fcntl is None, reason="flock is not available.")
+def test_cpu_placement(tmp_path):
+    nodes = tmp_path / "nodes"
+    for index, cpulist in enumerate(["0-1,4", "2-3,5"]):
+        (nodes / f"node{index}").mkdir(parents=True)
+        (nodes / f"node{index}" / "cpulist").write_text(f"{cpulist}\n")
+
+    def placement():
+        placement = oommf._CPUPlacement(tmp_path / "locks", nodes, cpus=set(range(7)))
+        placement._taskset = True
+        return placement
+
+    first, second = placement(), placement()  # e.g. in two processes
+    assert first.nodes == [[0, 1, 4], [2, 3, 5], [6]]
+    cpus1, locks1 = first.acquire(2)
+    assert cpus1 == [0, 1]
+    cpus2, locks2 = first.acquire(3)
+    assert cpus2 == [2, 3, 5]  # a single NUMA node
+    cpus3, locks3 = second.acquire(2)
+    assert cpus3 == [4, 6]  # not enough free CPUs on a single node
+    assert second.acquire(1) == (None, [])
+
+    first.release(locks2)
+    assert second.acquire(4) == (None, [])
+    cpus4, locks4 = second.acquire(3)
+    assert cpus4 == [2, 3, 5]
+    for locks in (locks1, locks3, locks4):
+        first.release(locks)
+    cpus5, locks5 = first.acquire(7)
+    assert cpus5 == list(range(7))
+    first.release(locks5)
+
+
+@pytest.mark.skipif(
+    oommf.fcntl is None or shutil.which("taskset") is None,
+    reason="CPU pinning is not supported.",
+)
+def test_pin_cpus(monkeypatch, tmp_path):
+    (cpu, *_) = os.sched_getaffinity(0)
+    placement = oommf._CPUPlacement(tmp_path, tmp_path / "nodes", cpus={cpu})
+    monkeypatch.setattr(oommf, "_cpu_placement", placement)
+    runner = oc.runner.runner
+    if not isinstance(runner, oommf.NativeOOMMFRunner):
+        pytest.skip("CPUs are only pinned for native runners.")
+
+    process = runner._start("+version", n_threads=1)
+    assert process.args[0] != "taskset"  # disabled by default
+    process.result()
+    oc.runner.pin_cpus = True
+    process = runner._start("+version", n_threads=1)
+    assert process.args[:3] == ["taskset", "-c", str(cpu)]
+    assert placement.acquire(1) == (None, [])  # reserved by the running process
+    assert process.result().returncode == 0
+    cpus, locks = placement.acquire(1)
+    assert cpus == [cpu]
+    placement.release(locks)
+
+    assert (
+        "OOMMF"
+        in runner.call(
+            "+version", need_stderr=True, n_threads=1, verbose=0
+        ).stderr.decode()
+    )
+    system = mm.examples.macrospin()
+    oc.MinDriver().drive(system, dirname=tmp_path, n_threads=1, verbose=0)
+    asyncio.run(oc.MinDriver().drive_async(system, dirname=tmp_path, n_threads=1))
+    cpus, locks = placement.acquire(1)
+    assert cpus == [cpu]
+    placement.release(locks)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Shell script as executable.")
+def test_kill_started_applications(tmp_path):
+    calls = tmp_path / "calls.txt"
+    oommf = tmp_path / "oommf"
+    oommf.write_text(
+        f'#!/bin/sh\necho "$@" >> {calls}\n'
+        'case "$*" in *pidinfo*) printf "0 101 mmArchive\\n1 102 Oxsii\\n";; esac\n'
+    )
+    oommf.chmod(0o755)
+    runner = oo.ExeOOMMFRunner(str(oommf))
+
+    def kills():
+        lines = calls.read_text().splitlines() if calls.exists() else []
+        calls.unlink(missing_ok=True)
+        return [line for line in lines if line.startswith("killoommf")]
+
+    # All applications registered with the private host server of the runner.
+    runner._kill()
+    assert kills() == ["killoommf -q 0 1"]
+    runner._kill(targets=[1])
+    assert kills() == ["killoommf -q 1"]
+
+    # Only applications started by the runner on a shared host server.
+    runner._own_host = False
+    runner._kill()
+    assert kills() == []
+    runner._pids.add(102)
+    runner._kill()
+    assert kills() == ["killoommf -q 1"]
+    runner._pids.clear()
+
+    # Job scripts kill all applications of the host server they launch.
+    assert runner._kill(dry_run=True) == f"{oommf} killoommf all"
+    assert kills() == []
+
+
+def running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    with contextlib.suppress(OSError), open(f"/proc/{pid}/stat") as f:
+        return f.read().rsplit(")", 1)[1].split()[0] != "Z"  # zombie
+    return True
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No host servers on Windows.")
+def test_kill_shared_host_applications(tmp_path):
+    runner = oc.runner.runner
+    if not isinstance(runner, oommf.NativeOOMMFRunner):
+        pytest.skip("Host servers are only used by native runners.")
+    runner = type(runner)(*runner.oommf[-1:], host_servers="shared")
+    runner._hosts._archives = [None]  # boxsi launches mmArchive itself
+    before = set(runner._applications().values())
+
+    system = mm.examples.macrospin()
+    oc.MinDriver().drive(system, dirname=tmp_path, runner=runner)
+    started = [
+        pid
+        for pid in runner._applications().values()
+        if pid not in before and runner._started(pid)
+    ]
+    assert started  # mmArchive launched by boxsi, which has exited
+
+    runner._kill()
+    for _ in range(50):
+        if not any(map(running, started)):
+            break
+        time.sleep(0.1)
+    assert not any(map(running, started))
+    assert set(runner._applications().values()) <= before
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No host servers on Windows.")
+@pytest.mark.parametrize("host_servers", ["shared", 2])
+def test_archives_do_not_pile_up(host_servers, tmp_path):
+    runner = oc.runner.runner
+    if not isinstance(runner, oommf.NativeOOMMFRunner):
+        pytest.skip("Host servers are only used by native runners.")
+    runner = type(runner)(*runner.oommf[-1:], host_servers=host_servers)
+    envs = runner._hosts.envs()
+    before = {env["OOMMF_HOSTPORT"]: runner._applications(env) for env in envs}
+
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+    for _ in range(4):
+        md.drive(system, dirname=tmp_path, runner=runner)
+    for env in envs:
+        started = set(runner._applications(env)) - set(before[env["OOMMF_HOSTPORT"]])
+        assert len(started) == 1  # the persistent archive of the host server
+
+    # The archives are stopped with the host servers object (or at exit).
+    archives = runner._hosts._archives
+    pids = [archive.pid for archive in archives]
+    runner._hosts._finalizer()
+    assert not any(archive.alive for archive in archives)
+    assert not any(map(running, pids))
+    runner._kill()
+
+
+def test_host_servers(monkeypatch):
+    servers = []
+
+    def launch(port=0):
+        server = socket.create_server(("localhost", int(port)))
+        servers.append(server)
+        return str(server.getsockname()[1])
+
+    try:
+        hosts = oommf._HostServers(launch, 3)
+        assert hosts.private
+        ports = [hosts.env()["OOMMF_HOSTPORT"] for _ in range(6)]
+        assert len(set(ports)) == 3
+        assert ports[3:] == ports[:3]
+        assert [env["OOMMF_HOSTPORT"] for env in hosts.envs()] == ports[:3]
+
+        # Host servers which stopped are relaunched.
+        servers[1].close()
+        port = hosts.env(1)["OOMMF_HOSTPORT"]
+        assert port not in ports
+        assert hosts.env(4)["OOMMF_HOSTPORT"] == port
+        assert len(servers) == 4
+
+        # A running shared host server is used as it is.
+        monkeypatch.setenv("OOMMF_HOSTPORT", ports[0])
+        hosts = oommf._HostServers(launch, "shared")
+        assert not hosts.private
+        assert hosts.env()["OOMMF_HOSTPORT"] == ports[0]
+        assert len(servers) == 4
+        servers[0].close()
+        assert hosts.env()["OOMMF_HOSTPORT"] == ports[0]  # relaunched on its port
+        assert len(servers) == 5
+    finally:
+        for server in servers:
+            server.close()
+
+    for value in [0, 1.5, True, "private"]:
+        with pytest.raises(ValueError):
+            oommf._HostServers(launch, value)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="No host servers on Windows.")
+def test_sharded_host_servers(tmp_path):
+    runner = oc.runner.runner
+    if not isinstance(runner, oommf.NativeOOMMFRunner):
+        pytest.skip("Host servers are only used by native runners.")
+    runner = type(runner)(*runner.oommf[-1:], host_servers=2)
+    assert len(runner._hosts.envs()) == 2
+    check_runner(runner)
+    oc.MinDriver().drive(mm.examples.macrospin(), dirname=tmp_path, runner=runner)
+    archives = runner._hosts._archives
+    assert len({archive.env["OOMMF_HOSTPORT"] for archive in archives}) == 2
+    runner._kill()
+    assert not any(archive.alive for archive in archives)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Process groups are POSIX only.")
+def test_watchdog(monkeypatch, tmp_path):
+    monkeypatch.setattr(oommf._Watchdog, "interval", 0.1)
+    pidfile = tmp_path / "pid"
+    # The child writes output for a second and then hangs in a grandchild.
+    code = (
+        "import pathlib, subprocess, sys, time\n"
+        "for i in range(5):\n"
+        "    pathlib.Path('out').write_text(str(i)); time.sleep(0.2)\n"
+        "sleep = 'import time; time.sleep(60)'\n"
+        "child = subprocess.Popen([sys.executable, '-c', sleep])\n"
+        f"pathlib.Path({str(pidfile)!r}).write_text(str(child.pid))\n"
+        "child.wait()\n"
+    )
+
+    def start():
+        return sp.Popen(
+            [sys.executable, "-c", code],
+            cwd=tmp_path,
+            stdout=sp.PIPE,
+            stderr=sp.PIPE,
+            start_new_session=True,
+        )
+
+    def stopped():
+        # The stopped grandchild is reaped by init.
+        pid = int(pidfile.read_text())
+        for _ in range(50):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return True
+            time.sleep(0.1)
+        return False
+
+    begin = time.monotonic()
+    watchdog = oommf._Watchdog(stall_timeout=0.6, workingdir=tmp_path)
+    with start() as process, pytest.raises(oc.OOMMFStallError):
+        oommf._communicate(process, watchdog)
+    assert time.monotonic() - begin > 1  # not stalled while writing output
+    assert process.poll() is not None
+    assert stopped()
+
+    pidfile.unlink()
+    with start() as process, pytest.raises(oc.OOMMFTimeoutError):
+        oommf._communicate(process, oommf._Watchdog(timeout=2))
+    assert stopped()
+
+    async def main():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", code, cwd=tmp_path, start_new_session=True
+        )
+        await oommf._communicate_async(process, oommf._Watchdog(timeout=2))
+
+    pidfile.unlink()
+    with pytest.raises(oc.OOMMFTimeoutError):
+        asyncio.run(main())
+    assert stopped()
+
+    with pytest.raises(ValueError):
+        oommf._Watchdog(timeout=0)
+    with pytest.raises(ValueError):
+        oommf._Watchdog(stall_timeout="1")
+    assert oommf._watchdog() is None
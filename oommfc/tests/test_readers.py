@@ -0,0 +1,108 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import numpy as np
+import pytest
+import ubermagtable as ut
+
+import oommfc as oc
+
+
+@pytest.mark.parametrize("representation", ["bin4", "bin8"])
+def test_read_ovf(tmp_path, representation):
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(10, 6, 4), n=(5, 3, 2))
+    field = df.Field(mesh, nvdim=3, value=lambda p: (p[0], p[1], p[2]))
+    field.to_file(tmp_path / "m.omf", representation=representation)
+
+    array = oc.readers.read_ovf(tmp_path / "m.omf")
+    assert array.shape == (5, 3, 2, 3)
+    assert not array.flags.writeable
+    assert np.allclose(array, field.array)
+
+    out = np.zeros_like(field.array)
+    assert oc.readers.read_ovf(tmp_path / "m.omf", out=out) is out
+    assert np.allclose(out, field.array)
+
+    with pytest.raises(ValueError):
+        oc.readers.read_ovf(tmp_path / "m.omf", out=np.zeros((5, 3, 3, 3)))
+
+    field.to_file(tmp_path / "m.ovf", representation="txt")
+    with pytest.raises(ValueError):
+        oc.readers.read_ovf(tmp_path / "m.ovf")
+
+
+def test_drive_read_mode(tmp_path):
+    system = mm.examples.macrospin()
+    array = system.m.array
+    md = oc.MinDriver()
+    md.drive(system, dirname=tmp_path, read_mode="mmap")
+    # the existing array is updated in place
+    assert system.m.array is array
+    expected = df.Field.from_file(
+        sorted((tmp_path / "macrospin" / "drive-0").glob("macrospin-*.omf"))[-1]
+    )
+    assert np.allclose(system.m.array, expected.array)
+
+    with pytest.raises(ValueError):
+        md.drive(system, dirname=tmp_path, read_mode="invalid")
+
+
+ODT_HEADER = (
+    "# ODT 1.0\n"
+    "# Table Start\n"
+    "# Title: mmArchive Data Table\n"
+    "# Columns: Oxs_TimeDriver::Iteration {Oxs_TimeDriver::Simulation time}"
+    " Oxs_TimeDriver::mz\n"
+    "# Units: {} s {}\n"
+)
+
+
+def test_odt_reader(tmp_path):
+    filename = tmp_path / "test.odt"
+    filename.write_text(ODT_HEADER + "1 1e-12 0.5\n2 2e-12 0.")
+
+    reader = oc.readers.OdtReader(filename, x="t")
+    new_rows = reader.read()
+    # the incomplete last line is not parsed
+    assert len(new_rows) == 1
+    assert list(new_rows.columns) == ["iteration", "t", "mz"]
+
+    with open(filename, "a") as f:
+        f.write("6\n3 3e-12 0.7\n# Table End\n")
+    new_rows = reader.read()
+    assert new_rows["mz"].tolist() == [0.6, 0.7]
+    assert reader.n_rows == 3
+    assert reader.read().empty
+
+    table = reader.table
+    expected = ut.Table.fromfile(filename, x="t")
+    assert table.x == "t"
+    assert table.units == expected.units
+    assert np.array_equal(table.data.to_numpy(), expected.data.to_numpy())
+
+    (tmp_path / "test.txt").write_text("# t (s)\tmz ()\n0\t1\n")
+    with pytest.raises(ValueError):
+        oc.readers.OdtReader(tmp_path / "test.txt").read()
+
+
+def test_odt_reader_sidecar(tmp_path):
+    filename = tmp_path / "test.odt"
+    filename.write_text(ODT_HEADER + "1 1e-12 0.5\n2 2e-12 0.6\n")
+    reader = oc.readers.OdtReader(filename, sidecar=True)
+    reader.read()
+    assert (tmp_path / "test.odt.columns" / "meta.json").exists()
+    assert np.load(tmp_path / "test.odt.columns" / "2.npy").tolist() == [0.5, 0.6]
+
+    with open(filename, "a") as f:
+        f.write("3 3e-12 0.7\n")
+    # a new reader only parses the new row
+    reader = oc.readers.OdtReader(filename, sidecar=True)
+    assert reader.n_rows == 2
+    assert len(reader.read()) == 1
+    assert reader.data["mz"].tolist() == [0.5, 0.6, 0.7]
+    assert np.load(tmp_path / "test.odt.columns" / "2.npy").tolist() == [0.5, 0.6, 0.7]
+
+    # the sidecar is ignored if the file has been replaced
+    filename.write_text(ODT_HEADER.replace("Data Table", "Table") + "1 1e-12 0.1\n")
+    reader = oc.readers.OdtReader(filename, sidecar=True)
+    reader.read()
+    assert reader.data["mz"].tolist() == [0.1]
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import logging
+import subprocess
+import sys
+import time
+
+import micromagneticmodel as mm
+import pytest
+
+import oommfc as oc
+
+
+def test_run_stats():
+    stats = oc.runstats.RunStats()
+    with oc.runstats.phase("write_mif"):  # no active statistics
+        pass
+    with stats.activate():
+        with stats.phase("write_mif"):
+            time.sleep(0.01)
+            with oc.runstats.phase("write_fields"):
+                time.sleep(0.2)
+        with stats.oommf():
+            subprocess.run([sys.executable, "-c", "sum(range(10**6))"], check=True)
+        with stats.phase("write_mif"):
+            pass
+
+    values = stats.to_dict()
+    assert list(values["phases"]) == ["write_mif", "write_fields", "oommf"]
+    # Nested phases are not included in the time of the enclosing phase.
+    assert values["phases"]["write_fields"] >= 0.2
+    assert 0.01 <= values["phases"]["write_mif"] < 0.1
+    assert sum(values["phases"].values()) <= values["total"]
+    if oc.runstats.resource is not None:
+        assert values["cpu_user"] + values["cpu_system"] > 0
+        # Unknown if an earlier child process of the tests used more memory.
+        assert values["max_rss"] is None or values["max_rss"] > 0
+    json.dumps(values)
+
+
+@pytest.mark.skipif(oc.runstats.resource is None, reason="No resource module.")
+def test_run_stats_overlap():
+    outer, inner = oc.runstats.RunStats(), oc.runstats.RunStats()
+    with outer.oommf(), inner.oommf():
+        subprocess.run([sys.executable, "-c", "sum(range(10**6))"], check=True)
+
+    # Resource usage of overlapping runs cannot be attributed to either run.
+    for stats in [outer, inner]:
+        assert stats.phases["oommf"] > 0
+        assert stats.cpu_user is stats.cpu_system is stats.max_rss is None
+
+
+@pytest.mark.parametrize(
+    "mode", ["drive", "drive_async", "stream", "callback", "compute"]
+)
+def test_last_run_stats(mode, tmp_path, caplog):
+    caplog.set_level(logging.INFO, logger="oommfc")
+    system = mm.examples.macrospin()
+    md = oc.MinDriver()
+    if mode == "drive":
+        md.drive(system, dirname=tmp_path, verbose=0)
+    elif mode == "drive_async":
+        asyncio.run(md.drive_async(system, dirname=tmp_path, verbose=0))
+    elif mode == "stream":
+        list(md.drive(system, dirname=tmp_path, verbose=0, stream=True))
+    elif mode == "callback":
+        md.drive(system, dirname=tmp_path, verbose=0, callback=lambda *args: False)
+    else:
+        oc.compute(system.energy.energy, system, dirname=tmp_path, verbose=0)
+
+    stats = system.last_run_stats
+    assert list(stats["phases"]) == ["write_mif", "write_fields", "oommf", "read_data"]
+    assert f"of {system.name} took" in caplog.text
+    if mode != "compute":
+        with open(tmp_path / system.name / "drive-0" / "info.json") as f:
+            assert json.load(f)["run_stats"] == stats
@@ -0,0 +1,84 @@
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import oommfc as oc
+
+
+def test_mif_script(tmp_path):
+    subregions = {f"r{i}": df.Region(p1=(i, 0, 0), p2=(i + 1, 1, 1)) for i in range(50)}
+    mesh = df.Mesh(p1=(0, 0, 0), p2=(50, 1, 1), n=(50, 1, 1), subregions=subregions)
+    system = mm.System(name="scripts")
+    system.energy = mm.Exchange(A={name: 1e-11 for name in subregions}) + mm.Zeeman(
+        H={name: (0, 0, 1e5) for name in subregions}
+    )
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+
+    chunks = list(oc.scripts.mesh_script.iter(mesh))
+    assert len(chunks) > 50
+    assert "".join(chunks) == oc.scripts.mesh_script(mesh)
+
+    md = oc.MinDriver()
+    md.write_mif(system, dirname=tmp_path)
+    mif = (tmp_path / "scripts.mif").read_text()
+    assert mif.startswith("# MIF 2.2")
+    assert mif.count("Specify Oxs_BoxAtlas") == 51
+    assert "Oxs_AtlasVectorField:zeeman_H" in mif
+    assert mif.endswith("Schedule Oxs_MinDriver::Magnetization mags Stage 1")
+
+    # No incomplete MIF file is written if the script generation fails.
+    (tmp_path / "scripts.mif").unlink()
+    with pytest.raises(ValueError):
+        md.write_mif(system, dirname=tmp_path, ovf_format="bin16")
+    assert not (tmp_path / "scripts.mif").exists()
+
+
+@pytest.mark.parametrize(
+    "term",
+    [
+        lambda f: mm.Exchange(A=1e-11),
+        lambda f: mm.Exchange(A={"r1": 1e-11, "r2": 2e-11}),
+        lambda f: mm.Exchange(A=f(nvdim=1, value=1e-11)),
+        lambda f: mm.Zeeman(H=(0, 0, 1e5)),
+        lambda f: mm.Zeeman(H={"r1": (0, 0, 1e5), "r2": (0, 1e5, 0)}),
+        lambda f: mm.Zeeman(H=(0, 0, 1e5), func="sin", f=1e9, t0=0),
+        lambda f: mm.Zeeman(H=f(nvdim=3, value=(0, 0, 1)), func="sin", f=1e9, t0=0),
+        lambda f: mm.Zeeman(H=(0, 0, 1e5), func=lambda t: 2, dt=1e-12),
+        lambda f: mm.Demag(),
+        lambda f: mm.DMI(D=1e-3, crystalclass="T"),
+        lambda f: mm.DMI(D=1e-3, crystalclass="Cnv_z"),
+        lambda f: mm.UniaxialAnisotropy(K=1e5, u=(0, 0, 1)),
+        lambda f: mm.UniaxialAnisotropy(K1=1e5, K2={"r1": 1e3}, u=(0, 0, 1)),
+        lambda f: mm.CubicAnisotropy(K=1e5, u1=(1, 0, 0), u2=(0, 1, 0)),
+        lambda f: mm.MagnetoElastic(
+            B1=1e7, B2=1e7, e_diag=(1, 1, 1), e_offdiag=(1, 1, 1)
+        ),
+    ],
+)
+def test_oxs_class(term, tmp_path, monkeypatch):
+    subregions = {
+        "r1": df.Region(p1=(0, 0, 0), p2=(5e-9, 5e-9, 5e-9)),
+        "r2": df.Region(p1=(5e-9, 0, 0), p2=(10e-9, 5e-9, 5e-9)),
+    }
+    mesh = df.Mesh(
+        p1=(0, 0, 0), p2=(10e-9, 5e-9, 5e-9), n=(2, 1, 1), subregions=subregions
+    )
+    system = mm.System(name="oxs_class")
+    system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+    term = term(lambda **kwargs: df.Field(mesh, **kwargs))
+
+    # The registry does not generate any files.
+    monkeypatch.chdir(tmp_path)
+    cls = oc.scripts.oxs_class(term)
+    assert list(tmp_path.iterdir()) == []
+
+    if callable(getattr(term, "func", None)):
+        oc.TimeDriver._time_dependence(term, t=1e-11)
+    mif = getattr(oc.scripts.energy, f"{term.name}_script")(term, system)
+    assert f"Specify {cls}:{term.name} {{" in mif
+    assert oc.scripts.oxs_output(term, "Field") == f"{cls}:{term.name}:Field"
+
+
+def test_oxs_class_unsupported():
+    with pytest.raises(ValueError, match="not supported"):
+        oc.scripts.oxs_class(mm.Damping(alpha=1))
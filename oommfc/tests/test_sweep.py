@@ -0,0 +1,192 @@
+import importlib
+import json
+
+import discretisedfield as df
+import micromagneticmodel as mm
+import pytest
+
+import oommfc as oc
+
+
+def system_factory(Hz, alpha=0.1):
+    system = mm.examples.macrospin()
+    system.energy.zeeman.H = (0, 0, Hz)
+    system.dynamics.damping.alpha = alpha
+    return system
+
+
+def test_sweep(tmp_path):
+    params = {"Hz": [1e5, 2e5, 3e5], "alpha": [0.1, 0.5]}
+    result = oc.sweep(
+        system_factory,
+        oc.TimeDriver(),
+        params,
+        dirname=tmp_path,
+        max_workers=2,
+        t=1e-12,
+        n=2,
+        verbose=0,
+    )
+    assert len(result) == 6
+    assert result.m.shape == (6, 1, 1, 1, 3)
+    assert list(result.params.columns) == ["Hz", "alpha"]
+    table = result.table
+    assert len(table) == 12
+    assert {"point", "Hz", "alpha", "t"} <= set(table.columns)
+    for i in range(6):
+        with open(tmp_path / "sweep" / f"point-{i}" / "info.json") as f:
+            info = json.load(f)
+        assert info["success"]
+        assert info["Hz"] in params["Hz"]
+
+
+def test_sweep_resume(tmp_path):
+    params = [{"Hz": 1e5}, {"Hz": 2e5}]
+    oc.sweep(system_factory, oc.MinDriver(), params, dirname=tmp_path, verbose=0)
+    info_file = tmp_path / "sweep" / "point-1" / "info.json"
+    with open(info_file) as f:
+        info = json.load(f)
+    info["success"] = False  # pretend the second point has been interrupted
+    with open(info_file, "w") as f:
+        json.dump(info, f)
+    mif_0 = (tmp_path / "sweep" / "point-0" / "macrospin.mif").stat().st_mtime_ns
+
+    result = oc.sweep(
+        system_factory, oc.MinDriver(), params, dirname=tmp_path, verbose=0
+    )
+    assert len(result) == 2
+    # the completed point is not run again
+    assert (
+        tmp_path / "sweep" / "point-0" / "macrospin.mif"
+    ).stat().st_mtime_ns == mif_0
+    with open(info_file) as f:
+        assert json.load(f)["success"]
+
+    with pytest.raises(ValueError):
+        oc.sweep(
+            system_factory, oc.MinDriver(), [{"Hz": 5e5}], dirname=tmp_path, verbose=0
+        )
+
+
+@pytest.mark.parametrize("template", [False, True])
+def test_sweep_resume_changed_inputs(tmp_path, template):
+    params = [{"Hz": 1e5}, {"Hz": 2e5}]
+
+    def run(factory=system_factory, t=1e-12):
+        oc.sweep(
+            factory,
+            oc.TimeDriver(),
+            params,
+            dirname=tmp_path,
+            template=template,
+            t=t,
+            n=2,
+            verbose=0,
+        )
+        hashes = []
+        for i in range(2):
+            with open(tmp_path / "sweep" / f"point-{i}" / "info.json") as f:
+                hashes.append(json.load(f)["input_hash"])
+        return hashes
+
+    hashes = run()
+    assert len(set(hashes)) == 2
+    info_file = tmp_path / "sweep" / "point-0" / "info.json"
+    mtime = info_file.stat().st_mtime_ns
+    assert run() == hashes
+    assert info_file.stat().st_mtime_ns == mtime  # not run again
+    # Points are run again if the driver arguments or the systems change.
+    changed_kwargs = run(t=2e-12)
+    assert set(changed_kwargs).isdisjoint(hashes)
+    changed_system = run(lambda Hz: system_factory(Hz, alpha=0.5), t=2e-12)
+    assert set(changed_system).isdisjoint(changed_kwargs)
+    assert not list((tmp_path / "sweep").glob(".point-*"))
+
+
+def test_sweep_template(tmp_path):
+    params = {"Hz": [1e5, 2e5], "alpha": [0.1, 0.5]}
+    result = oc.sweep(
+        system_factory,
+        oc.TimeDriver(),
+        params,
+        dirname=tmp_path,
+        template=True,
+        t=1e-12,
+        n=2,
+        verbose=0,
+    )
+    assert len(result) == 4
+    assert len(result.table) == 8
+    sweepdir = tmp_path / "sweep"
+    mif = (sweepdir / "template" / "macrospin.mif").read_text()
+    assert "Parameter Hz 100000.0\nParameter alpha 0.1\n" in mif
+    assert "field {0 0 $Hz}" in mif
+    assert "alpha $alpha" in mif
+    for i in range(4):
+        assert (sweepdir / f"point-{i}" / "macrospin.mif").samefile(
+            sweepdir / "template" / "macrospin.mif"
+        )
+
+    def ms_factory(Ms):
+        system = mm.examples.macrospin()
+        system.m.norm = Ms
+        return system
+
+    with pytest.raises(ValueError, match="depends on parameters"):
+        oc.sweep(
+            ms_factory,
+            oc.MinDriver(),
+            {"Ms": [1e6, 2e6]},
+            dirname=tmp_path,
+            name="ms",
+            template=True,
+            verbose=0,
+        )
+
+
+def test_sweep_template_regions(tmp_path):
+    region = df.Region(p1=(0, 0, 0), p2=(1e-9, 1e-9, 1e-9))
+    mesh = df.Mesh(
+        p1=(0, 0, 0),
+        p2=(2e-9, 1e-9, 1e-9),
+        cell=(1e-9, 1e-9, 1e-9),
+        subregions={"r1": region},
+    )
+
+    def regions_factory(Hz, alpha):
+        system = mm.System(name="regions")
+        system.energy = mm.Zeeman(H={"r1": (0, 0, Hz), "default": (0, 0, 1e5)})
+        system.dynamics = mm.Precession(gamma0=mm.consts.gamma0) + mm.Damping(
+            alpha={"r1": alpha, "default": 0.2}
+        )
+        system.m = df.Field(mesh, nvdim=3, value=(0, 0, 1), norm=8e5)
+        return system
+
+    params = {"Hz": [1e5, 2e5], "alpha": [0.1, 0.5]}
+    result = oc.sweep(
+        regions_factory,
+        oc.TimeDriver(),
+        params,
+        dirname=tmp_path,
+        template=True,
+        t=1e-12,
+        n=2,
+        verbose=0,
+    )
+    assert len(result) == 4
+    mif = (tmp_path / "sweep" / "template" / "regions.mif").read_text()
+    # Only the blocks containing parameters are substituted.
+    assert "Specify Oxs_AtlasVectorField:zeeman_H [subst {\n" in mif
+    assert "    r1 {0 0 $Hz}\n  }\n}]\n" in mif
+    assert "Specify Oxs_FixedZeeman:zeeman {\n" in mif
+    assert "Specify Oxs_AtlasScalarField:dp_alpha [subst {\n" in mif
+    assert "    r1 $alpha\n  }\n}]\n" in mif
+    assert "Specify Oxs_RungeKuttaEvolve:evolver {\n" in mif
+
+
+def test_default_max_workers(monkeypatch):
+    monkeypatch.setattr(oc.autotune, "available_cpus", lambda: 5)
+    sweep = importlib.import_module("oommfc.sweep")
+    assert sweep._default_max_workers(1) == 5
+    assert sweep._default_max_workers(2) == 2
+    assert sweep._default_max_workers(8) == 1